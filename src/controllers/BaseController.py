@@ -2,6 +2,7 @@ from helper.config import get_settings, Settings
 import os 
 import random
 import string
+import hashlib
 
 class BaseController:
     def __init__(self):
@@ -22,6 +23,11 @@ class BaseController:
         letters = string.ascii_letters + string.digits
         return ''.join(random.choice(letters) for i in range(length))
     
+
+    def hash_text(self, text: str) -> str:
+        """Return a stable sha256 hex digest used to address text content."""
+        return hashlib.sha256(text.encode("utf-8")).hexdigest()
+    
     
     def get_database_path(self, database_name:str) -> str:
         
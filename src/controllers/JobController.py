@@ -0,0 +1,324 @@
+import asyncio
+import logging
+from .BaseController import BaseController
+from .NLPController import NLPController
+from .ProcessController import ProcessController
+from models import ResponseSignal
+from models.ProjectModel import ProjectModel
+from models.ChunkModel import ChunkModel
+from models.AssetModel import AssetModel
+from models.IndexedChunkModel import IndexedChunkModel
+from models.JobModel import JobModel
+from models.db_schemes import DataChunks, Jobs
+from models.enums.AssetTypeEnum import AssetTypeEnum
+from models.enums.JobEnum import JobTypeEnum, JobStatusEnum
+
+logger = logging.getLogger("uvicorn.error")
+
+
+class JobProgress:
+    """In-memory progress of the running job; the heartbeat persists it periodically."""
+
+    def __init__(self):
+        self.progress = 0
+        self.total = None
+
+    def update(self, items_count: int):
+        self.progress += items_count
+
+
+class JobController(BaseController):
+    """
+    Runs /process and /index/push workloads outside of the HTTP request. Jobs are rows
+    of the `jobs` table claimed with SELECT ... FOR UPDATE SKIP LOCKED, so any number of
+    API processes or standalone workers (see worker.py) can consume the same queue.
+    """
+
+    def __init__(self, app):
+        super().__init__()
+        self.app = app
+        self.workers = []
+
+
+    async def submit_job(self, job_type: str, project_id: int, payload: dict = None):
+        job_model = await JobModel.create_instance(db_client=self.app.db_client)
+        return await job_model.create_job(
+            Jobs(
+                job_type=job_type,
+                job_status=JobStatusEnum.PENDING.value,
+                job_project_id=project_id,
+                job_payload=payload or {},
+                job_progress=0,
+                job_attempts=0,
+                job_cancel_requested=False,
+            )
+        )
+
+
+    def start_workers(self, workers_count: int):
+        for worker_no in range(workers_count):
+            self.workers.append(asyncio.create_task(self.worker_loop(worker_no=worker_no)))
+
+
+    async def stop_workers(self):
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+
+    async def worker_loop(self, worker_no: int):
+        job_model = await JobModel.create_instance(db_client=self.app.db_client)
+        logger.info(f"Job worker {worker_no} started.")
+
+        while True:
+            try:
+                job = await job_model.claim_next_job(
+                    lease_seconds=self.app_settings.JOB_LEASE_SECONDS,
+                    max_attempts=self.app_settings.JOB_MAX_ATTEMPTS
+                )
+            except Exception as e:
+                logger.error(f"Job worker {worker_no} failed to claim a job: {e}")
+                job = None
+
+            if job is None:
+                await asyncio.sleep(self.app_settings.JOB_POLL_INTERVAL_SECONDS)
+                continue
+
+            logger.info(f"Job worker {worker_no} picked {job.job_type} job {job.job_id} (attempt {job.job_attempts}).")
+            await self.run_job(job=job, job_model=job_model)
+
+
+    async def run_job(self, job: Jobs, job_model: JobModel):
+        progress = JobProgress()
+        cancel_requested = asyncio.Event()
+
+        job_task = asyncio.create_task(self.execute_job(job=job, progress=progress))
+        heartbeat_task = asyncio.create_task(self.heartbeat(
+            job=job, job_model=job_model, job_task=job_task,
+            progress=progress, cancel_requested=cancel_requested
+        ))
+
+        try:
+            job_result = await job_task
+        except asyncio.CancelledError:
+            if not cancel_requested.is_set():
+                # the worker itself is shutting down; the lease lets another worker resume
+                job_task.cancel()
+                raise
+
+            if await self.finish_job(job=job, job_model=job_model, job_status=JobStatusEnum.CANCELLED.value):
+                logger.info(f"Job {job.job_id} cancelled.")
+            return
+        except Exception as e:
+            if await self.finish_job(job=job, job_model=job_model, job_status=JobStatusEnum.FAILED.value,
+                                     job_error=str(e)):
+                logger.error(f"Job {job.job_id} failed: {e}")
+            return
+        finally:
+            heartbeat_task.cancel()
+            await asyncio.gather(heartbeat_task, return_exceptions=True)
+
+        await job_model.update_progress(job_id=job.job_id, job_attempts=job.job_attempts,
+                                        progress=progress.progress, total=progress.total)
+        if await self.finish_job(job=job, job_model=job_model, job_status=JobStatusEnum.SUCCEEDED.value,
+                                 job_result=job_result):
+            logger.info(f"Job {job.job_id} succeeded.")
+
+
+    async def finish_job(self, job: Jobs, job_model: JobModel, job_status: str, **outcome) -> bool:
+        # only the worker holding the latest claim may record how the job ended
+        is_finished = await job_model.finish_job(job_id=job.job_id, job_attempts=job.job_attempts,
+                                                 job_status=job_status, **outcome)
+        if not is_finished:
+            logger.warning(f"Job {job.job_id} was claimed again after attempt {job.job_attempts}, "
+                           f"its {job_status} outcome is discarded.")
+        return is_finished
+
+
+    async def heartbeat(self, job: Jobs, job_model: JobModel, job_task: asyncio.Task,
+                        progress: JobProgress, cancel_requested: asyncio.Event):
+        while not job_task.done():
+            try:
+                should_stop = await job_model.update_progress(
+                    job_id=job.job_id,
+                    job_attempts=job.job_attempts,
+                    progress=progress.progress,
+                    total=progress.total
+                )
+            except Exception as e:
+                logger.error(f"Failed to record heartbeat of job {job.job_id}: {e}")
+                should_stop = False
+
+            if should_stop:
+                cancel_requested.set()
+                job_task.cancel()
+                return
+
+            await asyncio.sleep(self.app_settings.JOB_HEARTBEAT_SECONDS)
+
+
+    async def execute_job(self, job: Jobs, progress: JobProgress) -> dict:
+        # claim_next_job never hands out a second job of a project while one is running,
+        # so a push can not index chunks that a reset of the same project is deleting
+        if job.job_type == JobTypeEnum.PROCESS.value:
+            return await self.execute_process_job(job=job, progress=progress)
+        elif job.job_type == JobTypeEnum.PUSH.value:
+            return await self.execute_push_job(job=job, progress=progress)
+
+        raise ValueError(f"Unknown job type: {job.job_type}")
+
+
+    def create_nlp_controller(self) -> NLPController:
+        return NLPController(
+            vector_db_client=self.app.vector_db_client,
+            generation_client=self.app.generation_client,
+            embedding_client=self.app.embedding_client,
+            template_parser=self.app.template_parser,
+            embedding_scheduler=self.app.embedding_scheduler,
+            embedding_cache=self.app.embedding_cache,
+            answer_cache=self.app.answer_cache
+        )
+
+
+    async def retire_project_answers(self, project_model: ProjectModel, project_id: int):
+        # cached answers are keyed by the index version, moving it makes them unreachable
+        _ = await project_model.bump_index_version(project_id=project_id)
+        if self.app.answer_cache:
+            await self.app.answer_cache.forget_project(project_id=project_id)
+
+
+    async def execute_process_job(self, job: Jobs, progress: JobProgress) -> dict:
+        payload = job.job_payload or {}
+
+        project_model = await ProjectModel.create_instance(db_client=self.app.db_client)
+        asset_model = await AssetModel.create_instance(db_client=self.app.db_client)
+        chunk_model = await ChunkModel.create_instance(db_client=self.app.db_client)
+
+        project = await project_model.get_project_or_create_one(project_id=job.job_project_id)
+
+        if payload.get("file_id") is not None:
+            asset_record = await asset_model.get_asset_record(
+                asset_project_id=project.project_id,
+                asset_name=payload["file_id"]
+            )
+
+            if asset_record is None:
+                raise ValueError(ResponseSignal.FILE_ID_ERROR.value)
+
+            project_files_ids = {
+                asset_record.asset_id: asset_record.asset_name
+            }
+        else:
+            project_files = await asset_model.get_all_project_assets(
+                asset_project_id=project.project_id,
+                asset_type=AssetTypeEnum.FILE.value
+            )
+
+            project_files_ids = {
+                asset_record.asset_id: asset_record.asset_name
+                for asset_record in project_files
+            }
+
+        if len(project_files_ids) == 0:
+            raise ValueError(ResponseSignal.NO_FILES_FOUND.value)
+
+        progress.total = len(project_files_ids)
+
+        if payload.get("do_reset") == 1:
+            # delete associated vectors collection and what was recorded as indexed in it
+            indexed_chunk_model = await IndexedChunkModel.create_instance(db_client=self.app.db_client)
+            _ = await self.create_nlp_controller().reset_vector_db_collection(
+                project=project,
+                indexed_chunk_model=indexed_chunk_model
+            )
+
+            # delete associated chunks
+            _ = await chunk_model.delete_chunk_by_project_id(project_id=project.project_id)
+
+            await self.retire_project_answers(project_model=project_model, project_id=project.project_id)
+
+        process_controller = ProcessController(project_id=project.project_id)
+
+        number_of_records = 0
+        number_of_files = 0
+
+        for asset_id, file_id in project_files_ids.items():
+
+            # loading and splitting files is CPU bound, keep it off the event loop
+            file_contents = await asyncio.to_thread(process_controller.get_file_content, file_id)
+
+            file_chunks = await asyncio.to_thread(
+                process_controller.process_file_content,
+                file_contents,
+                file_id,
+                payload.get("chunk_size") or 100,
+                payload.get("chunk_overlap") if payload.get("chunk_overlap") is not None else 20
+            )
+
+            progress.update(1)
+
+            if file_chunks is None or len(file_chunks) == 0:
+                continue
+
+            file_chunks_records = [
+                DataChunks(
+                    chunk_project_id=project.project_id,
+                    chunk_asset_id=asset_id,
+                    chunk_text=chunk.page_content,
+                    chunk_metadata=chunk.metadata,
+                    chunk_order=i+1
+                )
+                for i, chunk in enumerate(file_chunks)
+            ]
+
+            # a retried job processes the same assets again, replace what the last attempt wrote
+            number_of_records += await chunk_model.replace_asset_chunks(
+                asset_id=asset_id,
+                chunks=file_chunks_records,
+                batch_size=100
+            )
+
+            number_of_files += 1
+
+        if number_of_files == 0:
+            raise ValueError(ResponseSignal.PROCESSING_FAILED.value)
+
+        return {
+            "signal": ResponseSignal.PROCESSING_SUCCESS.value,
+            "inserted_chunks": number_of_records,
+            "processed_files": number_of_files
+        }
+
+
+    async def execute_push_job(self, job: Jobs, progress: JobProgress) -> dict:
+        payload = job.job_payload or {}
+
+        project_model = await ProjectModel.create_instance(db_client=self.app.db_client)
+        chunk_model = await ChunkModel.create_instance(db_client=self.app.db_client)
+        indexed_chunk_model = await IndexedChunkModel.create_instance(db_client=self.app.db_client)
+
+        project = await project_model.get_project_or_create_one(project_id=job.job_project_id)
+
+        progress.total = await chunk_model.get_total_chunks_count(project_id=project.project_id)
+
+        # fetch, embed and insert run as overlapped pipeline stages
+        try:
+            push_stats = await self.create_nlp_controller().push_project_index(
+                project=project,
+                chunk_model=chunk_model,
+                indexed_chunk_model=indexed_chunk_model,
+                do_reset=payload.get("do_reset", 0),
+                progress_callback=progress.update
+            )
+        finally:
+            # even a failed push may have changed what the collection returns
+            await self.retire_project_answers(project_model=project_model, project_id=project.project_id)
+
+        if push_stats is None:
+            raise RuntimeError(ResponseSignal.VECTOR_DB_INDEXING_FAILED.value)
+
+        return {
+            "signal": ResponseSignal.INSERTION_INTO_VECTOR_DB_SUCCESS.value,
+            **push_stats
+        }
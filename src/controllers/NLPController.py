@@ -1,28 +1,69 @@
 import asyncio
+import inspect
 import json
+import logging
+import time
 from .BaseController import BaseController
 from models.ProjectModel import ProjectModel
-from models.ChunkModel import DataChunks
+from models.ChunkModel import ChunkModel, DataChunks
+from models.EmbeddingCacheModel import EmbeddingCacheModel
+from models.IndexedChunkModel import IndexedChunkModel
+from models.db_schemes import RetrievedDocuments
 from typing import List
+from stores.llm.AnswerCache import AnswerCache
 from stores.llm.LLMEnum import DocumentTypeEnum
+from stores.llm.EmbeddingScheduler import EmbeddingScheduler
+from stores.llm.QueryEmbeddingCache import QueryEmbeddingCache
+from stores.llm.QueryEmbeddingCoalescer import QueryEmbeddingCoalescer
+from stores.vectordb.VectorDBEnum import SearchModeEnum
+from utils.pipeline import StageStats
+
+logger = logging.getLogger("uvicorn.error")
 
 
 class NLPController(BaseController):
-    def __init__(self, vector_db_client, generation_client, embedding_client, template_parser):
+    def __init__(self, vector_db_client, generation_client, embedding_client, template_parser,
+                 embedding_scheduler: EmbeddingScheduler = None,
+                 embedding_cache: EmbeddingCacheModel = None,
+                 query_embedding_cache: QueryEmbeddingCache = None,
+                 query_embedding_coalescer: QueryEmbeddingCoalescer = None,
+                 answer_cache: AnswerCache = None):
         super().__init__()
       
         self.vector_db_client = vector_db_client
         self.generation_client = generation_client
         self.embedding_client = embedding_client
         self.template_parser = template_parser
+
+        # fall back to a private, unthrottled scheduler when the app one is not passed
+        self.embedding_scheduler = embedding_scheduler or EmbeddingScheduler(
+            embedding_client=embedding_client,
+            max_concurrency=self.app_settings.EMBEDDING_MAX_CONCURRENCY,
+        )
+        self.embedding_cache = embedding_cache
+        self.query_embedding_cache = query_embedding_cache
+        self.query_embedding_coalescer = query_embedding_coalescer
+        self.answer_cache = answer_cache
     
 
     def create_collection_name(self, project_id: str):
         return f"collection_{self.vector_db_client.default_vector_size}_{project_id}".strip()
+
+
+    def create_index_state_name(self, collection_name: str):
+        # collection names repeat across backends, what one holds says nothing about another
+        return f"{self.app_settings.VECTOR_DB_BACKEND}_{collection_name}"
     
 
-    async def reset_vector_db_collection(self, project: ProjectModel):
+    async def reset_vector_db_collection(self, project: ProjectModel, indexed_chunk_model: IndexedChunkModel = None):
         collection_name = self.create_collection_name(project_id=project.project_id)
+
+        # forget what was indexed so the next push re-inserts every chunk
+        if indexed_chunk_model:
+            _ = await indexed_chunk_model.delete_collection_state(
+                collection_name=self.create_index_state_name(collection_name)
+            )
+
         return await self.vector_db_client.delete_collection(collection_name=collection_name)
 
 
@@ -35,100 +76,571 @@ class NLPController(BaseController):
         )
 
 
-    async def index_into_vector_db(self, project: ProjectModel, chunks: List[DataChunks],
-                                chunks_ids: List[int], 
-                                do_reset: bool = False, batch_size: int = 50):
+    async def embed_documents(self, texts: List[str], batch_size: int = None):
         
-        collection_name = self.create_collection_name(project_id=project.project_id)
-        texts = [c.chunk_text for c in chunks]
-        metadata = [c.chunk_metadata for c in chunks]
+        batch_size = batch_size or self.app_settings.EMBEDDING_BATCH_SIZE
+        document_type = DocumentTypeEnum.DOCUMENT.value
+
+        if not self.embedding_cache:
+            # Embed all batches concurrently, throttled by the provider budget
+            return await self.embedding_scheduler.embed_batches(
+                batches=[texts[i:i+batch_size] for i in range(0, len(texts), batch_size)],
+                document_type=document_type
+            )
+
+        # the cache is addressed by the exact text the provider would see
+        texts_hashes = [
+            self.hash_text(self.embedding_client.process_text(text))
+            for text in texts
+        ]
+
+        cache_key = {
+            "embedding_backend": self.app_settings.EMBEDDING_BACKEND,
+            "embedding_model_id": self.embedding_client.embedding_model_id,
+            "document_type": document_type,
+        }
+
+        cached_vectors = await self.embedding_cache.get_embeddings(
+            text_hashes=list(set(texts_hashes)),
+            **cache_key
+        )
+
+        # only send each distinct missing text to the provider once
+        missing_texts = {}
+        for text, text_hash in zip(texts, texts_hashes):
+            if text_hash not in cached_vectors and text_hash not in missing_texts:
+                missing_texts[text_hash] = text
+
+        if len(missing_texts) > 0:
+            missing_hashes = list(missing_texts.keys())
+            missing_values = list(missing_texts.values())
+
+            new_vectors = await self.embedding_scheduler.embed_batches(
+                batches=[missing_values[i:i+batch_size] for i in range(0, len(missing_values), batch_size)],
+                document_type=document_type
+            )
+
+            if new_vectors is None:
+                return None
+
+            new_embeddings = dict(zip(missing_hashes, new_vectors))
+            _ = await self.embedding_cache.insert_embeddings(
+                embeddings=new_embeddings,
+                **cache_key
+            )
+            cached_vectors.update(new_embeddings)
+
+        return [cached_vectors[text_hash] for text_hash in texts_hashes]
+
+
+    async def embed_query(self, text: str):
+
+        cache_key = {
+            "embedding_backend": self.app_settings.EMBEDDING_BACKEND,
+            "embedding_model_id": self.embedding_client.embedding_model_id,
+        }
+
+        if self.query_embedding_cache:
+            query_vector = self.query_embedding_cache.get(text=text, **cache_key)
+            if query_vector is not None:
+                return query_vector
+
+        if self.query_embedding_coalescer:
+            # share one provider call with other queries arriving at the same time
+            query_vector = await self.query_embedding_coalescer.embed(text=text)
+        else:
+            vectors = await self.embedding_client.embed_text_async(
+                text=text, 
+                document_type=DocumentTypeEnum.QUERY.value
+            )
+
+            if not vectors or len(vectors) == 0:
+                return None
+
+            query_vector = vectors[0]
+
+        if query_vector and self.query_embedding_cache:
+            self.query_embedding_cache.set(text=text, vector=query_vector, **cache_key)
+
+        return query_vector
+
 
-        vectors = []
+    async def embed_queries(self, texts: List[str]):
+        """Embeds several queries; texts missing from the query cache share one provider call."""
 
-        # Process texts in batches asynchronously
-        for i in range(0, len(texts), batch_size):
-            batch_texts = texts[i:i+batch_size]
+        cache_key = {
+            "embedding_backend": self.app_settings.EMBEDDING_BACKEND,
+            "embedding_model_id": self.embedding_client.embedding_model_id,
+        }
 
-            # Assume your client has an async batch embed method
-            batch_vectors = self.embedding_client.embed_text(
+        query_vectors = {}
+        if self.query_embedding_cache:
+            for text in texts:
+                query_vector = self.query_embedding_cache.get(text=text, **cache_key)
+                if query_vector is not None:
+                    query_vectors[text] = query_vector
+
+        missing_texts = [text for text in dict.fromkeys(texts) if text not in query_vectors]
+        batch_size = self.app_settings.QUERY_EMBEDDING_MAX_BATCH_SIZE
+
+        for i in range(0, len(missing_texts), batch_size):
+            batch_texts = missing_texts[i:i+batch_size]
+            vectors = await self.embedding_client.embed_text_async(
                 text=batch_texts,
-                document_type=DocumentTypeEnum.DOCUMENT.value
+                document_type=DocumentTypeEnum.QUERY.value
             )
-            vectors.extend(batch_vectors)
 
-            # Optional: small delay
-            await asyncio.sleep(0.5)  
+            if not vectors or len(vectors) != len(batch_texts):
+                return None
+
+            for text, query_vector in zip(batch_texts, vectors):
+                query_vectors[text] = query_vector
+                if self.query_embedding_cache:
+                    self.query_embedding_cache.set(text=text, vector=query_vector, **cache_key)
+
+        return [query_vectors[text] for text in texts]
 
-        # Create collection async call
-        _ = await self.vector_db_client.create_collection(
+
+    async def insert_into_vector_db(self, collection_name: str, chunks: List[DataChunks], vectors: list):
+        return await self.vector_db_client.insert_many(
             collection_name=collection_name,
-            embedding_size=self.embedding_client.embedding_size,
-            do_reset=do_reset,
+            texts=[c.chunk_text for c in chunks],
+            metadata=[self.get_chunk_vector_metadata(c) for c in chunks],
+            vectors=vectors,
+            record_ids=[c.chunks_id for c in chunks],
         )
 
-        # Insert batch into vector DB async call
-        _ = await self.vector_db_client.insert_many(
+
+    def get_chunk_vector_metadata(self, chunk: DataChunks) -> dict:
+        # the chunk's own metadata plus the fields searches can filter on
+        return {
+            **(chunk.chunk_metadata or {}),
+            "asset_id": chunk.chunk_asset_id,
+            "chunk_order": chunk.chunk_order,
+        }
+
+
+    def get_chunk_content_hash(self, chunk: DataChunks) -> str:
+        # anything that ends up in the vector db row, plus the model that embedded it
+        metadata = json.dumps(self.get_chunk_vector_metadata(chunk), sort_keys=True, ensure_ascii=False)
+        return self.hash_text(f"{self.embedding_client.embedding_model_id}\n{metadata}\n{chunk.chunk_text}")
+
+
+    async def push_project_index(self, project: ProjectModel, chunk_model: ChunkModel,
+                                 indexed_chunk_model: IndexedChunkModel = None,
+                                 do_reset: bool = False, progress_callback=None):
+        """
+        Index all chunks of a project through three overlapped stages connected by
+        bounded queues: fetch pages from Postgres -> embed -> insert into the vector DB.
+        A full queue blocks the stage in front of it, so the push runs at the pace of
+        the slowest stage. Returns per-stage stats, or None when a stage fails.
+
+        With an `indexed_chunk_model` the push is incremental: chunks whose content hash
+        is already recorded for the collection are skipped, changed chunks are upserted
+        and rows of chunks deleted from the project are removed from the vector db.
+        """
+
+        collection_name = self.create_collection_name(project_id=project.project_id)
+        index_state_name = self.create_index_state_name(collection_name)
+
+        is_collection_created = await self.vector_db_client.create_collection(
             collection_name=collection_name,
-            texts=texts,
-            metadata=metadata,
-            vectors=vectors,
-            record_ids=chunks_ids,
+            embedding_size=self.embedding_client.embedding_size,
+            do_reset=do_reset,
         )
 
-        return True
+        # a collection that had to be created holds none of the recorded chunks,
+        # e.g. after the vector store's data was lost
+        if indexed_chunk_model and (do_reset or is_collection_created):
+            _ = await indexed_chunk_model.delete_collection_state(collection_name=index_state_name)
+
+        skipped_items_count = 0
+
+        async def report_progress(items_count: int):
+            if progress_callback:
+                result = progress_callback(items_count)
+                if inspect.isawaitable(result):
+                    await result
+
+        queue_size = self.app_settings.INDEX_PIPELINE_QUEUE_SIZE
+        embed_workers = max(1, self.app_settings.INDEX_PIPELINE_EMBED_WORKERS)
+        insert_workers = max(1, self.app_settings.INDEX_PIPELINE_INSERT_WORKERS)
+
+        embed_queue = asyncio.Queue(maxsize=queue_size)
+        insert_queue = asyncio.Queue(maxsize=queue_size)
+
+        fetch_stats = StageStats("fetch")
+        embed_stats = StageStats("embed", queue=embed_queue)
+        insert_stats = StageStats("insert", queue=insert_queue)
+
+        async def fetch_stage():
+            nonlocal skipped_items_count
+
+            started_at = time.perf_counter()
+            async for page_chunks in chunk_model.iter_project_chunks(
+                project_id=project.project_id,
+                page_size=self.app_settings.INDEX_PUSH_PAGE_SIZE
+            ):
+                content_hashes = {
+                    chunk.chunks_id: self.get_chunk_content_hash(chunk)
+                    for chunk in page_chunks
+                }
+
+                if indexed_chunk_model:
+                    indexed_hashes = await indexed_chunk_model.get_content_hashes(
+                        collection_name=index_state_name,
+                        chunk_ids=list(content_hashes.keys())
+                    )
+                    changed_chunks = [
+                        chunk for chunk in page_chunks
+                        if indexed_hashes.get(chunk.chunks_id) != content_hashes[chunk.chunks_id]
+                    ]
+                else:
+                    changed_chunks = page_chunks
+
+                fetch_stats.record(len(page_chunks), started_at)
+
+                if len(changed_chunks) < len(page_chunks):
+                    skipped_items_count += len(page_chunks) - len(changed_chunks)
+                    await report_progress(len(page_chunks) - len(changed_chunks))
+
+                if len(changed_chunks) > 0:
+                    await embed_queue.put((changed_chunks, content_hashes))
+                    embed_stats.sample_queue()
+
+                started_at = time.perf_counter()
+
+            # one end marker per embed worker
+            for _ in range(embed_workers):
+                await embed_queue.put(None)
+
+        async def embed_worker():
+            while True:
+                item = await embed_queue.get()
+                if item is None:
+                    return
+
+                page_chunks, content_hashes = item
+                started_at = time.perf_counter()
+                vectors = await self.embed_documents(texts=[c.chunk_text for c in page_chunks])
+                if vectors is None:
+                    raise RuntimeError("Failed to embed a page of chunks.")
+
+                embed_stats.record(len(page_chunks), started_at)
+                await insert_queue.put((page_chunks, content_hashes, vectors))
+                insert_stats.sample_queue()
+
+        async def embed_stage():
+            await asyncio.gather(*[embed_worker() for _ in range(embed_workers)])
+
+            # one end marker per insert worker
+            for _ in range(insert_workers):
+                await insert_queue.put(None)
+
+        async def insert_worker():
+            while True:
+                item = await insert_queue.get()
+                if item is None:
+                    return
+
+                page_chunks, content_hashes, vectors = item
+                started_at = time.perf_counter()
+                is_inserted = await self.insert_into_vector_db(
+                    collection_name=collection_name,
+                    chunks=page_chunks,
+                    vectors=vectors
+                )
+                if not is_inserted:
+                    raise RuntimeError("Failed to insert a page of chunks into the vector db.")
+
+                if indexed_chunk_model:
+                    _ = await indexed_chunk_model.upsert_content_hashes(
+                        collection_name=index_state_name,
+                        project_id=project.project_id,
+                        content_hashes={
+                            chunk.chunks_id: content_hashes[chunk.chunks_id]
+                            for chunk in page_chunks
+                        }
+                    )
+
+                insert_stats.record(len(page_chunks), started_at)
+                await report_progress(len(page_chunks))
+
+        started_at = time.perf_counter()
+
+        # defer vector index maintenance to a single build once the load is done
+        total_chunks_count = await chunk_model.get_total_chunks_count(project_id=project.project_id)
+        indexed_chunks_count = 0
+        if indexed_chunk_model:
+            indexed_chunks_count = await indexed_chunk_model.get_indexed_count(collection_name=index_state_name)
+
+        tasks = []
+
+        try:
+            # inside the try, so the finally below ends the load whatever fails after it began
+            _ = await self.vector_db_client.begin_bulk_load(
+                collection_name=collection_name,
+                expected_rows=max(0, total_chunks_count - indexed_chunks_count)
+            )
+
+            tasks = [
+                asyncio.create_task(fetch_stage()),
+                asyncio.create_task(embed_stage()),
+                *[asyncio.create_task(insert_worker()) for _ in range(insert_workers)],
+            ]
+
+            await asyncio.gather(*tasks)
+        except Exception as e:
+            logger.error(f"Index push failed for project {project.project_id}: {e}")
+            return None
+        finally:
+            # a failed or cancelled push must not leave stages blocked on their queues
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+
+            # whatever got loaded is searchable through the index again
+            _ = await self.vector_db_client.end_bulk_load(collection_name=collection_name)
+
+        # drop vectors of chunks that were removed from the project since the last push
+        deleted_items_count = 0
+        if indexed_chunk_model:
+            stale_chunk_ids = await indexed_chunk_model.get_stale_chunk_ids(
+                collection_name=index_state_name,
+                project_id=project.project_id
+            )
+
+            if len(stale_chunk_ids) > 0:
+                _ = await self.vector_db_client.delete_by_record_ids(
+                    collection_name=collection_name,
+                    record_ids=stale_chunk_ids
+                )
+                deleted_items_count = await indexed_chunk_model.delete_chunk_ids(
+                    collection_name=index_state_name,
+                    chunk_ids=stale_chunk_ids
+                )
+
+        elapsed_seconds = time.perf_counter() - started_at
+
+        stats = {
+            "inserted_items_count": insert_stats.items,
+            "skipped_items_count": skipped_items_count,
+            "deleted_items_count": deleted_items_count,
+            "elapsed_seconds": round(elapsed_seconds, 3),
+            "stages": {
+                stage.name: stage.to_dict(elapsed_seconds)
+                for stage in (fetch_stats, embed_stats, insert_stats)
+            },
+        }
+
+        logger.info(f"Index push for project {project.project_id} finished: {stats}")
 
+        return stats
 
-    async def search_vector_db_collection(self, project: ProjectModel, text: str, limit: int = 5):
+
+    async def search_vector_db_collection(self, project: ProjectModel, text: str, limit: int = 5,
+                                          accuracy: str = None, filters: list = None, mode: str = None):
         
         # step1: get collection name
         query_vector = None
         collection_name = self.create_collection_name(project_id=project.project_id)
         
         # step2: embed the text
-        vectors = self.embedding_client.embed_text(
-            text=text, 
-            document_type=DocumentTypeEnum.QUERY.value
-        )
+        query_vector = await self.embed_query(text=text)
+
+        if not query_vector:
+            return False
         
-        if not vectors or len(vectors) == 0:
+        # step3: do semantic search, fused with a lexical ranking in hybrid mode
+        if mode == SearchModeEnum.HYBRID.value:
+            results = await self.vector_db_client.search_hybrid(
+                collection_name=collection_name,
+                vector=query_vector,
+                text=text,
+                limit=limit,
+                accuracy=accuracy,
+                filters=filters
+            )
+        else:
+            results = await self.vector_db_client.search_by_vector(
+                collection_name=collection_name,
+                vector=query_vector,
+                limit=limit,
+                accuracy=accuracy,
+                filters=filters
+            )
+
+        if not results:
             return False
+        
 
-        if isinstance(vectors, list) and len(vectors) > 0:
-            query_vector = vectors[0]
+        return results
 
-        if not query_vector:
+
+
+    async def search_vector_db_collection_batch(self, project: ProjectModel, texts: List[str], limit: int = 5,
+                                                accuracy: str = None, filters: list = None):
+
+        collection_name = self.create_collection_name(project_id=project.project_id)
+
+        # one embedding call and one vector DB round trip for all the queries
+        query_vectors = await self.embed_queries(texts=texts)
+
+        if not query_vectors:
             return False
-        
-        # step3: do semantic search
-        results = await self.vector_db_client.search_by_vector(
+
+        results = await self.vector_db_client.search_by_vectors(
             collection_name=collection_name,
-            vector=query_vector,
-            limit=limit
+            vectors=query_vectors,
+            limit=limit,
+            accuracy=accuracy,
+            filters=filters
         )
 
         if not results:
             return False
-        
 
         return results
 
 
-
-    async def answer_rag_question(self, project: ProjectModel, query: str, limit: int = 10):
+    async def answer_rag_question(self, project: ProjectModel, query: str, limit: int = 10,
+                                  accuracy: str = None, filters: list = None, mode: str = None):
         
         answer, full_prompt, chat_history = None, None, None
 
+        cache_key = self.get_answer_cache_key(project=project, query=query, limit=limit,
+                                              accuracy=accuracy, filters=filters, mode=mode)
+        if cache_key:
+            cached_answer = await self.answer_cache.get(key=cache_key,
+                                                        generation_model_id=self.generation_client.generation_model_id)
+            if cached_answer is not None:
+                return cached_answer["answer"], cached_answer["full_prompt"], cached_answer["chat_history"]
+
         # step1: retrieve related documents
         retrieved_documents = await self.search_vector_db_collection(
             project=project,
             text=query,
             limit=limit,
+            accuracy=accuracy,
+            filters=filters,
+            mode=mode,
         )
 
         if not retrieved_documents or len(retrieved_documents) == 0:
             return answer, full_prompt, chat_history
         
         # step2: Construct LLM prompt
+        full_prompt, chat_history = self.construct_rag_prompt(query=query, retrieved_documents=retrieved_documents)
+
+        # step3: Retrieve the Answer
+        answer = await self.generation_client.generate_text_async(
+            prompt=full_prompt,
+            chat_history=chat_history
+        )
+
+        if answer and cache_key:
+            await self.set_cached_answer(cache_key=cache_key, project=project, answer=answer,
+                                         full_prompt=full_prompt, chat_history=chat_history,
+                                         retrieved_documents=retrieved_documents)
+
+        return answer, full_prompt, chat_history
+
+
+    async def answer_rag_question_stream(self, project: ProjectModel, query: str, limit: int = 10,
+                                         accuracy: str = None, filters: list = None, mode: str = None):
+
+        cache_key = self.get_answer_cache_key(project=project, query=query, limit=limit,
+                                              accuracy=accuracy, filters=filters, mode=mode)
+        if cache_key:
+            cached_answer = await self.answer_cache.get(key=cache_key,
+                                                        generation_model_id=self.generation_client.generation_model_id)
+            if cached_answer is not None:
+                async def cached_answer_stream():
+                    yield cached_answer["answer"]
+
+                return [
+                    RetrievedDocuments(**source) for source in cached_answer["sources"]
+                ], cached_answer_stream()
+
+        # retrieval finishes first, so the sources can be sent before the first token
+        retrieved_documents = await self.search_vector_db_collection(
+            project=project,
+            text=query,
+            limit=limit,
+            accuracy=accuracy,
+            filters=filters,
+            mode=mode,
+        )
+
+        if not retrieved_documents or len(retrieved_documents) == 0:
+            return None, None
+
+        full_prompt, chat_history = self.construct_rag_prompt(query=query, retrieved_documents=retrieved_documents)
+
+        answer_stream = self.generation_client.generate_text_stream(
+            prompt=full_prompt,
+            chat_history=chat_history
+        )
+
+        if not cache_key:
+            return retrieved_documents, answer_stream
+
+        async def caching_answer_stream():
+            texts = []
+            try:
+                async for text in answer_stream:
+                    texts.append(text)
+                    yield text
+            finally:
+                await answer_stream.aclose()
+
+            # only reached when the stream completed, a cut off answer is never cached
+            if texts:
+                await self.set_cached_answer(cache_key=cache_key, project=project, answer="".join(texts),
+                                             full_prompt=full_prompt, chat_history=chat_history,
+                                             retrieved_documents=retrieved_documents)
+
+        return retrieved_documents, caching_answer_stream()
+
+
+    def get_answer_cache_key(self, project: ProjectModel, query: str, limit: int,
+                             accuracy: str = None, filters: list = None, mode: str = None):
+        if not self.answer_cache:
+            return None
+
+        # the index version moves on every push and reset, retiring answers over the old index
+        return self.answer_cache.get_key(
+            project_id=project.project_id,
+            index_version=project.index_version or 0,
+            query=query,
+            limit=limit,
+            generation_backend=self.app_settings.GENERATION_BACKEND,
+            generation_model_id=self.generation_client.generation_model_id,
+            language=self.template_parser.language,
+            accuracy=accuracy,
+            filters=filters,
+            mode=mode,
+        )
+
+
+    async def set_cached_answer(self, cache_key: str, project: ProjectModel, answer: str,
+                                full_prompt: str, chat_history: list, retrieved_documents: list):
+        await self.answer_cache.set(key=cache_key, project_id=project.project_id, answer={
+            "answer": answer,
+            "full_prompt": full_prompt,
+            "chat_history": chat_history,
+            "sources": [
+                {
+                    "text": doc.text,
+                    "score": doc.score
+                } for doc in retrieved_documents
+            ],
+        })
+
+
+    def construct_rag_prompt(self, query: str, retrieved_documents: list):
+
         system_prompt = self.template_parser.get("rag", "system_prompt")
 
         documents_prompts = "\n".join([
@@ -143,7 +655,7 @@ class NLPController(BaseController):
             "query": query
         })
 
-        # step3: Construct Generation Client Prompts
+        # Construct Generation Client Prompts
         chat_history = [
             self.generation_client.construct_prompt(
                 prompt=system_prompt,
@@ -153,10 +665,4 @@ class NLPController(BaseController):
 
         full_prompt = "\n\n".join([ documents_prompts,  footer_prompt])
 
-        # step4: Retrieve the Answer
-        answer = self.generation_client.generate_text(
-            prompt=full_prompt,
-            chat_history=chat_history
-        )
-
-        return answer, full_prompt, chat_history
\ No newline at end of file
+        return full_prompt, chat_history
\ No newline at end of file
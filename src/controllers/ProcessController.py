@@ -9,7 +9,7 @@ from dataclasses import dataclass
 from langchain.schema import Document  
 import logging
 
-logger = logging.getLogger(__name__)
+logger = logging.getLogger("uvicorn.error")
 
 @dataclass
 class Document:
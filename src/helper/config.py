@@ -1,3 +1,4 @@
+from pydantic import AliasChoices, Field
 from pydantic_settings import BaseSettings
 from typing import List
 
@@ -33,11 +34,81 @@ class Settings(BaseSettings):
     GENERATION_DEFAULT_MAX_TOKENS: int = None
     GENERATION_DEFAULT_TEMPERATURE: float = None
 
+    INDEX_PUSH_PAGE_SIZE: int = 500
+    INDEX_PIPELINE_QUEUE_SIZE: int = 4
+    INDEX_PIPELINE_EMBED_WORKERS: int = 2
+    INDEX_PIPELINE_INSERT_WORKERS: int = 1
+    EMBEDDING_BATCH_SIZE: int = 50
+    EMBEDDING_MAX_CONCURRENCY: int = 4
+    EMBEDDING_REQUESTS_PER_MINUTE: int = None
+    EMBEDDING_TOKENS_PER_MINUTE: int = None
+    EMBEDDING_MAX_RETRIES: int = 5
+    EMBEDDING_CACHE_ENABLED: bool = True
+    QUERY_EMBEDDING_CACHE_SIZE: int = 10000
+    QUERY_EMBEDDING_CACHE_TTL: int = None
+    QUERY_EMBEDDING_BATCH_WINDOW_MS: int = 5
+    QUERY_EMBEDDING_MAX_BATCH_SIZE: int = 96
+    ANSWER_CACHE_BACKEND: str = "memory"
+    ANSWER_CACHE_SIZE: int = 10000
+    ANSWER_CACHE_TTL: int = 86400
+
     VECTOR_DB_BACKEND_LITERAL: List[str] = None
     VECTOR_DB_BACKEND: str
     VECTOR_DB_PATH: str
     VECTOR_DB_DISTANCE_METHOD: str = None
+    VECTOR_DB_COLLECTION_CACHE_TTL: float = 60
+    VECTOR_DB_HNSW_M: int = 16
+    VECTOR_DB_HNSW_EF_CONSTRUCTION: int = 64
+    VECTOR_DB_HNSW_EF_SEARCH: int = 40
+    VECTOR_DB_FILTERABLE_FIELDS: dict = {"asset_id": "integer", "chunk_order": "integer"}
+    VECTOR_DB_HYBRID_CANDIDATES: int = 50
+    VECTOR_DB_HYBRID_RRF_K: int = 60
+    VECTOR_DB_QUANTIZATION: str = "none"
+    VECTOR_DB_QUANTIZATION_OVERSAMPLING: float = 4.0
+    VECTOR_DB_QDRANT_URL: str = None
+    VECTOR_DB_QDRANT_API_KEY: str = None
+    VECTOR_DB_QDRANT_PREFER_GRPC: bool = False
+    VECTOR_DB_QDRANT_GRPC_PORT: int = 6334
+    VECTOR_DB_QDRANT_UPLOAD_BATCH_SIZE: int = 64
+    VECTOR_DB_QDRANT_UPLOAD_PARALLEL: int = 1
+    VECTOR_DB_NUMPY_PATH: str = "numpy_db"
+    VECTOR_DB_NUMPY_SEARCH_BLOCK_ROWS: int = 32768
+    VECTOR_DB_NUMPY_COMPACT_RATIO: float = 0.3
+    VECTOR_DB_NUMPY_IVF_PATH: str = "numpy_ivf_db"
+    VECTOR_DB_NUMPY_IVF_NLIST: int = 0
+    VECTOR_DB_NUMPY_IVF_PQ_M: int = 0
+    VECTOR_DB_NUMPY_IVF_NPROBE: int = 16
+    VECTOR_DB_NUMPY_IVF_RERANK: int = 10
+    VECTOR_DB_NUMPY_IVF_TRAIN_THRESHOLD: int = 20000
+    VECTOR_DB_NUMPY_IVF_KMEANS_ITERATIONS: int = 15
+    VECTOR_DB_SHARDS: list = []
+    VECTOR_DB_SHARD_ROUTING: str = "collection"
+    VECTOR_DB_SHARD_TIMEOUT: float = 2.0
+    VECTOR_DB_SHARD_VIRTUAL_NODES: int = 256
     VECTOR_DB_PGVECTOR_INDEX_THRESHOLD: int = None
+    VECTOR_DB_PGVECTOR_STORAGE_MODE: str = "table"
+    VECTOR_DB_PGVECTOR_PARTITIONS: int = 16
+    VECTOR_DB_PGVECTOR_MIGRATE_LEGACY: bool = False
+    VECTOR_DB_PGVECTOR_EXACT_SEARCH_ROWS: int = 10000
+    VECTOR_DB_PGVECTOR_INDEX_TYPE: str = "hnsw"
+    VECTOR_DB_PGVECTOR_ITERATIVE_SCAN: str = "relaxed_order"
+    VECTOR_DB_PGVECTOR_TEXT_SEARCH_CONFIG: str = "simple"
+    VECTOR_DB_PGVECTOR_MIGRATE_TEXT_SEARCH: bool = False
+    VECTOR_DB_PGVECTOR_MAINTENANCE_WORK_MEM: str = None
+    VECTOR_DB_PGVECTOR_MAX_PARALLEL_MAINTENANCE_WORKERS: int = None
+    # the COPY_* names came first, when the pool only served COPY ingestion; still read
+    VECTOR_DB_PGVECTOR_POOL_ENABLED: bool = Field(True, validation_alias=AliasChoices(
+        "VECTOR_DB_PGVECTOR_POOL_ENABLED", "VECTOR_DB_PGVECTOR_COPY_ENABLED"))
+    VECTOR_DB_PGVECTOR_POOL_MIN_SIZE: int = 1
+    VECTOR_DB_PGVECTOR_POOL_MAX_SIZE: int = Field(10, validation_alias=AliasChoices(
+        "VECTOR_DB_PGVECTOR_POOL_MAX_SIZE", "VECTOR_DB_PGVECTOR_COPY_POOL_SIZE"))
+
+    JOB_WORKERS_COUNT: int = 1
+    WORKER_JOB_WORKERS_COUNT: int = 4
+    JOB_POLL_INTERVAL_SECONDS: float = 2.0
+    JOB_HEARTBEAT_SECONDS: float = 10.0
+    JOB_LEASE_SECONDS: int = 120
+    JOB_MAX_ATTEMPTS: int = 3
 
     PRIMARY_LANGUAGE: str
     DEFAULT_LANGUAGE: str
@@ -1,18 +1,26 @@
 from fastapi import FastAPI
-from routes import base, data, nlp
+from routes import base, data, nlp, jobs
 from helper.config import get_settings
 from contextlib import asynccontextmanager
 from stores.llm.LLMProviderFactory import LLMProviderFactory
+from stores.llm.EmbeddingScheduler import EmbeddingScheduler
+from stores.llm.QueryEmbeddingCache import QueryEmbeddingCache
+from stores.llm.QueryEmbeddingCoalescer import QueryEmbeddingCoalescer
+from stores.llm.AnswerCache import AnswerCache
+from stores.llm.LLMEnum import AnswerCacheBackendEnum
 from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
 from stores.llm.templates.template_parser import TemplateParser
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 from utils.metrics import setup_metrics
+from models.EmbeddingCacheModel import EmbeddingCacheModel
+from models.AnswerCacheModel import AnswerCacheModel
+from controllers import JobController
 
 
 # Define an asynchronous lifespan context manager for app startup and shutdown
 @asynccontextmanager
-async def lifespan(app: FastAPI):
+async def lifespan(app: FastAPI, job_workers_count: int = None):
     # Load settings from environment or configuration
     settings = get_settings()
     
@@ -45,6 +53,53 @@ async def lifespan(app: FastAPI):
     app.embedding_client = llm_provider_factory.create(settings.EMBEDDING_BACKEND)
     app.embedding_client.set_embedding_model(settings.EMBEDDING_MODEL_ID, settings.EMBEDDING_MODEL_SIZE)
 
+    # Share one rate-limited embedding scheduler between all index pushes
+    app.embedding_scheduler = EmbeddingScheduler(
+        embedding_client=app.embedding_client,
+        max_concurrency=settings.EMBEDDING_MAX_CONCURRENCY,
+        requests_per_minute=settings.EMBEDDING_REQUESTS_PER_MINUTE,
+        tokens_per_minute=settings.EMBEDDING_TOKENS_PER_MINUTE,
+        max_retries=settings.EMBEDDING_MAX_RETRIES,
+    )
+
+    # Persistent document embedding cache, skipped entirely when disabled
+    app.embedding_cache = None
+    if settings.EMBEDDING_CACHE_ENABLED:
+        app.embedding_cache = await EmbeddingCacheModel.create_instance(db_client=app.db_client)
+
+    # In-process LRU cache of query vectors for search and answer, disabled with a size of 0
+    app.query_embedding_cache = None
+    if settings.QUERY_EMBEDDING_CACHE_SIZE:
+        app.query_embedding_cache = QueryEmbeddingCache(
+            max_size=settings.QUERY_EMBEDDING_CACHE_SIZE,
+            ttl=settings.QUERY_EMBEDDING_CACHE_TTL,
+        )
+
+    # Exact RAG answer cache, in-process or shared through Postgres, disabled with a size of 0
+    app.answer_cache = None
+    if settings.ANSWER_CACHE_SIZE:
+        answer_cache_model = None
+        if settings.ANSWER_CACHE_BACKEND == AnswerCacheBackendEnum.POSTGRES.value:
+            answer_cache_model = await AnswerCacheModel.create_instance(
+                db_client=app.db_client,
+                max_entries=settings.ANSWER_CACHE_SIZE,
+            )
+
+        app.answer_cache = AnswerCache(
+            max_size=settings.ANSWER_CACHE_SIZE,
+            ttl=settings.ANSWER_CACHE_TTL,
+            answer_cache_model=answer_cache_model,
+        )
+
+    # Coalesce concurrent query embeddings into batched provider calls, disabled with a window of 0
+    app.query_embedding_coalescer = None
+    if settings.QUERY_EMBEDDING_BATCH_WINDOW_MS:
+        app.query_embedding_coalescer = QueryEmbeddingCoalescer(
+            embedding_client=app.embedding_client,
+            window_ms=settings.QUERY_EMBEDDING_BATCH_WINDOW_MS,
+            max_batch_size=settings.QUERY_EMBEDDING_MAX_BATCH_SIZE,
+        )
+
     # Create and connect the vector database client
     app.vector_db_client = await vectordb_provider_factory.create(provider=settings.VECTOR_DB_BACKEND)
     await app.vector_db_client.connect()
@@ -55,10 +110,17 @@ async def lifespan(app: FastAPI):
         default_language=settings.DEFAULT_LANGUAGE
     )
     
+    # Start background workers consuming /process and /index/push jobs
+    app.job_controller = JobController(app=app)
+    app.job_controller.start_workers(
+        workers_count=job_workers_count if job_workers_count is not None else settings.JOB_WORKERS_COUNT
+    )
+    
     # Yield control to FastAPI while app runs
     yield
 
-    # Cleanup on shutdown: dispose DB engine and disconnect vector DB
+    # Cleanup on shutdown: stop job workers, dispose DB engine and disconnect vector DB
+    await app.job_controller.stop_workers()
     app.db_engine.dispose()
     await app.vector_db_client.disconnect()
 
@@ -73,3 +135,4 @@ setup_metrics(app)
 app.include_router(base.router, prefix="/v1/base", tags=["base"])
 app.include_router(data.router, prefix="/v1/data", tags=["data"])
 app.include_router(nlp.router, prefix="/v1/nlp", tags=["nlp"])
+app.include_router(jobs.router, prefix="/v1/jobs", tags=["jobs"])
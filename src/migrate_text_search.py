@@ -0,0 +1,35 @@
+import asyncio
+from helper.config import get_settings
+from stores.vectordb.VectorDBProviderFactory import VectorDBProviderFactory
+from stores.vectordb.VectorDBEnum import VectorDBEnum
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
+from sqlalchemy.orm import sessionmaker
+
+
+# Add the hybrid search text column and its GIN index to pgvector collections created
+# before hybrid search. The column rewrites each table under an exclusive lock that
+# blocks its searches until done, so run this once, off peak, with the same .env:
+#   python migrate_text_search.py
+async def migrate_text_search():
+    settings = get_settings().model_copy(update={
+        "VECTOR_DB_PGVECTOR_POOL_ENABLED": False,
+        "VECTOR_DB_PGVECTOR_MIGRATE_TEXT_SEARCH": False,
+    })
+
+    vectordb_provider_factory = VectorDBProviderFactory(config=settings)
+    db_engine = create_async_engine(vectordb_provider_factory.get_postgres_dsn(driver="asyncpg"))
+    vectordb_provider_factory.db_client = sessionmaker(bind=db_engine, class_=AsyncSession, expire_on_commit=False)
+
+    vector_db_client = await vectordb_provider_factory.create(provider=VectorDBEnum.PGVECTOR.value)
+    await vector_db_client.connect()
+
+    try:
+        migrated_count = await vector_db_client.migrate_text_search_columns()
+        print(f"Added the text search column to {migrated_count} collections.")
+    finally:
+        await vector_db_client.disconnect()
+        await db_engine.dispose()
+
+
+if __name__ == "__main__":
+    asyncio.run(migrate_text_search())
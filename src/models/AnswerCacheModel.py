@@ -0,0 +1,91 @@
+from .BaseDataModel import BaseDataModel
+from .db_schemes import AnswerCache
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert
+
+
+class AnswerCacheModel(BaseDataModel):
+
+    # inserts between two evictions of expired and least recently used answers
+    EVICT_EVERY = 100
+
+    def __init__(self, db_client: object, max_entries: int = 10000):
+        super().__init__(db_client=db_client)
+        self.db_client = db_client
+        self.max_entries = max_entries
+        self.inserts_count = 0
+
+    @classmethod
+    async def create_instance(cls, db_client: object, max_entries: int = 10000):
+        instance = cls(db_client=db_client, max_entries=max_entries)  # this will call the __init__ method
+        return instance
+
+
+    async def get_answer(self, cache_key: str) -> dict:
+
+        # the lookup also touches the entry, in the same round trip
+        async with self.db_client() as session:
+            async with session.begin():
+                stmt = update(AnswerCache).where(
+                    AnswerCache.cache_key == cache_key,
+                    or_(AnswerCache.expires_at.is_(None), AnswerCache.expires_at > func.now())
+                ).values(last_used_at=func.now()).returning(AnswerCache.answer)
+                result = await session.execute(stmt)
+                answer = result.scalar_one_or_none()
+
+        return answer
+
+
+    async def insert_answer(self, cache_key: str, project_id: int, answer: dict, ttl: float = None):
+
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=ttl) if ttl else None
+
+        async with self.db_client() as session:
+            async with session.begin():
+                stmt = insert(AnswerCache).values(
+                    cache_key=cache_key,
+                    answer_project_id=project_id,
+                    answer=answer,
+                    expires_at=expires_at,
+                )
+                # two workers answering the same question at once store the same entry
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[AnswerCache.cache_key],
+                    set_={"answer": stmt.excluded.answer, "expires_at": stmt.excluded.expires_at,
+                          "last_used_at": func.now()}
+                )
+                await session.execute(stmt)
+
+        self.inserts_count += 1
+        if self.inserts_count % self.EVICT_EVERY == 0:
+            _ = await self.evict_answers()
+
+
+    async def evict_answers(self) -> int:
+
+        async with self.db_client() as session:
+            async with session.begin():
+                expired = await session.execute(
+                    delete(AnswerCache).where(AnswerCache.expires_at <= func.now())
+                )
+
+                least_recently_used = select(AnswerCache.cache_key).order_by(
+                    AnswerCache.last_used_at.desc()
+                ).offset(self.max_entries)
+                evicted = await session.execute(
+                    delete(AnswerCache).where(AnswerCache.cache_key.in_(least_recently_used))
+                )
+
+        return expired.rowcount + evicted.rowcount
+
+
+    async def delete_project_answers(self, project_id: int) -> int:
+
+        async with self.db_client() as session:
+            async with session.begin():
+                result = await session.execute(
+                    delete(AnswerCache).where(AnswerCache.answer_project_id == project_id)
+                )
+
+        return result.rowcount
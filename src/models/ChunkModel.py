@@ -45,6 +45,21 @@ class ChunkModel(BaseDataModel):
         
         return len(chunks)
 
+    async def replace_asset_chunks(self, asset_id: int, chunks: list, batch_size: int = 100):
+        """
+        Deletes the asset's existing chunks and inserts `chunks` in one transaction,
+        so processing the same asset again, e.g. a retried job, never duplicates them.
+        """
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(delete(DataChunks).where(DataChunks.chunk_asset_id == asset_id))
+                for i in range(0, len(chunks), batch_size):
+                    batch = chunks[i:i + batch_size]
+                    session.add_all(batch)
+            await session.commit()
+
+        return len(chunks)
+
     async def delete_chunk_by_project_id(self, project_id: ObjectId):
         async with self.db_client() as session:
             stmt = delete(DataChunks).where(DataChunks.chunk_project_id == project_id)
@@ -53,12 +68,38 @@ class ChunkModel(BaseDataModel):
         return result.rowcount
     
 
-    async def get_project_chunks(self, project_id: ObjectId, page_number: int = 1, page_size: int = 50):
-        async with self.db_client() as session:
-            stmt = select(DataChunks).where(DataChunks.chunk_project_id == project_id).offset((page_number - 1) * page_size).limit(page_size)
-            result = await session.execute(stmt)
-            chunks = result.scalars().all()
-        return chunks
+    async def iter_project_chunks(self, project_id: int, page_size: int = 500):
+        """
+        Stream a project's chunks page by page using keyset pagination on chunks_id.
+        Only the columns needed to index a chunk are fetched, not full ORM objects.
+        """
+        last_chunk_id = 0
+
+        while True:
+            async with self.db_client() as session:
+                stmt = select(
+                    DataChunks.chunks_id,
+                    DataChunks.chunk_text,
+                    DataChunks.chunk_metadata,
+                    DataChunks.chunk_asset_id,
+                    DataChunks.chunk_order
+                ).where(
+                    DataChunks.chunk_project_id == project_id,
+                    DataChunks.chunks_id > last_chunk_id
+                ).order_by(DataChunks.chunks_id).limit(page_size)
+
+                result = await session.execute(stmt)
+                chunks = result.all()
+
+            if len(chunks) == 0:
+                break
+
+            yield chunks
+
+            if len(chunks) < page_size:
+                break
+
+            last_chunk_id = chunks[-1].chunks_id
     
     
     async def get_total_chunks_count(self, project_id: ObjectId):
@@ -0,0 +1,62 @@
+from .BaseDataModel import BaseDataModel
+from .db_schemes import EmbeddingCache
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+
+
+class EmbeddingCacheModel(BaseDataModel):
+    def __init__(self, db_client: object):
+        super().__init__(db_client=db_client)
+        self.db_client = db_client
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        instance = cls(db_client=db_client)  # this will call the __init__ method
+        return instance
+
+
+    async def get_embeddings(self, embedding_backend: str, embedding_model_id: str,
+                             document_type: str, text_hashes: list) -> dict:
+        
+        if not text_hashes:
+            return {}
+
+        async with self.db_client() as session:
+            stmt = select(EmbeddingCache.text_hash, EmbeddingCache.embedding_vector).where(
+                EmbeddingCache.embedding_backend == embedding_backend,
+                EmbeddingCache.embedding_model_id == embedding_model_id,
+                EmbeddingCache.document_type == document_type,
+                EmbeddingCache.text_hash.in_(text_hashes)
+            )
+            result = await session.execute(stmt)
+            records = result.all()
+
+        return {
+            record.text_hash: record.embedding_vector
+            for record in records
+        }
+
+
+    async def insert_embeddings(self, embedding_backend: str, embedding_model_id: str,
+                                document_type: str, embeddings: dict, batch_size: int = 500):
+        
+        records = [
+            {
+                "embedding_backend": embedding_backend,
+                "embedding_model_id": embedding_model_id,
+                "document_type": document_type,
+                "text_hash": text_hash,
+                "embedding_vector": vector,
+            }
+            for text_hash, vector in embeddings.items()
+        ]
+
+        async with self.db_client() as session:
+            async with session.begin():
+                for i in range(0, len(records), batch_size):
+                    # identical texts embedded concurrently by two pushes are not an error
+                    stmt = insert(EmbeddingCache).values(records[i:i + batch_size]).on_conflict_do_nothing()
+                    await session.execute(stmt)
+            await session.commit()
+
+        return len(records)
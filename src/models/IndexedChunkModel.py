@@ -0,0 +1,112 @@
+from .BaseDataModel import BaseDataModel
+from .db_schemes import IndexedChunks, DataChunks
+from sqlalchemy import select, delete, exists
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.sql import func
+
+
+class IndexedChunkModel(BaseDataModel):
+    def __init__(self, db_client: object):
+        super().__init__(db_client=db_client)
+        self.db_client = db_client
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        instance = cls(db_client=db_client)  # this will call the __init__ method
+        return instance
+
+
+    async def get_content_hashes(self, collection_name: str, chunk_ids: list) -> dict:
+        
+        if not chunk_ids:
+            return {}
+
+        async with self.db_client() as session:
+            stmt = select(IndexedChunks.indexed_chunk_id, IndexedChunks.indexed_content_hash).where(
+                IndexedChunks.indexed_collection_name == collection_name,
+                IndexedChunks.indexed_chunk_id.in_(chunk_ids)
+            )
+            result = await session.execute(stmt)
+            records = result.all()
+
+        return {
+            record.indexed_chunk_id: record.indexed_content_hash
+            for record in records
+        }
+
+
+    async def get_indexed_count(self, collection_name: str) -> int:
+        async with self.db_client() as session:
+            stmt = select(func.count(IndexedChunks.indexed_chunk_id)).where(
+                IndexedChunks.indexed_collection_name == collection_name
+            )
+            result = await session.execute(stmt)
+            count = result.scalar()
+        return count
+
+
+    async def upsert_content_hashes(self, collection_name: str, project_id: int, content_hashes: dict):
+        
+        if not content_hashes:
+            return 0
+
+        records = [
+            {
+                "indexed_collection_name": collection_name,
+                "indexed_chunk_id": chunk_id,
+                "indexed_project_id": project_id,
+                "indexed_content_hash": content_hash,
+            }
+            for chunk_id, content_hash in content_hashes.items()
+        ]
+
+        async with self.db_client() as session:
+            async with session.begin():
+                stmt = insert(IndexedChunks).values(records)
+                stmt = stmt.on_conflict_do_update(
+                    index_elements=[IndexedChunks.indexed_collection_name, IndexedChunks.indexed_chunk_id],
+                    set_={
+                        "indexed_content_hash": stmt.excluded.indexed_content_hash,
+                        "updated_at": func.now(),
+                    }
+                )
+                await session.execute(stmt)
+            await session.commit()
+
+        return len(records)
+
+
+    async def get_stale_chunk_ids(self, collection_name: str, project_id: int) -> list:
+        """Chunk ids that were indexed into the collection but no longer exist in the project."""
+
+        async with self.db_client() as session:
+            stmt = select(IndexedChunks.indexed_chunk_id).where(
+                IndexedChunks.indexed_collection_name == collection_name,
+                ~exists().where(
+                    DataChunks.chunks_id == IndexedChunks.indexed_chunk_id,
+                    DataChunks.chunk_project_id == project_id
+                )
+            )
+            result = await session.execute(stmt)
+            chunk_ids = result.scalars().all()
+
+        return list(chunk_ids)
+
+
+    async def delete_chunk_ids(self, collection_name: str, chunk_ids: list):
+        async with self.db_client() as session:
+            stmt = delete(IndexedChunks).where(
+                IndexedChunks.indexed_collection_name == collection_name,
+                IndexedChunks.indexed_chunk_id.in_(chunk_ids)
+            )
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
+
+
+    async def delete_collection_state(self, collection_name: str):
+        async with self.db_client() as session:
+            stmt = delete(IndexedChunks).where(IndexedChunks.indexed_collection_name == collection_name)
+            result = await session.execute(stmt)
+            await session.commit()
+        return result.rowcount
@@ -0,0 +1,171 @@
+from .BaseDataModel import BaseDataModel
+from .db_schemes import Jobs
+from .enums.JobEnum import JobStatusEnum
+from sqlalchemy import select, update, or_, and_, exists
+from sqlalchemy.orm import aliased
+from sqlalchemy.sql import func, text as sql_text
+from datetime import datetime, timedelta, timezone
+
+
+class JobModel(BaseDataModel):
+    def __init__(self, db_client: object):
+        super().__init__(db_client=db_client)
+        self.db_client = db_client
+
+    @classmethod
+    async def create_instance(cls, db_client: object):
+        instance = cls(db_client=db_client)  # this will call the __init__ method
+        return instance
+
+
+    async def create_job(self, job: Jobs):
+        async with self.db_client() as session:
+            async with session.begin():
+                session.add(job)
+            await session.commit()
+            await session.refresh(job)
+        
+        return job
+
+
+    async def get_job(self, job_id: int):
+        async with self.db_client() as session:
+            result = await session.execute(select(Jobs).where(Jobs.job_id == job_id))
+            job = result.scalar_one_or_none()
+        return job
+
+
+    async def claim_next_job(self, lease_seconds: int, max_attempts: int):
+        """
+        Atomically take the oldest runnable job. SKIP LOCKED lets any number of
+        workers poll the same table without blocking on each other. Running jobs
+        whose heartbeat expired (their worker died) are taken over until they
+        have used up `max_attempts`. Projects with a live running job are skipped,
+        so a project's jobs run one after the other.
+        """
+        lease_expired_at = datetime.now(timezone.utc) - timedelta(seconds=lease_seconds)
+        running_jobs = aliased(Jobs)
+
+        async with self.db_client() as session:
+            async with session.begin():
+                # two claims running at once would not see each other's running job, the
+                # lock is held only until this short transaction commits
+                await session.execute(sql_text("SELECT pg_advisory_xact_lock(hashtext('jobs'))"))
+
+                # give up on jobs whose workers keep dying
+                await session.execute(
+                    update(Jobs).where(
+                        Jobs.job_status == JobStatusEnum.RUNNING.value,
+                        Jobs.job_heartbeat_at < lease_expired_at,
+                        Jobs.job_attempts >= max_attempts
+                    ).values(
+                        job_status=JobStatusEnum.FAILED.value,
+                        job_error="Job lease expired too many times.",
+                        job_finished_at=func.now()
+                    )
+                )
+
+                stmt = select(Jobs).where(
+                    or_(
+                        Jobs.job_status == JobStatusEnum.PENDING.value,
+                        and_(
+                            Jobs.job_status == JobStatusEnum.RUNNING.value,
+                            Jobs.job_heartbeat_at < lease_expired_at
+                        )
+                    ),
+                    ~exists().where(
+                        running_jobs.job_project_id == Jobs.job_project_id,
+                        running_jobs.job_id != Jobs.job_id,
+                        running_jobs.job_status == JobStatusEnum.RUNNING.value,
+                        running_jobs.job_heartbeat_at >= lease_expired_at
+                    )
+                ).order_by(Jobs.job_id).limit(1).with_for_update(skip_locked=True)
+
+                result = await session.execute(stmt)
+                job = result.scalar_one_or_none()
+
+                if job is None:
+                    return None
+
+                job.job_status = JobStatusEnum.RUNNING.value
+                job.job_attempts += 1
+                job.job_heartbeat_at = func.now()
+                job.job_started_at = func.now()
+
+            await session.commit()
+            await session.refresh(job)
+
+        return job
+
+
+    async def update_progress(self, job_id: int, job_attempts: int, progress: int, total: int = None) -> bool:
+        """
+        Store progress and heartbeat of the `job_attempts` claim of the job; returns
+        whether its worker should stop: a cancel was requested, or the lease expired
+        and another worker claimed the job again.
+        """
+
+        values = {
+            "job_progress": progress,
+            "job_heartbeat_at": func.now(),
+        }
+
+        if total is not None:
+            values["job_total"] = total
+
+        async with self.db_client() as session:
+            async with session.begin():
+                stmt = update(Jobs).where(
+                    Jobs.job_id == job_id,
+                    Jobs.job_attempts == job_attempts
+                ).values(**values).returning(Jobs.job_cancel_requested)
+                result = await session.execute(stmt)
+                row = result.one_or_none()
+            await session.commit()
+
+        return row is None or bool(row.job_cancel_requested)
+
+
+    async def finish_job(self, job_id: int, job_attempts: int, job_status: str,
+                         job_result: dict = None, job_error: str = None) -> bool:
+        """Records the outcome of the `job_attempts` claim; False if another worker has claimed the job since."""
+        async with self.db_client() as session:
+            async with session.begin():
+                stmt = update(Jobs).where(
+                    Jobs.job_id == job_id,
+                    Jobs.job_attempts == job_attempts
+                ).values(
+                    job_status=job_status,
+                    job_result=job_result,
+                    job_error=job_error,
+                    job_finished_at=func.now()
+                )
+                result = await session.execute(stmt)
+            await session.commit()
+
+        return result.rowcount > 0
+
+
+    async def request_cancel(self, job_id: int):
+        """Pending jobs are cancelled right away, running jobs are flagged for their worker."""
+
+        async with self.db_client() as session:
+            async with session.begin():
+                result = await session.execute(
+                    select(Jobs).where(Jobs.job_id == job_id).with_for_update()
+                )
+                job = result.scalar_one_or_none()
+
+                if job is None:
+                    return None
+
+                if job.job_status == JobStatusEnum.PENDING.value:
+                    job.job_status = JobStatusEnum.CANCELLED.value
+                    job.job_finished_at = func.now()
+                elif job.job_status == JobStatusEnum.RUNNING.value:
+                    job.job_cancel_requested = True
+
+            await session.commit()
+            await session.refresh(job)
+
+        return job
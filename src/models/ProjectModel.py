@@ -2,7 +2,7 @@ from .BaseDataModel import BaseDataModel
 from .db_schemes import Project
 from .enums.DataBaseEnum import DataBaseEnum
 from sqlalchemy.future import select
-from sqlalchemy import func
+from sqlalchemy import func, update
 
 
 # .commit() is used to save changes to the database
@@ -83,4 +83,20 @@ class ProjectModel(BaseDataModel):
                 project = await session.execute(query).scalars().all()
 
 
-                return project, total_pages
\ No newline at end of file
+                return project, total_pages
+
+
+
+    async def bump_index_version(self, project_id: int) -> int:
+        # one atomic increment, concurrent pushes of a project each get their own version
+        async with self.db_client() as session:
+            async with session.begin():
+                result = await session.execute(
+                    update(Project)
+                    .where(Project.project_id == project_id)
+                    .values(index_version=Project.index_version + 1)
+                    .returning(Project.index_version)
+                )
+                index_version = result.scalar_one_or_none()
+
+        return index_version
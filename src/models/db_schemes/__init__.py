@@ -1,3 +1,7 @@
 from .minirag.schemas.project import Project
 from .minirag.schemas.datachunks import DataChunks, RetrievedDocuments
-from .minirag.schemas.assets import Assets
\ No newline at end of file
+from .minirag.schemas.assets import Assets
+from .minirag.schemas.embedding_cache import EmbeddingCache
+from .minirag.schemas.indexed_chunks import IndexedChunks
+from .minirag.schemas.jobs import Jobs
+from .minirag.schemas.answer_cache import AnswerCache
\ No newline at end of file
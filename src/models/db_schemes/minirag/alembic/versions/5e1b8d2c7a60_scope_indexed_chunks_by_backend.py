@@ -0,0 +1,28 @@
+"""scope indexed chunks by vector db backend
+
+Revision ID: 5e1b8d2c7a60
+Revises: 7c3e5a9d1f42
+Create Date: 2026-10-19 10:12:41.530227
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5e1b8d2c7a60'
+down_revision: Union[str, None] = '7c3e5a9d1f42'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # rows are now keyed by backend and collection; the old ones cannot tell which
+    # backend they describe, so drop them and let the next push re-index once
+    op.execute("DELETE FROM indexed_chunks")
+
+
+def downgrade() -> None:
+    op.execute("DELETE FROM indexed_chunks")
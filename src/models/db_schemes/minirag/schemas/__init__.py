@@ -1,4 +1,8 @@
 from .minirag_base import SQLAlchemyBase
 from .datachunks import DataChunks, RetrievedDocuments
 from .assets import Assets
-from .project import Project
\ No newline at end of file
+from .project import Project
+from .embedding_cache import EmbeddingCache
+from .indexed_chunks import IndexedChunks
+from .jobs import Jobs
+from .answer_cache import AnswerCache
\ No newline at end of file
@@ -0,0 +1,24 @@
+from .minirag_base import SQLAlchemyBase
+from sqlalchemy import Column, Integer, DateTime, func, String, ForeignKey
+from sqlalchemy.dialects.postgresql import JSONB
+from sqlalchemy import Index
+
+
+class AnswerCache(SQLAlchemyBase):
+    __tablename__ = "answer_cache"
+
+    cache_key = Column(String(64), primary_key=True)  # sha256 of the project, its index version, the query and generation settings
+    answer_project_id = Column(Integer, ForeignKey("projects.project_id", ondelete="CASCADE"), nullable=False)
+
+    answer = Column(JSONB, nullable=False)  # answer, prompt, chat history and sources
+
+    # all the time you set this value 
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # touched on every hit, the least recently used entries are evicted first
+    last_used_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index('idx_answer_cache_last_used_at', 'last_used_at'),
+        Index('idx_answer_cache_project_id', 'answer_project_id'),
+    )
@@ -32,8 +32,9 @@ class DataChunks(SQLAlchemyBase):
     assets = relationship("Assets", back_populates="chunks")
 
 
-    __table__args__ = (
-        Index('idx_chunk_project_id', 'chunk_project_id'),
+    __table_args__ = (
+        # (project, id) lets the index push walk a project's chunks by keyset
+        Index('idx_chunk_project_id', 'chunk_project_id', 'chunks_id'),
         Index('idx_chunk_asset_id', 'chunk_asset_id'),
     )
 
@@ -0,0 +1,18 @@
+from .minirag_base import SQLAlchemyBase
+from sqlalchemy import Column, DateTime, func, String
+from sqlalchemy.dialects.postgresql import ARRAY, REAL
+
+
+class EmbeddingCache(SQLAlchemyBase):
+    __tablename__ = "embedding_cache"
+
+    # the composite primary key is the cache key, so batch lookups are index scans
+    embedding_backend = Column(String, primary_key=True)  # e.g., 'openai', 'cohere'
+    embedding_model_id = Column(String, primary_key=True)  # e.g., 'embed-multilingual-light-v3.0'
+    document_type = Column(String, primary_key=True)  # 'document' or 'query'
+    text_hash = Column(String(64), primary_key=True)  # sha256 of the processed text sent to the provider
+
+    embedding_vector = Column(ARRAY(REAL), nullable=False)
+
+    # all the time you set this value 
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
@@ -0,0 +1,23 @@
+from .minirag_base import SQLAlchemyBase
+from sqlalchemy import Column, Integer, DateTime, func, String, ForeignKey
+from sqlalchemy import Index
+
+
+class IndexedChunks(SQLAlchemyBase):
+    __tablename__ = "indexed_chunks"
+
+    # what has already been pushed into each vector db collection
+    indexed_collection_name = Column(String, primary_key=True)  # backend and collection, e.g., 'pgvector_collection_384_1'
+    indexed_chunk_id = Column(Integer, primary_key=True)  # chunks.chunks_id, kept after the chunk is deleted
+
+    indexed_project_id = Column(Integer, ForeignKey("projects.project_id"), nullable=False)  # Foreign key to the project this chunk belongs to
+    indexed_content_hash = Column(String(64), nullable=False)  # sha256 of the embedding model, text and metadata that were indexed
+
+    # all the time you set this value 
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # onupdate only when the row is updated you set this field to the current time
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
+
+    __table_args__ = (
+        Index('idx_indexed_project_id', 'indexed_project_id'),
+    )
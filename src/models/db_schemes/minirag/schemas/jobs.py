@@ -0,0 +1,41 @@
+from .minirag_base import SQLAlchemyBase
+from sqlalchemy import Column, Integer, DateTime, func, String, ForeignKey, Boolean
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+import uuid 
+from sqlalchemy import Index
+
+
+class Jobs(SQLAlchemyBase):
+    __tablename__ = "jobs"
+
+    job_id = Column(Integer, primary_key=True, autoincrement=True)
+    job_uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, unique=True, nullable=False)
+
+    job_type = Column(String, nullable=False)  # e.g., 'process', 'push'
+    job_status = Column(String, nullable=False, default="pending")  # pending, running, succeeded, failed, cancelled
+    job_project_id = Column(Integer, ForeignKey("projects.project_id"), nullable=False)  # Foreign key to the project this job works on
+
+    job_payload = Column(JSONB, nullable=True)  # the request body the job was submitted with
+    job_result = Column(JSONB, nullable=True)
+    job_error = Column(String, nullable=True)
+
+    job_progress = Column(Integer, nullable=False, default=0)
+    job_total = Column(Integer, nullable=True)
+
+    job_attempts = Column(Integer, nullable=False, default=0)
+    job_cancel_requested = Column(Boolean, nullable=False, default=False)
+
+    # a running job whose heartbeat is older than the lease is picked up again
+    job_heartbeat_at = Column(DateTime(timezone=True), nullable=True)
+    job_started_at = Column(DateTime(timezone=True), nullable=True)
+    job_finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    # all the time you set this value 
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    # onupdate only when the row is updated you set this field to the current time
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now(), nullable=True)
+
+    __table_args__ = (
+        Index('idx_job_status_id', 'job_status', 'job_id'),
+        Index('idx_job_project_id', 'job_project_id'),
+    )
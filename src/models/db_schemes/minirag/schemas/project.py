@@ -10,6 +10,9 @@ class Project(SQLAlchemyBase):
     project_id = Column(Integer, primary_key=True, autoincrement=True)
     project_uuid = Column(UUID(as_uuid=True), default=uuid.uuid4, unique=True, nullable=False)
 
+    # advanced by every push or reset of the project's vector index, part of the answer cache key
+    index_version = Column(Integer, nullable=False, default=0, server_default="0")
+
     # all the time you set this value 
     created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
     # onupdate only when the row is updated you set this field to the current time
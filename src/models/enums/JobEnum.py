@@ -0,0 +1,12 @@
+from enum import Enum
+
+class JobTypeEnum(Enum):
+    PROCESS = "process"
+    PUSH = "push"
+
+class JobStatusEnum(Enum):
+    PENDING = "pending"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
@@ -17,4 +17,11 @@ class ResponseSignal(Enum):
     VECTORDB_SEARCH_SUCCESS = "Vector DB search successful"
     VECTORDB_SEARCH_FAILED = "Vector DB search failed"
     RAG_ANSWER_NOT_FOUND = "RAG answer not found"
-    RAG_ANSWER_SUCCESS = "RAG answer retrieved successfully"
\ No newline at end of file
+    RAG_ANSWER_SUCCESS = "RAG answer retrieved successfully"
+    RAG_ANSWER_SOURCES_RETRIEVED = "RAG answer sources retrieved successfully"
+    RAG_ANSWER_GENERATION_FAILED = "RAG answer generation failed"
+    JOB_SUBMITTED = "Job submitted successfully"
+    JOB_NOT_FOUND = "Job not found"
+    JOB_RETRIEVED = "Job retrieved successfully"
+    JOB_CANCEL_REQUESTED = "Job cancellation requested"
+    JOB_ALREADY_FINISHED = "Job already finished"
\ No newline at end of file
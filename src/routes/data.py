@@ -2,17 +2,15 @@ import os
 from fastapi import APIRouter, Depends, UploadFile, status, Request
 from fastapi.responses import JSONResponse
 from helper.config import Settings, get_settings
-from controllers import DataController, ProjectController, ProcessController
+from controllers import DataController
 import aiofiles
 from models import ResponseSignal
 from .schemas.data import ProcessRequest
 from models.ProjectModel import ProjectModel
-from models.db_schemes import DataChunks
-from models.ChunkModel import ChunkModel
 from models.AssetModel import AssetModel
 from models.db_schemes import Assets
 from models.enums.AssetTypeEnum import AssetTypeEnum
-from controllers import NLPController
+from models.enums.JobEnum import JobTypeEnum
 
 router = APIRouter()
 
@@ -90,10 +88,6 @@ async def upload_data(request: Request, project_id: int, file: UploadFile, app_s
 @router.post("/process/{project_id}")
 async def process_endpoint(request: Request, project_id: int, process_request: ProcessRequest):
     
-    
-    chunk_size = process_request.chunk_size
-    chunk_overlap = process_request.chunk_overlap
-    do_reset = process_request.do_reset
 
     project_model = await ProjectModel.create_instance(
         db_client=request.app.db_client,
@@ -101,22 +95,12 @@ async def process_endpoint(request: Request, project_id: int, process_request: P
 
     project_db = await project_model.get_project_or_create_one(project_id=project_id)
     
-
-    nlp_controller = NLPController(
-        vector_db_client = request.app.vector_db_client,
-        generation_client = request.app.generation_client,
-        embedding_client = request.app.embedding_client,
-        template_parser = request.app.template_parser,
-    )
-
     
-    # Store the asset into the database
+    # Check the requested files exist before queueing any work
     asset_model = await AssetModel.create_instance(
         db_client=request.app.db_client,
     )
 
-    project_files_ids = {}
-
     if process_request.file_id is not None:
         
         asset_record = await asset_model.get_asset_record(
@@ -129,10 +113,6 @@ async def process_endpoint(request: Request, project_id: int, process_request: P
                 status_code=status.HTTP_404_NOT_FOUND,
                 content={"message": ResponseSignal.FILE_ID_ERROR.value}
             )
-        else:
-            project_files_ids = {
-                asset_record.asset_project_id: asset_record.asset_name
-            }
     else:
 
         project_files = await asset_model.get_all_project_assets(
@@ -140,81 +120,26 @@ async def process_endpoint(request: Request, project_id: int, process_request: P
             asset_type=AssetTypeEnum.FILE.value
         )
 
-        project_files_ids = {
-            asset_record.asset_id : asset_record.asset_name
-            for asset_record in project_files
-        }
-    
-
-    if len(project_files_ids) == 0:
-        return JSONResponse(
-            status_code=status.HTTP_404_NOT_FOUND,
-            content={"message": ResponseSignal.NO_FILES_FOUND.value}
-        )
-    
-
-    process_controller = ProcessController(project_id=project_id)
-
-    number_of_records = 0
-    number_of_files = 0
-
-    chunk_model = await ChunkModel.create_instance(
-        db_client=request.app.db_client,
-    )
-
-    if do_reset == 1:
-        # delete associated vectors collection
-        collection_name = nlp_controller.create_collection_name(project_id=project_db.project_id)
-        _ = await nlp_controller.vector_db_client.delete_collection(collection_name=collection_name)
-
-        # delete associated chunks
-        _ = await chunk_model.delete_chunk_by_project_id(project_id=project_db.project_id)
-    
-    for asset_id, file_id in project_files_ids.items():
-        
-        file_contents = process_controller.get_file_content(file_id=file_id)
-
-        file_chunks = process_controller.process_file_content(
-            file_contents=file_contents,
-            file_id=file_id,
-            chunk_size=chunk_size,
-            chunk_overlap=chunk_overlap
-        )
-
-        if file_chunks is None:
-            continue
-
-        if file_chunks is None or len(file_chunks) == 0:
+        if len(project_files) == 0:
             return JSONResponse(
                 status_code=status.HTTP_404_NOT_FOUND,
-                content={"message": ResponseSignal.PROCESSING_FAILED.value}
+                content={"message": ResponseSignal.NO_FILES_FOUND.value}
             )
-        
-        file_chunks_records = [
-            DataChunks(
-                chunk_project_id=project_db.project_id,
-                chunk_asset_id=asset_id,
-                chunk_text=chunk.page_content,
-                chunk_metadata=chunk.metadata,
-                chunk_order=i+1
-            )
-            for i, chunk in enumerate(file_chunks)
-        ]
-        
-        number_of_records += await chunk_model.insert_many_chunks(
-            chunks=file_chunks_records,
-            batch_size=100
-        )
+    
 
-        number_of_files += 1
+    # Loading, splitting and storing chunks runs on a job worker
+    job = await request.app.job_controller.submit_job(
+        job_type=JobTypeEnum.PROCESS.value,
+        project_id=project_db.project_id,
+        payload=process_request.model_dump()
+    )
 
     return JSONResponse(
-        status_code=status.HTTP_200_OK,
+        status_code=status.HTTP_202_ACCEPTED,
         content={
-            "message": ResponseSignal.PROCESSING_SUCCESS.value,
-            "inserted_chunks": number_of_records,
-            "processed_files": number_of_files
+            "message": ResponseSignal.JOB_SUBMITTED.value,
+            "job_id": job.job_id,
+            "job_status": job.job_status
         }
     )
     
-
@@ -0,0 +1,114 @@
+from fastapi import APIRouter, status, Request
+from fastapi.responses import JSONResponse
+from models.JobModel import JobModel
+from models.enums.JobEnum import JobStatusEnum
+from models import ResponseSignal
+
+router = APIRouter()
+
+
+def serialize_job(job) -> dict:
+    return {
+        "job_id": job.job_id,
+        "job_uuid": str(job.job_uuid),
+        "job_type": job.job_type,
+        "job_status": job.job_status,
+        "project_id": job.job_project_id,
+        "progress": job.job_progress,
+        "total": job.job_total,
+        "attempts": job.job_attempts,
+        "cancel_requested": job.job_cancel_requested,
+        "result": job.job_result,
+        "error": job.job_error,
+        "created_at": job.created_at.isoformat() if job.created_at else None,
+        "started_at": job.job_started_at.isoformat() if job.job_started_at else None,
+        "finished_at": job.job_finished_at.isoformat() if job.job_finished_at else None,
+    }
+
+
+@router.get("/{job_id}")
+async def get_job_status(request: Request, job_id: int):
+
+    job_model = await JobModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    job = await job_model.get_job(job_id=job_id)
+
+    if job is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.JOB_NOT_FOUND.value
+            }
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.JOB_RETRIEVED.value,
+            "job": serialize_job(job)
+        }
+    )
+
+
+@router.get("/{job_id}/progress")
+async def get_job_progress(request: Request, job_id: int):
+
+    job_model = await JobModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    job = await job_model.get_job(job_id=job_id)
+
+    if job is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.JOB_NOT_FOUND.value
+            }
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.JOB_RETRIEVED.value,
+            "job_status": job.job_status,
+            "progress": job.job_progress,
+            "total": job.job_total,
+            "percentage": round(100 * job.job_progress / job.job_total, 2) if job.job_total else None
+        }
+    )
+
+
+@router.post("/{job_id}/cancel")
+async def cancel_job(request: Request, job_id: int):
+
+    job_model = await JobModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    job = await job_model.request_cancel(job_id=job_id)
+
+    if job is None:
+        return JSONResponse(
+            status_code=status.HTTP_404_NOT_FOUND,
+            content={
+                "signal": ResponseSignal.JOB_NOT_FOUND.value
+            }
+        )
+
+    if job.job_status not in (JobStatusEnum.RUNNING.value, JobStatusEnum.CANCELLED.value):
+        return JSONResponse(
+            status_code=status.HTTP_409_CONFLICT,
+            content={
+                "signal": ResponseSignal.JOB_ALREADY_FINISHED.value,
+                "job": serialize_job(job)
+            }
+        )
+
+    return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
+        content={
+            "signal": ResponseSignal.JOB_CANCEL_REQUESTED.value,
+            "job": serialize_job(job)
+        }
+    )
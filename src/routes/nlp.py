@@ -1,13 +1,15 @@
 from fastapi import APIRouter, Depends, UploadFile, status, Request
 from helper.config import Settings, get_settings
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+import json
 import logging
-from .schemas.nlp import PushRequest, SearchRequest
+import time
+from .schemas.nlp import PushRequest, SearchRequest, BatchSearchRequest
 from models.ProjectModel import ProjectModel
-from models.ChunkModel import ChunkModel
+from models.enums.JobEnum import JobTypeEnum
 from controllers import NLPController
 from models import ResponseSignal
-from tqdm.auto import tqdm
+from utils.metrics import RAG_ANSWER_TIME_TO_FIRST_TOKEN
 
 
 logger = logging.getLogger('uvicorn.error')
@@ -22,10 +24,6 @@ async def index_project(request: Request, project_id: int, push_request: PushReq
         db_client=request.app.db_client
     )
 
-    chunk_model = await ChunkModel.create_instance(
-        db_client=request.app.db_client
-    )
-
     # this will get the Project model
     project = await project_model.get_project_or_create_one(
         project_id=project_id
@@ -35,79 +33,23 @@ async def index_project(request: Request, project_id: int, push_request: PushReq
         return JSONResponse(
             status_code=status.HTTP_400_BAD_REQUEST,
             content={
-                "signal": ResponseSignal.PROJECT_NOT_FOUND_ERROR.value
+                "signal": ResponseSignal.PROJECT_NOT_FOUND.value
             }
         )
     
-    # This will handle the NLP operations like indexing into vector db
-    nlp_controller = NLPController(
-        vector_db_client=request.app.vector_db_client,
-        generation_client=request.app.generation_client,
-        embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser
-    )
-    
-    has_records = True
-    page_no = 1
-    inserted_items_count = 0
-    idx = 0
-
-    # create collection if not exists 
-    collection_name = nlp_controller.create_collection_name(
-        project_id=project.project_id
+    # fetch, embed and insert run on a job worker, track it through /v1/jobs
+    job = await request.app.job_controller.submit_job(
+        job_type=JobTypeEnum.PUSH.value,
+        project_id=project.project_id,
+        payload=push_request.model_dump()
     )
-
-    _ = await request.app.vector_db_client.create_collection(
-        collection_name=collection_name,
-        embedding_size=request.app.embedding_client.embedding_size,
-        do_reset=push_request.do_reset
-    )
-
-    # setup batching 
-    total_chunks_count = await chunk_model.get_total_chunks_count(
-        project_id=project.project_id
-    )
-
-    pbar = tqdm(
-        total=total_chunks_count,
-        desc="Indexing chunks into vector db",
-        position=0,
-    )
-
-    while has_records:
-        page_chunks = await chunk_model.get_project_chunks(project_id=project.project_id, page_number=page_no)
-        
-        if len(page_chunks):
-            page_no += 1
-        
-        if not page_chunks or len(page_chunks) == 0:
-            has_records = False
-            break
-        
-        chunks_ids = [ chunk.chunks_id for chunk in page_chunks]
-        idx += len(page_chunks)
-        
-        is_inserted = await nlp_controller.index_into_vector_db(
-            project=project,
-            chunks=page_chunks,
-            chunks_ids=chunks_ids
-        )
-
-        if not is_inserted:
-            return JSONResponse(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                content={
-                    "signal": ResponseSignal.INSERT_INTO_VECTORDB_ERROR.value
-                }
-            )
-        
-        pbar.update(len(page_chunks))
-        inserted_items_count += len(page_chunks)
         
     return JSONResponse(
+        status_code=status.HTTP_202_ACCEPTED,
         content={
-            "signal": ResponseSignal.INSERTION_INTO_VECTOR_DB_SUCCESS.value,
-            "inserted_items_count": inserted_items_count
+            "signal": ResponseSignal.JOB_SUBMITTED.value,
+            "job_id": job.job_id,
+            "job_status": job.job_status
         }
     )
 
@@ -172,13 +114,18 @@ async def search_project_index(request: Request, project_id: int, search_request
         vector_db_client=request.app.vector_db_client,
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser
+        template_parser=request.app.template_parser,
+        query_embedding_cache=request.app.query_embedding_cache,
+        query_embedding_coalescer=request.app.query_embedding_coalescer
     )
 
     result = nlp_controller.search_vector_db_collection = await nlp_controller.search_vector_db_collection(
         project=project,
         text=search_request.text,
-        limit=search_request.limit
+        limit=search_request.limit,
+        accuracy=search_request.accuracy.value if search_request.accuracy else None,
+        filters=[f.model_dump(mode="json") for f in search_request.filters or []],
+        mode=search_request.mode.value if search_request.mode else None
     )
 
     if not result:
@@ -203,6 +150,60 @@ async def search_project_index(request: Request, project_id: int, search_request
     )
 
 
+@router.post("/index/search-batch/{project_id}")
+async def search_project_index_batch(request: Request, project_id: int, search_request: BatchSearchRequest):
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    )
+
+    nlp_controller = NLPController(
+        vector_db_client=request.app.vector_db_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        query_embedding_cache=request.app.query_embedding_cache,
+        query_embedding_coalescer=request.app.query_embedding_coalescer
+    )
+
+    results = await nlp_controller.search_vector_db_collection_batch(
+        project=project,
+        texts=search_request.queries,
+        limit=search_request.limit,
+        accuracy=search_request.accuracy.value if search_request.accuracy else None,
+        filters=[f.model_dump(mode="json") for f in search_request.filters or []]
+    )
+
+    if not results:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.VECTORDB_SEARCH_FAILED.value
+            }
+        )
+
+    return JSONResponse(
+        content={
+            "signal": ResponseSignal.VECTORDB_SEARCH_SUCCESS.value,
+            "results": [
+                {
+                    "text": text,
+                    "result": [
+                        {
+                            "text": doc.text,
+                            "score": doc.score
+                        } for doc in result
+                    ]
+                } for text, result in zip(search_request.queries, results)
+            ]
+        }
+    )
+
+
 @router.get("/index/answer/{project_id}")
 async def answer_rag_questions(request: Request, project_id: int, search_request: SearchRequest):
     
@@ -222,13 +223,19 @@ async def answer_rag_questions(request: Request, project_id: int, search_request
         vector_db_client=request.app.vector_db_client,
         generation_client=request.app.generation_client,
         embedding_client=request.app.embedding_client,
-        template_parser=request.app.template_parser
+        template_parser=request.app.template_parser,
+        query_embedding_cache=request.app.query_embedding_cache,
+        query_embedding_coalescer=request.app.query_embedding_coalescer,
+        answer_cache=request.app.answer_cache
     )
 
     answer, full_prompt, chat_history = await nlp_controller.answer_rag_question(
         project=project,
         query=search_request.text,
-        limit=search_request.limit
+        limit=search_request.limit,
+        accuracy=search_request.accuracy.value if search_request.accuracy else None,
+        filters=[f.model_dump(mode="json") for f in search_request.filters or []],
+        mode=search_request.mode.value if search_request.mode else None
     )
 
     if not answer:
@@ -246,4 +253,93 @@ async def answer_rag_questions(request: Request, project_id: int, search_request
             "full_prompt": full_prompt,
             "chat_history": chat_history
         }
-    )
\ No newline at end of file
+    )
+
+
+def format_sse_event(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.get("/index/answer-stream/{project_id}")
+async def answer_rag_questions_stream(request: Request, project_id: int, search_request: SearchRequest):
+
+    started_at = time.perf_counter()
+
+    project_model = await ProjectModel.create_instance(
+        db_client=request.app.db_client
+    )
+
+    project = await project_model.get_project_or_create_one(
+        project_id=project_id
+    )
+
+    nlp_controller = NLPController(
+        vector_db_client=request.app.vector_db_client,
+        generation_client=request.app.generation_client,
+        embedding_client=request.app.embedding_client,
+        template_parser=request.app.template_parser,
+        query_embedding_cache=request.app.query_embedding_cache,
+        query_embedding_coalescer=request.app.query_embedding_coalescer,
+        answer_cache=request.app.answer_cache
+    )
+
+    retrieved_documents, answer_stream = await nlp_controller.answer_rag_question_stream(
+        project=project,
+        query=search_request.text,
+        limit=search_request.limit,
+        accuracy=search_request.accuracy.value if search_request.accuracy else None,
+        filters=[f.model_dump(mode="json") for f in search_request.filters or []],
+        mode=search_request.mode.value if search_request.mode else None
+    )
+
+    # nothing was streamed yet, so a missing answer is still a plain error response
+    if not retrieved_documents:
+        return JSONResponse(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            content={
+                "signal": ResponseSignal.RAG_ANSWER_NOT_FOUND.value
+            }
+        )
+
+    async def stream_events():
+        yield format_sse_event("sources", {
+            "signal": ResponseSignal.RAG_ANSWER_SOURCES_RETRIEVED.value,
+            "sources": [
+                {
+                    "text": doc.text,
+                    "score": doc.score
+                } for doc in retrieved_documents
+            ]
+        })
+
+        tokens_count = 0
+        try:
+            async for text in answer_stream:
+                if tokens_count == 0:
+                    RAG_ANSWER_TIME_TO_FIRST_TOKEN.observe(time.perf_counter() - started_at)
+                tokens_count += 1
+
+                yield format_sse_event("token", {"text": text})
+        except Exception as e:
+            logger.error(f"Streaming the answer for project {project_id} failed: {e}")
+            yield format_sse_event("error", {"signal": ResponseSignal.RAG_ANSWER_GENERATION_FAILED.value})
+            return
+        finally:
+            # a disconnected client cancels this generator, stop the provider stream with it
+            await answer_stream.aclose()
+
+        if tokens_count == 0:
+            yield format_sse_event("error", {"signal": ResponseSignal.RAG_ANSWER_NOT_FOUND.value})
+            return
+
+        yield format_sse_event("done", {
+            "signal": ResponseSignal.RAG_ANSWER_SUCCESS.value,
+            "elapsed_seconds": round(time.perf_counter() - started_at, 3)
+        })
+
+    return StreamingResponse(
+        stream_events(),
+        media_type="text/event-stream",
+        # proxies such as the nginx in front of the app must pass every event through at once
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
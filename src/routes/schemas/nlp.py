@@ -1,9 +1,25 @@
-from pydantic import BaseModel
-from typing import Optional
+from pydantic import BaseModel, Field
+from typing import Any, List, Optional
+from stores.vectordb.VectorDBEnum import SearchAccuracyEnum, FilterOperatorEnum, SearchModeEnum
 
 class PushRequest(BaseModel):
     do_reset: Optional[int] = 0
 
+class SearchFilter(BaseModel):
+    field: str = Field(pattern=r"^[A-Za-z_][A-Za-z0-9_]*$")
+    op: Optional[FilterOperatorEnum] = FilterOperatorEnum.EQ
+    value: Any
+
 class SearchRequest(BaseModel):
     text: str
     limit: Optional[int] = 5
+    accuracy: Optional[SearchAccuracyEnum] = None
+    filters: Optional[List[SearchFilter]] = None
+    mode: Optional[SearchModeEnum] = SearchModeEnum.VECTOR
+
+
+class BatchSearchRequest(BaseModel):
+    queries: List[str] = Field(min_length=1, max_length=100)
+    limit: Optional[int] = 5
+    accuracy: Optional[SearchAccuracyEnum] = None
+    filters: Optional[List[SearchFilter]] = None
@@ -0,0 +1,61 @@
+import hashlib
+import json
+from models.AnswerCacheModel import AnswerCacheModel
+from utils.lru_cache import LRUCache
+from utils.metrics import ANSWER_CACHE_HITS, ANSWER_CACHE_MISSES
+
+
+class AnswerCache:
+    """
+    Cache of RAG answers keyed on everything that shapes them, including the index
+    version of the project. Pushes and resets advance that version, so answers over
+    an older index are never looked up again and simply age out. Entries live in an
+    in-process LRU; with an `answer_cache_model` the LRU is a first level in front of
+    a Postgres table shared by every process.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl: float = None, answer_cache_model: AnswerCacheModel = None):
+        self.cache = LRUCache(max_size=max_size, ttl=ttl)
+        self.ttl = ttl
+        self.answer_cache_model = answer_cache_model
+
+    def normalize_text(self, text: str) -> str:
+        # collapse whitespace and case so trivially different spellings share one entry
+        return " ".join(text.split()).casefold()
+
+    def get_key(self, project_id: int, index_version: int, query: str, limit: int,
+                generation_backend: str, generation_model_id: str, language: str,
+                accuracy: str = None, filters: list = None, mode: str = None) -> str:
+        key = json.dumps([
+            project_id, index_version, self.normalize_text(query), limit,
+            generation_backend, generation_model_id, language,
+            accuracy, filters or [], mode,
+        ], sort_keys=True, ensure_ascii=False)
+        return hashlib.sha256(key.encode("utf-8")).hexdigest()
+
+    async def get(self, key: str, generation_model_id: str) -> dict:
+        answer = self.cache.get(key)
+
+        if answer is None and self.answer_cache_model:
+            answer = await self.answer_cache_model.get_answer(cache_key=key)
+            if answer is not None:
+                self.cache.set(key, answer)
+
+        if answer is None:
+            ANSWER_CACHE_MISSES.labels(model=generation_model_id).inc()
+        else:
+            ANSWER_CACHE_HITS.labels(model=generation_model_id).inc()
+
+        return answer
+
+    async def set(self, key: str, project_id: int, answer: dict):
+        self.cache.set(key, answer)
+
+        if self.answer_cache_model:
+            await self.answer_cache_model.insert_answer(cache_key=key, project_id=project_id,
+                                                        answer=answer, ttl=self.ttl)
+
+    async def forget_project(self, project_id: int):
+        # local entries of the old index version are unreachable already, the shared rows are freed now
+        if self.answer_cache_model:
+            _ = await self.answer_cache_model.delete_project_answers(project_id=project_id)
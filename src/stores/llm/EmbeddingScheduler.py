@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import random
+import time
+from typing import List
+
+
+class TokenBucket:
+    """Async token bucket that refills `rate_per_minute` units every minute."""
+
+    def __init__(self, rate_per_minute: int = None):
+        self.capacity = float(rate_per_minute) if rate_per_minute else None
+        self.tokens = self.capacity
+        self.fill_rate = self.capacity / 60.0 if self.capacity else None
+        self.updated_at = time.monotonic()
+        self.lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.fill_rate)
+        self.updated_at = now
+
+    async def acquire(self, amount: float = 1):
+        # an unlimited bucket never waits
+        if self.capacity is None:
+            return
+
+        # a single request bigger than the whole budget can only wait for a full bucket
+        amount = min(amount, self.capacity)
+
+        # the lock keeps waiters in FIFO order so large batches are not starved
+        async with self.lock:
+            while True:
+                self._refill()
+                if self.tokens >= amount:
+                    self.tokens -= amount
+                    return
+                await asyncio.sleep((amount - self.tokens) / self.fill_rate)
+
+
+class EmbeddingScheduler:
+    """
+    Keeps several embedding batches in flight against one provider while respecting
+    its requests/min and tokens/min budget. On rate limit errors (HTTP 429) the
+    scheduler pauses every worker, halves the allowed concurrency and retries with
+    exponential backoff; concurrency grows back one slot at a time on success.
+    """
+
+    def __init__(self, embedding_client, max_concurrency: int = 4,
+                 requests_per_minute: int = None, tokens_per_minute: int = None,
+                 max_retries: int = 5, base_backoff: float = 1.0, max_backoff: float = 60.0):
+
+        self.embedding_client = embedding_client
+        self.max_concurrency = max(1, max_concurrency or 1)
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+
+        self.concurrency_limit = self.max_concurrency
+        self.in_flight = 0
+        self.slots = asyncio.Condition()
+        self.paused_until = 0.0
+
+        self.logger = logging.getLogger("uvicorn.error")
+
+    def estimate_tokens(self, texts: List[str]) -> int:
+        # ~4 characters per token is close enough for quota accounting
+        max_characters = getattr(self.embedding_client, "default_input_max_characters", None)
+        characters = sum(len(text[:max_characters] if max_characters else text) for text in texts)
+        return characters // 4 + 1
+
+    def is_rate_limited(self, error: Exception) -> bool:
+        if getattr(error, "status_code", None) == 429:
+            return True
+        return type(error).__name__ in ("RateLimitError", "TooManyRequestsError")
+
+    def get_retry_after(self, error: Exception, attempt: int) -> float:
+        response = getattr(error, "response", None)
+        headers = getattr(response, "headers", None) or {}
+        retry_after = headers.get("retry-after") if hasattr(headers, "get") else None
+
+        try:
+            if retry_after is not None:
+                return min(float(retry_after), self.max_backoff)
+        except ValueError:
+            pass
+
+        backoff = min(self.base_backoff * (2 ** attempt), self.max_backoff)
+        return backoff * (0.5 + random.random() / 2)
+
+    async def acquire_slot(self):
+        async with self.slots:
+            await self.slots.wait_for(lambda: self.in_flight < self.concurrency_limit)
+            self.in_flight += 1
+
+    async def release_slot(self, rate_limited: bool = False):
+        async with self.slots:
+            self.in_flight -= 1
+            if rate_limited:
+                self.concurrency_limit = max(1, self.concurrency_limit // 2)
+            elif self.concurrency_limit < self.max_concurrency:
+                self.concurrency_limit += 1
+            self.slots.notify_all()
+
+    async def embed_batch(self, texts: List[str], document_type: str = None):
+        for attempt in range(self.max_retries + 1):
+
+            await self.acquire_slot()
+            rate_limited = False
+            try:
+                pause = self.paused_until - time.monotonic()
+                if pause > 0:
+                    await asyncio.sleep(pause)
+
+                await self.request_bucket.acquire(1)
+                await self.token_bucket.acquire(self.estimate_tokens(texts))
+
+                return await self.embedding_client.embed_text_async(
+                    text=texts,
+                    document_type=document_type
+                )
+            except Exception as e:
+                if not self.is_rate_limited(e) or attempt == self.max_retries:
+                    raise
+
+                rate_limited = True
+                backoff = self.get_retry_after(e, attempt)
+                self.paused_until = max(self.paused_until, time.monotonic() + backoff)
+                self.logger.warning(f"Embedding provider rate limited, retrying in {backoff:.1f}s "
+                                    f"(retry {attempt + 1} of {self.max_retries})")
+            finally:
+                await self.release_slot(rate_limited=rate_limited)
+
+    async def embed_batches(self, batches: List[List[str]], document_type: str = None):
+        """Embeds all batches concurrently and returns the vectors in input order, or None on failure."""
+
+        results = await asyncio.gather(*[
+            self.embed_batch(texts=batch, document_type=document_type)
+            for batch in batches
+        ], return_exceptions=True)
+
+        vectors = []
+        for batch, batch_vectors in zip(batches, results):
+            if isinstance(batch_vectors, Exception):
+                self.logger.error(f"Error while embedding batch: {batch_vectors}")
+                return None
+
+            if not batch_vectors or len(batch_vectors) != len(batch):
+                self.logger.error("Embedding provider returned an incomplete batch.")
+                return None
+
+            vectors.extend(batch_vectors)
+
+        return vectors
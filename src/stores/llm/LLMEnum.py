@@ -22,4 +22,9 @@ class CoHereEnum(Enum):
 
 class DocumentTypeEnum(Enum):
     DOCUMENT = "document"
-    QUERY = "query"
\ No newline at end of file
+    QUERY = "query"
+
+
+class AnswerCacheBackendEnum(Enum):
+    MEMORY = "memory"
+    POSTGRES = "postgres"
\ No newline at end of file
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import List, Union
+from typing import AsyncIterator, List, Union
 
 class LLMInterface(ABC):
 
@@ -17,10 +17,24 @@ class LLMInterface(ABC):
                       temperature: float = None):
         pass
 
+    @abstractmethod
+    async def generate_text_async(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                  temperature: float = None):
+        pass
+
+    @abstractmethod
+    def generate_text_stream(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                             temperature: float = None) -> AsyncIterator[str]:
+        pass
+
     @abstractmethod
     def embed_text(self, text: Union[str, List[str]], document_type: str = None):
         pass
 
+    @abstractmethod
+    async def embed_text_async(self, text: Union[str, List[str]], document_type: str = None):
+        pass
+
     @abstractmethod
     def construct_prompt(self, prompt: str, role: str):
         pass
\ No newline at end of file
@@ -0,0 +1,29 @@
+from utils.lru_cache import LRUCache
+from utils.metrics import QUERY_EMBEDDING_CACHE_HITS, QUERY_EMBEDDING_CACHE_MISSES
+
+
+class QueryEmbeddingCache:
+    """In-process LRU cache of query vectors keyed on the normalized query text and embedding model."""
+
+    def __init__(self, max_size: int = 10000, ttl: float = None):
+        self.cache = LRUCache(max_size=max_size, ttl=ttl)
+
+    def normalize_text(self, text: str) -> str:
+        # collapse whitespace and case so trivially different spellings share one entry
+        return " ".join(text.split()).casefold()
+
+    def get_key(self, text: str, embedding_backend: str, embedding_model_id: str):
+        return (embedding_backend, embedding_model_id, self.normalize_text(text))
+
+    def get(self, text: str, embedding_backend: str, embedding_model_id: str):
+        vector = self.cache.get(self.get_key(text, embedding_backend, embedding_model_id))
+
+        if vector is None:
+            QUERY_EMBEDDING_CACHE_MISSES.labels(model=embedding_model_id).inc()
+        else:
+            QUERY_EMBEDDING_CACHE_HITS.labels(model=embedding_model_id).inc()
+
+        return vector
+
+    def set(self, text: str, embedding_backend: str, embedding_model_id: str, vector: list):
+        self.cache.set(self.get_key(text, embedding_backend, embedding_model_id), vector)
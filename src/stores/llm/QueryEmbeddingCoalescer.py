@@ -0,0 +1,77 @@
+import asyncio
+import logging
+from typing import List
+from .LLMEnum import DocumentTypeEnum
+from utils.metrics import QUERY_EMBEDDING_BATCH_SIZE
+
+
+class QueryEmbeddingCoalescer:
+    """
+    Collects query texts from concurrent requests for up to `window_ms` (or until
+    `max_batch_size` texts are waiting), embeds them with one provider call and
+    resolves each caller with its own vector.
+    """
+
+    def __init__(self, embedding_client, window_ms: int = 5, max_batch_size: int = 96):
+        self.embedding_client = embedding_client
+        self.window = window_ms / 1000.0
+        self.max_batch_size = max(1, max_batch_size)
+
+        self.pending = []
+        self.flush_handle = None
+        self.tasks = set()
+
+        self.logger = logging.getLogger("uvicorn.error")
+
+    async def embed(self, text: str):
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.append((text, future))
+
+        if len(self.pending) >= self.max_batch_size:
+            self.flush()
+        elif self.flush_handle is None:
+            self.flush_handle = loop.call_later(self.window, self.flush)
+
+        return await future
+
+    def flush(self):
+        if self.flush_handle is not None:
+            self.flush_handle.cancel()
+            self.flush_handle = None
+
+        while self.pending:
+            batch = self.pending[:self.max_batch_size]
+            self.pending = self.pending[self.max_batch_size:]
+
+            # keep a reference so the task is not garbage collected mid-flight
+            task = asyncio.ensure_future(self.embed_batch(batch))
+            self.tasks.add(task)
+            task.add_done_callback(self.tasks.discard)
+
+    async def embed_batch(self, batch: List[tuple]):
+        # identical queries in one window share a single slot in the provider call
+        texts = list(dict.fromkeys(text for text, _ in batch))
+        QUERY_EMBEDDING_BATCH_SIZE.observe(len(texts))
+
+        try:
+            vectors = await self.embedding_client.embed_text_async(
+                text=texts,
+                document_type=DocumentTypeEnum.QUERY.value
+            )
+        except Exception as e:
+            self.logger.error(f"Error while embedding query batch: {e}")
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        if not vectors or len(vectors) != len(texts):
+            self.logger.error("Embedding provider returned an incomplete query batch.")
+            vectors = [None] * len(texts)
+
+        text_vectors = dict(zip(texts, vectors))
+        for text, future in batch:
+            # the caller may have gone away (client disconnect cancels its future)
+            if not future.done():
+                future.set_result(text_vectors[text])
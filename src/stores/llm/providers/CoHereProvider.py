@@ -1,8 +1,8 @@
 from ..LLMInterface import LLMInterface
 import logging 
 from ..LLMEnum import CoHereEnum, DocumentTypeEnum
-from cohere import Client 
-from typing import List, Union
+from cohere import Client, AsyncClient
+from typing import AsyncIterator, List, Union
 
 
 class CoHereProvider(LLMInterface):
@@ -25,8 +25,9 @@ class CoHereProvider(LLMInterface):
         self.enums = CoHereEnum
 
         self.client = Client(api_key=self.api_key)
+        self.async_client = AsyncClient(api_key=self.api_key)
         
-        self.logger = logging.getLogger(__name__)
+        self.logger = logging.getLogger("uvicorn.error")
 
 
     def set_generation_model(self, model_id: str):
@@ -68,6 +69,63 @@ class CoHereProvider(LLMInterface):
             return None
 
         return response.text
+
+
+    async def generate_text_async(self, prompt: str, chat_history: list=[],
+        max_output_tokens: int=None, temperature: float = None):
+
+        if not self.async_client:
+            self.logger.error("Cohere async client is not initialized.")
+            return None
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model ID is not set.")
+            return None
+
+        max_output_tokens = max_output_tokens if max_output_tokens is not None else self.default_generation_max_output_token
+        temperature = temperature if temperature is not None else self.defult_generation_temperature
+
+        response = await self.async_client.chat(
+            model=self.generation_model_id,
+            chat_history=chat_history,
+            message=prompt,
+            temperature=temperature,
+            max_tokens=max_output_tokens
+        )
+
+        if response is None or not response.text:
+            self.logger.error("Failed to generate text.")
+            return None
+
+        return response.text
+
+
+    async def generate_text_stream(self, prompt: str, chat_history: list=[],
+        max_output_tokens: int=None, temperature: float = None) -> AsyncIterator[str]:
+
+        if not self.async_client:
+            self.logger.error("Cohere async client is not initialized.")
+            return
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model ID is not set.")
+            return
+
+        max_output_tokens = max_output_tokens if max_output_tokens is not None else self.default_generation_max_output_token
+        temperature = temperature if temperature is not None else self.defult_generation_temperature
+
+        stream = self.async_client.chat_stream(
+            model=self.generation_model_id,
+            chat_history=chat_history,
+            message=prompt,
+            temperature=temperature,
+            max_tokens=max_output_tokens
+        )
+
+        # the stream also reports its start, citations and end, only text events carry tokens
+        async for event in stream:
+            if event.event_type == "text-generation" and event.text:
+                yield event.text
     
 
     def embed_text(self, text: Union[str, List[str]], document_type: str = None):
@@ -106,6 +164,41 @@ class CoHereProvider(LLMInterface):
         
         return [ f for f in response.embeddings.float ]
 
+
+    async def embed_text_async(self, text: Union[str, List[str]], document_type: str = None):
+        if not self.async_client:
+            self.logger.error("Cohere async client is not initialized.")
+            return None
+
+        if isinstance(text, str):
+            texts = [text]
+        elif isinstance(text, list):
+            texts = text
+        else:
+            self.logger.error("Invalid input type for text.")
+            return None
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model ID is not set.")
+            return None
+
+        input_type = CoHereEnum.DOCUMENT.value
+        if document_type == DocumentTypeEnum.QUERY.value:
+            input_type = CoHereEnum.QUERY.value
+
+        response = await self.async_client.embed(
+            model=self.embedding_model_id,
+            texts=[self.process_text(text) for text in texts],
+            input_type=input_type,
+            embedding_types=['float']
+        )
+
+        if response is None or not response.embeddings:
+            self.logger.error("Failed to embed text.")
+            return None
+
+        return [ f for f in response.embeddings.float ]
+
     
     def construct_prompt(self, prompt: str, role: str):
         return {
@@ -1,8 +1,8 @@
 from ..LLMInterface import LLMInterface
-from openai import OpenAI
+from openai import OpenAI, AsyncOpenAI
 import logging 
 from ..LLMEnum import OpenAIEnum
-from typing import List, Union
+from typing import AsyncIterator, List, Union
 
 
 class OpenAIProvider(LLMInterface):
@@ -28,8 +28,13 @@ class OpenAIProvider(LLMInterface):
             api_key=self.api_key, 
             base_url=self.api_url if self.api_url and len(self.api_url) > 0 else None
         )
+
+        self.async_client = AsyncOpenAI(
+            api_key=self.api_key,
+            base_url=self.api_url if self.api_url and len(self.api_url) > 0 else None
+        )
         
-        self.logger = logging.getLogger(__name__)
+        self.logger = logging.getLogger("uvicorn.error")
 
     def set_generation_model(self, model_id: str):
         self.generation_model_id = model_id
@@ -73,13 +78,83 @@ class OpenAIProvider(LLMInterface):
             self.logger.error("Failed to get response from OpenAI.")
             return None
 
-        return response.choices[0].message['content']
+        return response.choices[0].message.content
+
+
+    async def generate_text_async(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                  temperature: float = None):
+
+        if not self.async_client:
+            self.logger.error("OpenAI async client is not initialized.")
+            return None
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model ID is not set.")
+            return None
+
+        max_output_tokens = max_output_tokens if max_output_tokens is not None else self.default_generation_max_output_token
+
+        temperature = temperature if temperature is not None else self.defult_generation_temperature
+
+        # like generate_text, the prompt is appended to the caller's history, which the
+        # /answer response returns as the full conversation sent to the model
+        chat_history.append(
+            self.construct_prompt(prompt=prompt, role=OpenAIEnum.USER.value)
+        )
+
+        response = await self.async_client.chat.completions.create(
+            model=self.generation_model_id,
+            messages=chat_history,
+            max_tokens=max_output_tokens,
+            temperature=temperature
+        )
+
+        if not response or not response.choices or len(response.choices) == 0 or not response.choices[0].message:
+            self.logger.error("Failed to get response from OpenAI.")
+            return None
+
+        return response.choices[0].message.content
+
+
+    async def generate_text_stream(self, prompt: str, chat_history: list=[], max_output_tokens: int=None,
+                                   temperature: float = None) -> AsyncIterator[str]:
+
+        if not self.async_client:
+            self.logger.error("OpenAI async client is not initialized.")
+            return
+
+        if not self.generation_model_id:
+            self.logger.error("Generation model ID is not set.")
+            return
+
+        max_output_tokens = max_output_tokens if max_output_tokens is not None else self.default_generation_max_output_token
+
+        temperature = temperature if temperature is not None else self.defult_generation_temperature
+
+        messages = chat_history + [
+            self.construct_prompt(prompt=prompt, role=OpenAIEnum.USER.value)
+        ]
+
+        stream = await self.async_client.chat.completions.create(
+            model=self.generation_model_id,
+            messages=messages,
+            max_tokens=max_output_tokens,
+            temperature=temperature,
+            stream=True
+        )
+
+        # every chunk carries the next few tokens of the single choice;
+        # leaving early, e.g. on a client disconnect, closes the HTTP response
+        async with stream:
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
 
 
     def construct_prompt(self, prompt: str, role: str):
         return {
             "role": role,
-            "content": [self]
+            "content": prompt
         }
     
 
@@ -90,6 +165,11 @@ class OpenAIProvider(LLMInterface):
         
         if isinstance(text, str):
             texts = [text]
+        elif isinstance(text, list):
+            texts = text
+        else:
+            self.logger.error("Invalid input type for text.")
+            return None
 
         if not self.embedding_model_id:
             self.logger.error("Embedding model ID is not set.")
@@ -105,4 +185,32 @@ class OpenAIProvider(LLMInterface):
             return None
         
         return [rec.embedding for rec in response.data]
-    
+
+
+    async def embed_text_async(self, text: Union[str, List[str]], document_type: str = None):
+        if not self.async_client:
+            self.logger.error("OpenAI async client is not initialized.")
+            return None
+
+        if isinstance(text, str):
+            texts = [text]
+        elif isinstance(text, list):
+            texts = text
+        else:
+            self.logger.error("Invalid input type for text.")
+            return None
+
+        if not self.embedding_model_id:
+            self.logger.error("Embedding model ID is not set.")
+            return None
+
+        response = await self.async_client.embeddings.create(
+            model=self.embedding_model_id,
+            input=[self.process_text(text) for text in texts],
+        )
+
+        if not response or not response.data or len(response.data) == 0 or not response.data[0].embedding:
+            self.logger.error("Failed to get embeddings from OpenAI.")
+            return None
+
+        return [rec.embedding for rec in response.data]
@@ -0,0 +1,76 @@
+import time
+
+
+class CollectionState:
+    """What a provider last learned about one collection."""
+
+    def __init__(self, dimension: int = None, is_indexed: bool = None, approx_rows: int = None,
+                 index_type: str = None, index_params: dict = None, has_text_index: bool = None,
+                 quantization: str = None):
+        self.dimension = dimension
+        self.is_indexed = is_indexed
+        self.approx_rows = approx_rows
+        self.index_type = index_type
+        self.index_params = index_params or {}
+        self.has_text_index = has_text_index
+        self.quantization = quantization
+        self.refreshed_at = time.monotonic()
+
+
+class CollectionRegistry:
+    """
+    In-process registry of collections known to exist, so hot-path calls do not
+    query the catalog every time. Only existing collections are registered: a
+    collection created by another process is picked up on its first lookup here,
+    while a drop elsewhere is noticed once its entry expires after `ttl` seconds.
+    """
+
+    def __init__(self, ttl: float = 60):
+        self.ttl = ttl
+        self.collections = {}
+
+    def get(self, collection_name: str) -> CollectionState:
+        state = self.collections.get(collection_name)
+        if state is None:
+            return None
+
+        if self.ttl and time.monotonic() - state.refreshed_at > self.ttl:
+            del self.collections[collection_name]
+            return None
+
+        return state
+
+    def register(self, collection_name: str, dimension: int = None,
+                 is_indexed: bool = None, approx_rows: int = None,
+                 index_type: str = None, index_params: dict = None,
+                 has_text_index: bool = None, quantization: str = None) -> CollectionState:
+        state = CollectionState(dimension=dimension, is_indexed=is_indexed, approx_rows=approx_rows,
+                                index_type=index_type, index_params=index_params,
+                                has_text_index=has_text_index, quantization=quantization)
+        self.collections[collection_name] = state
+        return state
+
+    def set_indexed(self, collection_name: str, is_indexed: bool,
+                    index_type: str = None, index_params: dict = None, quantization: str = None):
+        state = self.collections.get(collection_name)
+        if state is not None:
+            state.is_indexed = is_indexed
+            state.index_type = index_type if is_indexed else None
+            state.index_params = (index_params or {}) if is_indexed else {}
+            state.quantization = quantization if is_indexed else None
+
+    def set_rows(self, collection_name: str, rows_count: int):
+        state = self.collections.get(collection_name)
+        if state is not None:
+            state.approx_rows = rows_count
+
+    def add_rows(self, collection_name: str, rows_count: int):
+        state = self.collections.get(collection_name)
+        if state is not None and state.approx_rows is not None:
+            state.approx_rows = max(0, state.approx_rows + rows_count)
+
+    def invalidate(self, collection_name: str):
+        self.collections.pop(collection_name, None)
+
+    def clear(self):
+        self.collections.clear()
@@ -0,0 +1,43 @@
+import bisect
+import hashlib
+
+
+class ConsistentHashRing:
+    """
+    Maps keys to nodes so that adding or removing a node only moves the keys it
+    gains or loses, about 1/n of them. Every node is placed `virtual_nodes` times
+    on the ring to even out the share each one gets.
+    """
+
+    def __init__(self, nodes: list, virtual_nodes: int = 256):
+        if not nodes:
+            raise ValueError("A hash ring needs at least one node")
+
+        self.nodes = list(nodes)
+        self.ring = sorted(
+            (self.hash(f"{node}#{i}"), node)
+            for node in self.nodes
+            for i in range(max(1, virtual_nodes))
+        )
+        self.positions = [position for position, _ in self.ring]
+
+    @staticmethod
+    def hash(key: str) -> int:
+        # stable across processes, unlike the salted built-in hash
+        return int.from_bytes(hashlib.blake2b(key.encode("utf-8"), digest_size=8).digest(), "big")
+
+    def get_node(self, key) -> str:
+        index = bisect.bisect(self.positions, self.hash(str(key))) % len(self.ring)
+        return self.ring[index][1]
+
+    def get_nodes(self, key) -> list:
+        """Every node, in the order the ring falls back to them for `key`."""
+        index = bisect.bisect(self.positions, self.hash(str(key)))
+        nodes = []
+        for offset in range(len(self.ring)):
+            node = self.ring[(index + offset) % len(self.ring)][1]
+            if node not in nodes:
+                nodes.append(node)
+                if len(nodes) == len(self.nodes):
+                    break
+        return nodes
@@ -0,0 +1,491 @@
+import contextlib
+import fcntl
+import json
+import operator
+import os
+import threading
+import numpy as np
+
+
+class FlatVectorCollection:
+    """
+    One collection of the NumPy flat store, a directory holding:
+      meta.json                dimension, distance, row counts, capacity and segment
+      vectors_<segment>.f32    float32 matrix of capacity x dimension
+      records_<segment>.bin    record id, payload offset and lengths, deleted flag per row
+      payloads_<segment>.bin   utf-8 text followed by the metadata JSON of every row
+    Vectors and records are memory mapped, so processes searching the same collection
+    share its page cache pages. Writers serialize on a lock file and publish rows by
+    atomically replacing meta.json; readers remap on their next search. Deletes only
+    flag rows until `compact` rewrites the files as the next segment.
+    """
+
+    RECORD_DTYPE = np.dtype([
+        ("id", "<i8"), ("offset", "<i8"),
+        ("text_length", "<u4"), ("metadata_length", "<u4"),
+        ("deleted", "u1"),
+    ])
+
+    FILE_SUFFIXES = {
+        "vectors": "f32",
+        "records": "bin",
+        "payloads": "bin",
+    }
+
+    RANGE_OPERATORS = {
+        "gt": operator.gt,
+        "gte": operator.ge,
+        "lt": operator.lt,
+        "lte": operator.le,
+    }
+
+    def __init__(self, path: str, block_rows: int = 32768):
+        self.path = path
+        self.block_rows = max(1, block_rows)
+
+        # guards the mappings and caches below against this process' other threads
+        self.lock = threading.RLock()
+
+        self.meta = None
+        self.meta_version = None
+        self.vectors = None
+        self.records = None
+        self.payload_fd = None
+
+        # parsed metadata of the first rows, and per filter field columns over it
+        self.metadata_cache = []
+        self.filter_columns = {}
+
+        # record id -> row, only built by writers
+        self.id_rows = None
+
+    @classmethod
+    def create(cls, path: str, dimension: int, distance: str, **options):
+        os.makedirs(path, exist_ok=True)
+        collection = cls(path=path, **options)
+
+        with collection.write_lock():
+            if collection.meta is None:
+                collection.publish({
+                    "dimension": dimension,
+                    "distance": distance,
+                    "count": 0,
+                    "deleted": 0,
+                    "capacity": 0,
+                    "segment": 0,
+                })
+
+        return collection
+
+    def file_path(self, name: str, segment: int = None) -> str:
+        segment = self.meta["segment"] if segment is None else segment
+        return os.path.join(self.path, f"{name}_{segment}.{self.FILE_SUFFIXES[name]}")
+
+    @property
+    def meta_path(self) -> str:
+        return os.path.join(self.path, "meta.json")
+
+    @property
+    def dimension(self) -> int:
+        return self.meta["dimension"]
+
+    @property
+    def normalized(self) -> bool:
+        # cosine similarity is a dot product between unit vectors
+        return self.meta["distance"] == "Cosine"
+
+    def refresh(self) -> bool:
+        """Maps the last published state; False once the collection is deleted."""
+        with self.lock:
+            try:
+                stat = os.stat(self.meta_path)
+            except FileNotFoundError:
+                return False
+
+            # meta.json is replaced on every publish, so a new inode or mtime means new rows
+            version = (stat.st_ino, stat.st_mtime_ns)
+            if version == self.meta_version:
+                return True
+
+            with open(self.meta_path, "r") as meta_file:
+                meta = json.load(meta_file)
+
+            is_new_segment = self.meta is None or meta["segment"] != self.meta["segment"]
+            is_grown = self.meta is None or meta["capacity"] != self.meta["capacity"]
+            self.meta = meta
+            self.meta_version = version
+
+            # rows may have been replaced or deleted by another process
+            self.id_rows = None
+
+            if is_new_segment:
+                self.metadata_cache = []
+                self.filter_columns = {}
+
+                if self.payload_fd is not None:
+                    os.close(self.payload_fd)
+                self.payload_fd = os.open(self.file_path("payloads"), os.O_RDONLY | os.O_CREAT, 0o644)
+
+            if is_new_segment or is_grown:
+                self.map_files()
+
+            return True
+
+    def map_files(self):
+        capacity = self.meta["capacity"]
+        if capacity == 0:
+            # an empty file can not be mapped
+            self.vectors, self.records = None, None
+            return
+
+        self.vectors = np.memmap(self.file_path("vectors"), dtype=np.float32, mode="r+",
+                                 shape=(capacity, self.dimension))
+        self.records = np.memmap(self.file_path("records"), dtype=self.RECORD_DTYPE, mode="r+",
+                                 shape=(capacity,))
+
+    def close(self):
+        with self.lock:
+            if self.payload_fd is not None:
+                os.close(self.payload_fd)
+            self.payload_fd = None
+            self.vectors, self.records = None, None
+            self.meta, self.meta_version = None, None
+
+    @contextlib.contextmanager
+    def write_lock(self):
+        with self.lock:
+            with open(os.path.join(self.path, "lock"), "a") as lock_file:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+                try:
+                    # another process may have written since this one last looked
+                    self.refresh()
+                    yield
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def publish(self, meta: dict):
+        temp_path = f"{self.meta_path}.{os.getpid()}.tmp"
+        with open(temp_path, "w") as meta_file:
+            json.dump(meta, meta_file)
+        os.replace(temp_path, self.meta_path)
+
+        # this process' own changes are already applied to its id map
+        id_rows, segment = self.id_rows, self.meta["segment"] if self.meta else None
+        self.refresh()
+        if meta["segment"] == segment:
+            self.id_rows = id_rows
+
+    def row_sizes(self) -> dict:
+        """Bytes per row of every file holding one fixed size entry per row."""
+        return {
+            "vectors": self.dimension * 4,
+            "records": self.RECORD_DTYPE.itemsize,
+        }
+
+    def reserve(self, rows_count: int):
+        capacity = self.meta["capacity"]
+        if rows_count <= capacity:
+            return
+
+        # doubling keeps appends amortized O(1); readers keep their shorter mappings
+        new_capacity = max(rows_count, capacity * 2, 1024)
+        for name, row_size in self.row_sizes().items():
+            with open(self.file_path(name), "a+b") as data_file:
+                data_file.truncate(new_capacity * row_size)
+
+        self.meta = {**self.meta, "capacity": new_capacity}
+        self.map_files()
+
+    def get_id_rows(self) -> dict:
+        if self.id_rows is None:
+            count = self.meta["count"]
+            records = self.records[:count] if count else np.empty(0, dtype=self.RECORD_DTYPE)
+            alive_rows = np.flatnonzero(records["deleted"] == 0)
+            self.id_rows = dict(zip(records["id"][alive_rows].tolist(), alive_rows.tolist()))
+        return self.id_rows
+
+    def normalize(self, vectors: np.ndarray) -> np.ndarray:
+        if not self.normalized:
+            return vectors
+        norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+        norms[norms == 0] = 1
+        return vectors / norms
+
+    def append(self, texts: list, vectors: list, metadata: list, record_ids: list = None) -> int:
+        """Appends rows; a record id already in the collection replaces its row."""
+        vectors = np.asarray(vectors, dtype=np.float32)
+
+        with self.write_lock():
+            if vectors.ndim != 2 or vectors.shape[1] != self.dimension:
+                raise ValueError(f"Expected vectors of size {self.dimension}, got {vectors.shape}")
+
+            count = self.meta["count"]
+            if record_ids is None:
+                record_ids = list(range(count, count + len(texts)))
+
+            # within the batch the last occurrence of an id wins
+            keep = sorted({record_id: i for i, record_id in enumerate(record_ids)}.values())
+            if len(keep) != len(record_ids):
+                texts = [texts[i] for i in keep]
+                metadata = [metadata[i] for i in keep]
+                record_ids = [record_ids[i] for i in keep]
+                vectors = vectors[keep]
+
+            rows_count = len(record_ids)
+            self.reserve(count + rows_count)
+
+            id_rows = self.get_id_rows()
+            replaced_rows = [id_rows[record_id] for record_id in record_ids if record_id in id_rows]
+            if replaced_rows:
+                self.records["deleted"][replaced_rows] = 1
+
+            records = np.zeros(rows_count, dtype=self.RECORD_DTYPE)
+            payloads = []
+            offset = os.fstat(self.payload_fd).st_size
+            for i, (text, row_metadata) in enumerate(zip(texts, metadata)):
+                text_bytes = (text or "").encode("utf-8")
+                metadata_bytes = json.dumps(row_metadata or {}).encode("utf-8")
+
+                records[i] = (record_ids[i], offset, len(text_bytes), len(metadata_bytes), 0)
+                payloads.append(text_bytes + metadata_bytes)
+                offset += len(text_bytes) + len(metadata_bytes)
+
+            with open(self.file_path("payloads"), "ab") as payload_file:
+                payload_file.write(b"".join(payloads))
+
+            vectors = self.normalize(vectors)
+            self.vectors[count:count + rows_count] = vectors
+            self.records[count:count + rows_count] = records
+            self.append_rows(start=count, vectors=vectors)
+            self.vectors.flush()
+            self.records.flush()
+
+            id_rows.update(zip(record_ids, range(count, count + rows_count)))
+
+            self.publish({
+                **self.meta,
+                "count": count + rows_count,
+                "deleted": self.meta["deleted"] + len(replaced_rows),
+            })
+
+        return rows_count
+
+    def append_rows(self, start: int, vectors: np.ndarray):
+        """Called under the write lock with the normalized vectors of appended rows."""
+        pass
+
+    def compact_rows(self, alive_rows: np.ndarray, segment: int, capacity: int):
+        """Called under the write lock to copy the rows kept by `compact` into `segment`."""
+        pass
+
+    def delete(self, record_ids: list) -> int:
+        with self.write_lock():
+            id_rows = self.get_id_rows()
+            deleted_rows = [id_rows.pop(record_id) for record_id in record_ids if record_id in id_rows]
+
+            if not deleted_rows:
+                return 0
+
+            self.records["deleted"][deleted_rows] = 1
+            self.records.flush()
+
+            self.publish({**self.meta, "deleted": self.meta["deleted"] + len(deleted_rows)})
+
+        return len(deleted_rows)
+
+    def compact(self) -> bool:
+        """Rewrites the live rows into a new segment; readers move over on their next refresh."""
+        with self.write_lock():
+            if self.meta["deleted"] == 0:
+                return False
+
+            old_segment = self.meta["segment"]
+            new_segment = old_segment + 1
+            count = self.meta["count"]
+            alive_rows = np.flatnonzero(self.records["deleted"][:count] == 0)
+            capacity = max(len(alive_rows), 1024)
+
+            vectors = np.memmap(self.file_path("vectors", new_segment), dtype=np.float32, mode="w+",
+                                shape=(capacity, self.dimension))
+            records = np.memmap(self.file_path("records", new_segment), dtype=self.RECORD_DTYPE, mode="w+",
+                                shape=(capacity,))
+
+            offset = 0
+            with open(self.file_path("payloads", new_segment), "wb") as payload_file:
+                for start in range(0, len(alive_rows), self.block_rows):
+                    block_rows = alive_rows[start:start + self.block_rows]
+                    block_records = self.records[block_rows]
+
+                    vectors[start:start + len(block_rows)] = self.vectors[block_rows]
+
+                    for record in block_records:
+                        payload_size = int(record["text_length"]) + int(record["metadata_length"])
+                        payload_file.write(os.pread(self.payload_fd, payload_size, int(record["offset"])))
+                        record["offset"] = offset
+                        offset += payload_size
+
+                    records[start:start + len(block_rows)] = block_records
+
+            vectors.flush()
+            records.flush()
+            del vectors, records
+
+            self.compact_rows(alive_rows=alive_rows, segment=new_segment, capacity=capacity)
+
+            self.publish({
+                **self.meta,
+                "count": len(alive_rows),
+                "deleted": 0,
+                "capacity": capacity,
+                "segment": new_segment,
+            })
+
+            # processes still mapping the old files keep them until they refresh
+            for name in [*self.row_sizes(), "payloads"]:
+                with contextlib.suppress(FileNotFoundError):
+                    os.remove(self.file_path(name, old_segment))
+
+        return True
+
+    def load_metadata(self, count: int):
+        for row in range(len(self.metadata_cache), count):
+            record = self.records[row]
+            metadata_bytes = os.pread(self.payload_fd, int(record["metadata_length"]),
+                                      int(record["offset"]) + int(record["text_length"]))
+            self.metadata_cache.append(json.loads(metadata_bytes) if metadata_bytes else {})
+
+    def get_filter_column(self, field: str, count: int) -> np.ndarray:
+        column = self.filter_columns.get(field)
+        if column is None or len(column) < count:
+            start = 0 if column is None else len(column)
+            new_values = np.empty(count - start, dtype=object)
+            for i, row_metadata in enumerate(self.metadata_cache[start:count]):
+                new_values[i] = row_metadata.get(field)
+
+            column = new_values if column is None else np.concatenate([column, new_values])
+            self.filter_columns[field] = column
+
+        return column[:count]
+
+    @staticmethod
+    def is_comparable(a, b) -> bool:
+        is_number = lambda v: isinstance(v, (int, float)) and not isinstance(v, bool)
+        return (is_number(a) and is_number(b)) or (isinstance(a, str) and isinstance(b, str))
+
+    def get_filter_mask(self, filters: list, count: int) -> np.ndarray:
+        self.load_metadata(count)
+        mask = np.ones(count, dtype=bool)
+
+        for search_filter in filters:
+            column = self.get_filter_column(search_filter["field"], count)
+            value = search_filter.get("value")
+            filter_operator = search_filter.get("op") or "eq"
+
+            if filter_operator == "eq":
+                mask &= np.asarray(column == value, dtype=bool)
+            elif filter_operator == "in":
+                values = value if isinstance(value, list) else [value]
+                matches = np.zeros(count, dtype=bool)
+                for item in values:
+                    matches |= np.asarray(column == item, dtype=bool)
+                mask &= matches
+            else:
+                # like the SQL filters, only values of the same JSON type are ordered
+                compare = self.RANGE_OPERATORS[filter_operator]
+                mask &= np.fromiter(
+                    (self.is_comparable(v, value) and compare(v, value) for v in column),
+                    dtype=bool, count=count
+                )
+
+        return mask
+
+    def get_snapshot(self, filters: list = None) -> dict:
+        """What a search reads, taken under the lock so it may run concurrently with writes."""
+        count = self.meta["count"]
+        return {
+            "count": count,
+            "vectors": self.vectors,
+            "records": self.records,
+            "mask": self.get_filter_mask(filters, count) if filters and count else None,
+        }
+
+    def search(self, queries: list, limit: int, filters: list = None, **search_options):
+        """Top `limit` rows for each query, as lists of (text, score)."""
+        with self.lock:
+            if not self.refresh():
+                return None
+            snapshot = self.get_snapshot(filters=filters)
+            # a refresh onto a new segment closes the shared descriptor while this search reads
+            payload_fd = os.dup(self.payload_fd)
+
+        try:
+            queries = self.normalize(np.asarray(queries, dtype=np.float32))
+            if snapshot["count"] == 0 or limit <= 0:
+                return [[] for _ in queries]
+
+            records = snapshot["records"]
+
+            results = []
+            for rows, scores in self.search_rows(snapshot=snapshot, queries=queries, limit=limit,
+                                                 **search_options):
+                documents = []
+                for row, score in zip(rows, scores):
+                    record = records[row]
+                    text = os.pread(payload_fd, int(record["text_length"]), int(record["offset"])).decode("utf-8")
+                    documents.append((text, float(score)))
+                results.append(documents)
+
+            return results
+        finally:
+            os.close(payload_fd)
+
+    def search_rows(self, snapshot: dict, queries: np.ndarray, limit: int, start_row: int = 0) -> list:
+        """Exact scan from `start_row`; (rows, scores) of the best live rows for each query, best first."""
+        count, vectors, records, mask = snapshot["count"], snapshot["vectors"], snapshot["records"], snapshot["mask"]
+
+        best_scores = np.empty((len(queries), 0), dtype=np.float32)
+        best_rows = np.empty((len(queries), 0), dtype=np.int64)
+
+        # blocks bound the score matrix and keep the scan in cache sized pieces
+        for start in range(start_row, count, self.block_rows):
+            end = min(start + self.block_rows, count)
+
+            scores = queries @ vectors[start:end].T
+            alive = records["deleted"][start:end] == 0
+            if mask is not None:
+                alive &= mask[start:end]
+            scores[:, ~alive] = -np.inf
+
+            block_limit = min(limit, end - start)
+            top = np.argpartition(-scores, block_limit - 1, axis=1)[:, :block_limit]
+            best_scores = np.concatenate([best_scores, np.take_along_axis(scores, top, axis=1)], axis=1)
+            best_rows = np.concatenate([best_rows, top + start], axis=1)
+
+            if best_scores.shape[1] > limit:
+                top = np.argpartition(-best_scores, limit - 1, axis=1)[:, :limit]
+                best_scores = np.take_along_axis(best_scores, top, axis=1)
+                best_rows = np.take_along_axis(best_rows, top, axis=1)
+
+        matches = []
+        for query_scores, query_rows in zip(best_scores, best_rows):
+            order = np.argsort(-query_scores)
+            # deleted or filtered out rows only fill up blocks with too few matches
+            order = order[np.isfinite(query_scores[order])]
+            matches.append((query_rows[order], query_scores[order]))
+
+        return matches
+
+    def info(self) -> dict:
+        with self.lock:
+            if not self.refresh():
+                return None
+
+            return {
+                "path": self.path,
+                "dimension": self.meta["dimension"],
+                "distance": self.meta["distance"],
+                "record_count": self.meta["count"] - self.meta["deleted"],
+                "deleted_count": self.meta["deleted"],
+                "capacity": self.meta["capacity"],
+                "segment": self.meta["segment"],
+            }
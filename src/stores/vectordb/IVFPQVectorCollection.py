@@ -0,0 +1,436 @@
+import contextlib
+import os
+import time
+import numpy as np
+from .FlatVectorCollection import FlatVectorCollection
+
+
+class IVFPQVectorCollection(FlatVectorCollection):
+    """
+    A flat collection with an IVF-PQ index over its rows, adding to the directory:
+      ivf_<version>.npz                  coarse centroids and product quantizer codebooks
+      lists_<segment>_<version>.bin      int32 inverted list of every row
+      codes_<segment>_<version>.bin      `m` byte PQ code of every row's residual
+    A search scores the centroids, ranks the rows of the `nprobe` best lists by their
+    codes and reranks the best of them on the full vectors, touching a few lists
+    instead of the whole matrix. Until the first training, and for rows appended
+    since the lists were last grouped, it falls back to the exact scan.
+    """
+
+    FILE_SUFFIXES = {
+        **FlatVectorCollection.FILE_SUFFIXES,
+        "lists": "bin",
+        "codes": "bin",
+    }
+
+    # centroids per PQ subspace, so that a code fits a byte
+    CODEBOOK_SIZE = 256
+
+    # retrain once the collection outgrew the rows its centroids were trained on
+    RETRAIN_GROWTH = 8
+
+    def __init__(self, path: str, block_rows: int = 32768,
+                 nlist: int = 0, pq_m: int = 0, nprobe: int = 16, rerank: int = 10,
+                 train_threshold: int = 20000, kmeans_iterations: int = 15):
+        super().__init__(path=path, block_rows=block_rows)
+
+        # build parameters, 0 picks them from the collection at training time
+        self.nlist = nlist
+        self.pq_m = pq_m
+        self.train_threshold = train_threshold
+        self.kmeans_iterations = max(1, kmeans_iterations)
+
+        # search parameters
+        self.nprobe = max(1, nprobe)
+        self.rerank = max(1, rerank)
+
+        self.index_version = None
+        self.centroids = None
+        self.codebooks = None
+        self.lists = None
+        self.codes = None
+
+        # (rows count, rows sorted by list, start of every list) of the rows grouped so far
+        self.grouped = None
+
+        # last `measure_recall` result of this process
+        self.recall = None
+
+    def index_path(self, name: str, segment: int, version: int) -> str:
+        if name == "ivf":
+            return os.path.join(self.path, f"ivf_{version}.npz")
+        return os.path.join(self.path, f"{name}_{segment}_{version}.{self.FILE_SUFFIXES[name]}")
+
+    def file_path(self, name: str, segment: int = None) -> str:
+        if name not in ("lists", "codes"):
+            return super().file_path(name, segment)
+
+        segment = self.meta["segment"] if segment is None else segment
+        return self.index_path(name, segment, self.meta["ivf"]["version"])
+
+    def refresh(self) -> bool:
+        with self.lock:
+            if not super().refresh():
+                return False
+
+            ivf = self.meta.get("ivf")
+            index_version = (self.meta["segment"], ivf["version"]) if ivf else None
+            if index_version != self.index_version:
+                self.load_index()
+                self.index_version = index_version
+
+            return True
+
+    def load_index(self):
+        ivf = self.meta.get("ivf")
+        self.grouped = None
+        self.centroids, self.codebooks = None, None
+
+        if ivf:
+            with np.load(self.index_path("ivf", self.meta["segment"], ivf["version"])) as snapshot:
+                self.centroids = snapshot["centroids"]
+                self.codebooks = snapshot["codebooks"]
+
+        self.map_files()
+
+    def map_files(self):
+        super().map_files()
+
+        ivf, capacity = self.meta.get("ivf"), self.meta["capacity"]
+        if not ivf or capacity == 0:
+            self.lists, self.codes = None, None
+            return
+
+        self.lists = np.memmap(self.file_path("lists"), dtype=np.int32, mode="r+", shape=(capacity,))
+        self.codes = np.memmap(self.file_path("codes"), dtype=np.uint8, mode="r+", shape=(capacity, ivf["m"]))
+
+    def close(self):
+        with self.lock:
+            super().close()
+            self.index_version, self.grouped = None, None
+            self.centroids, self.codebooks = None, None
+            self.lists, self.codes = None, None
+
+    def row_sizes(self) -> dict:
+        row_sizes = super().row_sizes()
+        if self.meta.get("ivf"):
+            row_sizes.update({"lists": 4, "codes": self.meta["ivf"]["m"]})
+        return row_sizes
+
+    def append_rows(self, start: int, vectors: np.ndarray):
+        if self.centroids is None:
+            return
+
+        lists, codes = self.encode(vectors, self.centroids, self.codebooks)
+        self.lists[start:start + len(vectors)] = lists
+        self.codes[start:start + len(vectors)] = codes
+        self.lists.flush()
+        self.codes.flush()
+
+    def compact_rows(self, alive_rows: np.ndarray, segment: int, capacity: int):
+        ivf = self.meta.get("ivf")
+        if not ivf:
+            return
+
+        lists = np.memmap(self.index_path("lists", segment, ivf["version"]), dtype=np.int32, mode="w+",
+                          shape=(capacity,))
+        codes = np.memmap(self.index_path("codes", segment, ivf["version"]), dtype=np.uint8, mode="w+",
+                          shape=(capacity, ivf["m"]))
+
+        for start in range(0, len(alive_rows), self.block_rows):
+            block_rows = alive_rows[start:start + self.block_rows]
+            lists[start:start + len(block_rows)] = self.lists[block_rows]
+            codes[start:start + len(block_rows)] = self.codes[block_rows]
+
+        lists.flush()
+        codes.flush()
+
+    @staticmethod
+    def assign(data: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """Nearest centroid of every row, by L2 distance."""
+        norms = (centroids ** 2).sum(axis=1)
+        assignments = np.empty(len(data), dtype=np.int64)
+
+        # bounds the distance matrix to 2^24 floats
+        step = max(1, (1 << 24) // len(centroids))
+        for start in range(0, len(data), step):
+            block = np.asarray(data[start:start + step], dtype=np.float32)
+            assignments[start:start + step] = np.argmax(2 * block @ centroids.T - norms, axis=1)
+
+        return assignments
+
+    def kmeans(self, data: np.ndarray, k: int, rng: np.random.Generator) -> np.ndarray:
+        centroids = data[rng.choice(len(data), k, replace=False)].astype(np.float32)
+
+        for _ in range(self.kmeans_iterations):
+            assignments = self.assign(data, centroids)
+            counts = np.bincount(assignments, minlength=k)
+
+            filled = np.flatnonzero(counts)
+            starts = np.concatenate([[0], np.cumsum(counts[filled])[:-1]])
+            sums = np.add.reduceat(data[np.argsort(assignments, kind="stable")], starts, axis=0)
+            centroids[filled] = sums / counts[filled, None]
+
+            # an empty cluster restarts from a random row
+            empty = np.flatnonzero(counts == 0)
+            if len(empty):
+                centroids[empty] = data[rng.choice(len(data), len(empty), replace=False)]
+
+        return centroids
+
+    def encode(self, vectors: np.ndarray, centroids: np.ndarray, codebooks: np.ndarray):
+        lists = self.assign(vectors, centroids)
+        residuals = vectors - centroids[lists]
+
+        m, _, sub_dimension = codebooks.shape
+        codes = np.empty((len(vectors), m), dtype=np.uint8)
+        for j in range(m):
+            codes[:, j] = self.assign(residuals[:, j * sub_dimension:(j + 1) * sub_dimension], codebooks[j])
+
+        return lists.astype(np.int32), codes
+
+    def get_pq_m(self) -> int:
+        # the largest divisor of the dimension up to the configured m, by default 4 dimensions per byte
+        target = self.pq_m or max(1, self.dimension // 4)
+        return max(m for m in range(1, min(target, self.dimension) + 1) if self.dimension % m == 0)
+
+    def needs_training(self) -> bool:
+        with self.lock:
+            if not self.refresh():
+                return False
+
+            alive_count = self.meta["count"] - self.meta["deleted"]
+            ivf = self.meta.get("ivf")
+            if ivf is None:
+                return alive_count >= max(self.train_threshold, self.CODEBOOK_SIZE)
+            return alive_count > self.RETRAIN_GROWTH * ivf["trained_rows"]
+
+    def train(self) -> bool:
+        """
+        Trains the index on the live rows and encodes every row. The heavy part runs
+        without the write lock; rows appended meanwhile are encoded before publishing,
+        and the result is dropped if the collection was compacted or retrained meanwhile.
+        """
+        with self.lock:
+            if not self.refresh():
+                return False
+
+            meta = dict(self.meta)
+            vectors, records = self.vectors, self.records
+
+        count, capacity, segment = meta["count"], meta["capacity"], meta["segment"]
+        old_ivf = meta.get("ivf")
+        version = old_ivf["version"] + 1 if old_ivf else 1
+
+        alive_rows = np.flatnonzero(records["deleted"][:count] == 0) if count else np.empty(0, dtype=np.int64)
+        if len(alive_rows) < self.CODEBOOK_SIZE:
+            return False
+
+        # ~4 sqrt(n) lists by default, with at least 32 training rows each
+        nlist = self.nlist or int(4 * np.sqrt(len(alive_rows)))
+        nlist = max(1, min(nlist, len(alive_rows) // 32))
+        m = self.get_pq_m()
+
+        rng = np.random.default_rng(version)
+        sample_size = min(len(alive_rows), max(nlist, self.CODEBOOK_SIZE) * 32)
+        sample = np.asarray(vectors[np.sort(rng.choice(alive_rows, sample_size, replace=False))])
+
+        started_at = time.perf_counter()
+        centroids = self.kmeans(sample, nlist, rng)
+
+        # the quantizer learns the residuals left by the coarse centroids
+        residuals = sample - centroids[self.assign(sample, centroids)]
+        sub_dimension = self.dimension // m
+        codebooks = np.stack([
+            self.kmeans(np.ascontiguousarray(residuals[:, j * sub_dimension:(j + 1) * sub_dimension]),
+                        self.CODEBOOK_SIZE, rng)
+            for j in range(m)
+        ])
+        del sample, residuals
+
+        snapshot_path = self.index_path("ivf", segment, version)
+        with open(f"{snapshot_path}.{os.getpid()}.tmp", "wb") as snapshot_file:
+            np.savez(snapshot_file, centroids=centroids, codebooks=codebooks)
+        os.replace(f"{snapshot_path}.{os.getpid()}.tmp", snapshot_path)
+
+        lists_path = self.index_path("lists", segment, version)
+        codes_path = self.index_path("codes", segment, version)
+        lists = np.memmap(lists_path, dtype=np.int32, mode="w+", shape=(capacity,))
+        codes = np.memmap(codes_path, dtype=np.uint8, mode="w+", shape=(capacity, m))
+        for start in range(0, count, self.block_rows):
+            end = min(start + self.block_rows, count)
+            lists[start:end], codes[start:end] = self.encode(np.asarray(vectors[start:end]), centroids, codebooks)
+        lists.flush()
+        codes.flush()
+        del lists, codes
+
+        with self.write_lock():
+            if self.meta["segment"] != segment or self.meta.get("ivf") != old_ivf:
+                for path in [snapshot_path, lists_path, codes_path]:
+                    with contextlib.suppress(FileNotFoundError):
+                        os.remove(path)
+                return False
+
+            # rows appended and files grown while training
+            new_count, new_capacity = self.meta["count"], self.meta["capacity"]
+            if new_capacity > capacity:
+                for path, row_size in [(lists_path, 4), (codes_path, m)]:
+                    with open(path, "a+b") as data_file:
+                        data_file.truncate(new_capacity * row_size)
+
+            if new_count > count:
+                lists = np.memmap(lists_path, dtype=np.int32, mode="r+", shape=(new_capacity,))
+                codes = np.memmap(codes_path, dtype=np.uint8, mode="r+", shape=(new_capacity, m))
+                for start in range(count, new_count, self.block_rows):
+                    end = min(start + self.block_rows, new_count)
+                    lists[start:end], codes[start:end] = self.encode(np.asarray(self.vectors[start:end]),
+                                                                     centroids, codebooks)
+                lists.flush()
+                codes.flush()
+                del lists, codes
+
+            self.publish({
+                **self.meta,
+                "ivf": {
+                    "version": version,
+                    "nlist": nlist,
+                    "m": m,
+                    "trained_rows": len(alive_rows),
+                    "train_seconds": round(time.perf_counter() - started_at, 3),
+                },
+            })
+
+            if old_ivf:
+                for name in ["ivf", "lists", "codes"]:
+                    with contextlib.suppress(FileNotFoundError):
+                        os.remove(self.index_path(name, segment, old_ivf["version"]))
+
+        return True
+
+    def get_grouped(self, count: int):
+        # new rows are scanned exactly until regrouping pays off
+        if self.grouped is None or count - self.grouped[0] > max(self.block_rows, self.grouped[0] // 8):
+            rows = np.argsort(self.lists[:count], kind="stable")
+            offsets = np.concatenate([[0], np.cumsum(np.bincount(self.lists[:count], minlength=len(self.centroids)))])
+            self.grouped = (count, rows, offsets)
+        return self.grouped
+
+    def get_snapshot(self, filters: list = None) -> dict:
+        snapshot = super().get_snapshot(filters=filters)
+        if self.centroids is not None and snapshot["count"]:
+            snapshot.update({
+                "centroids": self.centroids,
+                "codebooks": self.codebooks,
+                "codes": self.codes,
+                "grouped": self.get_grouped(snapshot["count"]),
+            })
+        return snapshot
+
+    def search_rows(self, snapshot: dict, queries: np.ndarray, limit: int, nprobe: int = None) -> list:
+        if "centroids" not in snapshot:
+            return super().search_rows(snapshot=snapshot, queries=queries, limit=limit)
+
+        vectors, records, mask = snapshot["vectors"], snapshot["records"], snapshot["mask"]
+        centroids, codebooks, codes = snapshot["centroids"], snapshot["codebooks"], snapshot["codes"]
+        grouped_count, grouped_rows, offsets = snapshot["grouped"]
+
+        nprobe = min(len(centroids), nprobe or self.nprobe)
+        candidates_count = limit * self.rerank
+
+        # a selective filter leaves fewer rows than the probed lists would hold
+        if mask is not None and np.count_nonzero(mask) <= candidates_count * nprobe:
+            return self.search_selected(snapshot=snapshot, queries=queries, limit=limit,
+                                        rows=np.flatnonzero(mask & (records["deleted"][:len(mask)] == 0)))
+
+        tail_matches = super().search_rows(snapshot=snapshot, queries=queries, limit=limit,
+                                           start_row=grouped_count)
+
+        # q.x = q.centroid + q.residual, the second term summed from per subspace lookup tables
+        coarse_scores = queries @ centroids.T
+        probes = np.argpartition(-coarse_scores, nprobe - 1, axis=1)[:, :nprobe]
+        m, _, sub_dimension = codebooks.shape
+        lookup_tables = np.einsum("qmd,mkd->qmk", queries.reshape(len(queries), m, sub_dimension), codebooks)
+        subspaces = np.arange(m)
+
+        matches = []
+        for i, query in enumerate(queries):
+            lists = probes[i]
+            rows = np.concatenate([grouped_rows[offsets[l]:offsets[l + 1]] for l in lists])
+            row_lists = np.repeat(lists, offsets[lists + 1] - offsets[lists])
+
+            alive = records["deleted"][rows] == 0
+            if mask is not None:
+                alive &= mask[rows]
+            rows, row_lists = rows[alive], row_lists[alive]
+
+            approximate_scores = coarse_scores[i, row_lists] + lookup_tables[i][subspaces, codes[rows]].sum(axis=1)
+            if len(rows) > candidates_count:
+                rows = rows[np.argpartition(-approximate_scores, candidates_count - 1)[:candidates_count]]
+
+            # exact scores of the candidates decide the order
+            rows = np.sort(rows)
+            tail_rows, tail_scores = tail_matches[i]
+            scores = np.concatenate([vectors[rows] @ query, tail_scores])
+            rows = np.concatenate([rows, tail_rows])
+            order = np.argsort(-scores)[:limit]
+            matches.append((rows[order], scores[order]))
+
+        return matches
+
+    def search_selected(self, snapshot: dict, queries: np.ndarray, limit: int, rows: np.ndarray) -> list:
+        scores = queries @ snapshot["vectors"][rows].T
+        order = np.argsort(-scores, axis=1)[:, :limit]
+        return [(rows[query_order], query_scores[query_order]) for query_order, query_scores in zip(order, scores)]
+
+    def measure_recall(self, sample_size: int = 50, limit: int = 10, nprobe: int = None) -> dict:
+        """Recall@limit of the index against the exact scan, for stored vectors used as queries."""
+        with self.lock:
+            if not self.refresh():
+                return None
+            snapshot = self.get_snapshot()
+
+        if "centroids" not in snapshot:
+            return None
+
+        records = snapshot["records"]
+        alive_rows = np.flatnonzero(records["deleted"][:snapshot["count"]] == 0)
+        if len(alive_rows) == 0:
+            return None
+
+        rng = np.random.default_rng()
+        queries = np.asarray(snapshot["vectors"][np.sort(rng.choice(alive_rows, min(sample_size, len(alive_rows)),
+                                                                    replace=False))])
+
+        started_at = time.perf_counter()
+        exact_matches = super().search_rows(snapshot=snapshot, queries=queries, limit=limit)
+        exact_seconds = time.perf_counter() - started_at
+
+        started_at = time.perf_counter()
+        index_matches = self.search_rows(snapshot=snapshot, queries=queries, limit=limit, nprobe=nprobe)
+        index_seconds = time.perf_counter() - started_at
+
+        recall = np.mean([
+            len(set(index_rows.tolist()) & set(exact_rows.tolist())) / max(1, len(exact_rows))
+            for (index_rows, _), (exact_rows, _) in zip(index_matches, exact_matches)
+        ])
+
+        self.recall = {
+            "recall": round(float(recall), 4),
+            "limit": limit,
+            "nprobe": min(len(snapshot["centroids"]), nprobe or self.nprobe),
+            "queries_count": len(queries),
+            "exact_ms_per_query": round(1000 * exact_seconds / len(queries), 3),
+            "index_ms_per_query": round(1000 * index_seconds / len(queries), 3),
+        }
+        return self.recall
+
+    def info(self) -> dict:
+        info = super().info()
+        if info is not None:
+            info["index"] = {
+                **(self.meta.get("ivf") or {"trained": False}),
+                "nprobe": self.nprobe,
+                "rerank": self.rerank,
+                "measured": self.recall,
+            }
+        return info
@@ -0,0 +1,36 @@
+import re
+import zlib
+from collections import Counter
+
+
+class SparseTextEncoder:
+    """
+    Turns text into a sparse term vector for lexical search without a vocabulary:
+    every lowercased word is hashed into a fixed index space and weighted with BM25's
+    saturated term frequency. Document frequencies are left to the vector store
+    (Qdrant's IDF modifier), so encoding needs no corpus statistics.
+    """
+
+    def __init__(self, index_space: int = 2 ** 31 - 1, k1: float = 1.2):
+        self.index_space = index_space
+        self.k1 = k1
+        self.token_pattern = re.compile(r"\w+", re.UNICODE)
+
+    def tokenize(self, text: str) -> list:
+        return self.token_pattern.findall((text or "").lower())
+
+    def encode(self, text: str):
+        """Returns (indices, values) of the text's sparse vector."""
+
+        term_counts = Counter(
+            zlib.crc32(token.encode("utf-8")) % self.index_space
+            for token in self.tokenize(text)
+        )
+
+        indices = list(term_counts.keys())
+        values = [
+            count * (self.k1 + 1) / (count + self.k1)
+            for count in term_counts.values()
+        ]
+
+        return indices, values
@@ -3,6 +3,9 @@ from enum import Enum
 class VectorDBEnum(Enum):
     QDRANT = "qdrant"
     PGVECTOR = "pgvector"
+    NUMPY = "numpy"
+    NUMPY_IVF = "numpy_ivf"
+    SHARDED = "sharded"
 
 
 class DistanceMethodEnum(Enum):
@@ -16,12 +19,57 @@ class PgVectorTableSchemaEnum(Enum):
     VECTOR = "vector"
     CHUNK_ID = "chunk_id"
     METADATA = "metadata"
+    TEXT_SEARCH = "text_search"
+    COLLECTION = "collection"
     _PREFIX = "pgvector"
 
 class PgVectorDistanceMethodEnum(Enum):
     COSINE = "vector_cosine_ops"
-    DOT = "vector_12_ops"
-    
+    DOT = "vector_ip_ops"
+
+class PgVectorDistanceOperatorEnum(Enum):
+    COSINE = "<=>"
+    DOT = "<#>"
+
+class PgVectorStorageModeEnum(Enum):
+    TABLE_PER_COLLECTION = "table"
+    PARTITIONED = "partitioned"
+
+class ShardRoutingEnum(Enum):
+    COLLECTION = "collection"
+    RECORD = "record"
+
 class PgVectorIndexTypeEnum(Enum):
     IVFFLAT = "ivfflat"
-    HNSW = "hnsw"
\ No newline at end of file
+    HNSW = "hnsw"
+
+
+class VectorQuantizationEnum(Enum):
+    NONE = "none"
+    HALFVEC = "halfvec"
+    BINARY = "binary"
+
+
+class SearchAccuracyEnum(Enum):
+    FAST = "fast"
+    BALANCED = "balanced"
+    ACCURATE = "accurate"
+
+    def scale(self, value: int) -> int:
+        # how much of the balanced search effort (ef_search / probes) each level spends
+        factors = {"fast": 0.5, "balanced": 1, "accurate": 4}
+        return max(1, int(value * factors[self.value]))
+
+
+class FilterOperatorEnum(Enum):
+    EQ = "eq"
+    IN = "in"
+    GT = "gt"
+    GTE = "gte"
+    LT = "lt"
+    LTE = "lte"
+
+
+class SearchModeEnum(Enum):
+    VECTOR = "vector"
+    HYBRID = "hybrid"
@@ -42,7 +42,32 @@ class VectorDBInterface(ABC):
                      metadata: list = None, record_ids: list = None, batch_size: int = 50):
           pass
     
+    @abstractmethod
+    def begin_bulk_load(self, collection_name: str, expected_rows: int = None):
+        pass
+
+    @abstractmethod
+    def end_bulk_load(self, collection_name: str):
+        pass
+
+    @abstractmethod
+    def delete_by_record_ids(self, collection_name: str, record_ids: list):
+        pass
+    
     @abstractmethod
     def search_by_vector(self, collection_name: str, vector: list, 
-                        limit: int = 10) -> List[RetrievedDocuments]:
-        pass
\ No newline at end of file
+                        limit: int = 10, accuracy: str = None,
+                        filters: list = None) -> List[RetrievedDocuments]:
+        pass
+
+    @abstractmethod
+    def search_by_vectors(self, collection_name: str, vectors: list,
+                          limit: int = 10, accuracy: str = None,
+                          filters: list = None) -> List[List[RetrievedDocuments]]:
+        pass
+
+    @abstractmethod
+    def search_hybrid(self, collection_name: str, vector: list, text: str,
+                      limit: int = 10, accuracy: str = None,
+                      filters: list = None) -> List[RetrievedDocuments]:
+        pass
@@ -1,7 +1,9 @@
-from .providers import QdrantDBProvider, PGVectorProvider
+from .providers import (QdrantDBProvider, PGVectorProvider, PGVectorPartitionedProvider, NumpyFlatProvider,
+                        NumpyIVFProvider, ShardedVectorDBProvider)
 from helper.config import Settings
-from .VectorDBEnum import VectorDBEnum
+from .VectorDBEnum import VectorDBEnum, PgVectorStorageModeEnum
 from controllers.BaseController import BaseController
+from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
 from sqlalchemy.orm import sessionmaker
 
 class VectorDBProviderFactory:
@@ -10,6 +12,8 @@ class VectorDBProviderFactory:
         self.config = config
         self.base_controller = BaseController()
         self.db_client = db_client
+        # off for pgvector shards in another database, which has no chunks table to reference
+        self.chunk_foreign_key = True
 
     async def create(self, provider: str):
         if provider == VectorDBEnum.QDRANT.value:
@@ -18,16 +22,131 @@ class VectorDBProviderFactory:
                 db_client=qdrant_db_clint,
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
                 default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
-                index_threshold=self.config.VECTOR_DB_PGVECTOR_INDEX_THRESHOLD
+                index_threshold=self.config.VECTOR_DB_PGVECTOR_INDEX_THRESHOLD,
+                collection_cache_ttl=self.config.VECTOR_DB_COLLECTION_CACHE_TTL,
+                hnsw_m=self.config.VECTOR_DB_HNSW_M,
+                hnsw_ef_construction=self.config.VECTOR_DB_HNSW_EF_CONSTRUCTION,
+                hnsw_ef_search=self.config.VECTOR_DB_HNSW_EF_SEARCH,
+                filterable_fields=self.config.VECTOR_DB_FILTERABLE_FIELDS,
+                hybrid_candidates=self.config.VECTOR_DB_HYBRID_CANDIDATES,
+                quantization=self.config.VECTOR_DB_QUANTIZATION,
+                quantization_oversampling=self.config.VECTOR_DB_QUANTIZATION_OVERSAMPLING,
+                url=self.config.VECTOR_DB_QDRANT_URL,
+                api_key=self.config.VECTOR_DB_QDRANT_API_KEY,
+                prefer_grpc=self.config.VECTOR_DB_QDRANT_PREFER_GRPC,
+                grpc_port=self.config.VECTOR_DB_QDRANT_GRPC_PORT,
+                upload_batch_size=self.config.VECTOR_DB_QDRANT_UPLOAD_BATCH_SIZE,
+                upload_parallel=self.config.VECTOR_DB_QDRANT_UPLOAD_PARALLEL,
             )
         elif provider == VectorDBEnum.PGVECTOR.value:
-            return PGVectorProvider(
+            db_dsn = None
+            if self.config.VECTOR_DB_PGVECTOR_POOL_ENABLED:
+                db_dsn = self.get_postgres_dsn()
+
+            pgvector_options = dict(
                 db_client=self.db_client,
                 distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
                 default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
                 index_threshold=self.config.VECTOR_DB_PGVECTOR_INDEX_THRESHOLD,
+                maintenance_work_mem=self.config.VECTOR_DB_PGVECTOR_MAINTENANCE_WORK_MEM,
+                max_parallel_maintenance_workers=self.config.VECTOR_DB_PGVECTOR_MAX_PARALLEL_MAINTENANCE_WORKERS,
+                db_dsn=db_dsn,
+                pool_min_size=self.config.VECTOR_DB_PGVECTOR_POOL_MIN_SIZE,
+                pool_max_size=self.config.VECTOR_DB_PGVECTOR_POOL_MAX_SIZE,
+                collection_cache_ttl=self.config.VECTOR_DB_COLLECTION_CACHE_TTL,
+                index_type=self.config.VECTOR_DB_PGVECTOR_INDEX_TYPE,
+                hnsw_m=self.config.VECTOR_DB_HNSW_M,
+                hnsw_ef_construction=self.config.VECTOR_DB_HNSW_EF_CONSTRUCTION,
+                hnsw_ef_search=self.config.VECTOR_DB_HNSW_EF_SEARCH,
+                iterative_scan=self.config.VECTOR_DB_PGVECTOR_ITERATIVE_SCAN,
+                text_search_config=self.config.VECTOR_DB_PGVECTOR_TEXT_SEARCH_CONFIG,
+                migrate_text_search=self.config.VECTOR_DB_PGVECTOR_MIGRATE_TEXT_SEARCH,
+                chunk_foreign_key=self.chunk_foreign_key,
+                hybrid_candidates=self.config.VECTOR_DB_HYBRID_CANDIDATES,
+                hybrid_rrf_k=self.config.VECTOR_DB_HYBRID_RRF_K,
+                quantization=self.config.VECTOR_DB_QUANTIZATION,
+                quantization_oversampling=self.config.VECTOR_DB_QUANTIZATION_OVERSAMPLING,
             )
 
+            if self.config.VECTOR_DB_PGVECTOR_STORAGE_MODE == PgVectorStorageModeEnum.PARTITIONED.value:
+                return PGVectorPartitionedProvider(
+                    partitions_count=self.config.VECTOR_DB_PGVECTOR_PARTITIONS,
+                    migrate_legacy=self.config.VECTOR_DB_PGVECTOR_MIGRATE_LEGACY,
+                    exact_search_rows=self.config.VECTOR_DB_PGVECTOR_EXACT_SEARCH_ROWS,
+                    **pgvector_options
+                )
+
+            return PGVectorProvider(**pgvector_options)
+        elif provider == VectorDBEnum.NUMPY.value:
+            return NumpyFlatProvider(
+                db_client=self.base_controller.get_database_path(database_name=self.config.VECTOR_DB_NUMPY_PATH),
+                distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
+                index_threshold=self.config.VECTOR_DB_PGVECTOR_INDEX_THRESHOLD,
+                search_block_rows=self.config.VECTOR_DB_NUMPY_SEARCH_BLOCK_ROWS,
+                compact_ratio=self.config.VECTOR_DB_NUMPY_COMPACT_RATIO,
+            )
+        elif provider == VectorDBEnum.NUMPY_IVF.value:
+            return NumpyIVFProvider(
+                db_client=self.base_controller.get_database_path(database_name=self.config.VECTOR_DB_NUMPY_IVF_PATH),
+                distance_method=self.config.VECTOR_DB_DISTANCE_METHOD,
+                default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
+                index_threshold=self.config.VECTOR_DB_PGVECTOR_INDEX_THRESHOLD,
+                search_block_rows=self.config.VECTOR_DB_NUMPY_SEARCH_BLOCK_ROWS,
+                compact_ratio=self.config.VECTOR_DB_NUMPY_COMPACT_RATIO,
+                nlist=self.config.VECTOR_DB_NUMPY_IVF_NLIST,
+                pq_m=self.config.VECTOR_DB_NUMPY_IVF_PQ_M,
+                nprobe=self.config.VECTOR_DB_NUMPY_IVF_NPROBE,
+                rerank=self.config.VECTOR_DB_NUMPY_IVF_RERANK,
+                train_threshold=self.config.VECTOR_DB_NUMPY_IVF_TRAIN_THRESHOLD,
+                kmeans_iterations=self.config.VECTOR_DB_NUMPY_IVF_KMEANS_ITERATIONS,
+            )
+        elif provider == VectorDBEnum.SHARDED.value:
+            return await self.create_sharded()
+
         return None
+
+    async def create_sharded(self) -> ShardedVectorDBProvider:
+        if not self.config.VECTOR_DB_SHARDS:
+            raise ValueError("The sharded vector db backend needs VECTOR_DB_SHARDS")
+
+        shards, db_engines = {}, []
+
+        for i, shard in enumerate(self.config.VECTOR_DB_SHARDS):
+            if shard["backend"] == VectorDBEnum.SHARDED.value:
+                raise ValueError("A vector db shard can not be sharded itself")
+
+            # every shard is built like the single backend, from the settings with its overrides
+            shard_settings = shard.get("settings") or {}
+            shard_factory = VectorDBProviderFactory(config=self.config.model_copy(update=shard_settings),
+                                                    db_client=self.db_client)
+
+            if shard["backend"] == VectorDBEnum.PGVECTOR.value and any(
+                    key.startswith("POSTGRES_") for key in shard_settings):
+                db_engine = create_async_engine(shard_factory.get_postgres_dsn(driver="asyncpg"))
+                db_engines.append(db_engine)
+                shard_factory.db_client = sessionmaker(bind=db_engine, class_=AsyncSession, expire_on_commit=False)
+                shard_factory.chunk_foreign_key = False
+
+            shard_provider = await shard_factory.create(provider=shard["backend"])
+            if shard_provider is None:
+                raise ValueError(f"Unknown vector db backend of shard {i}: {shard['backend']}")
+
+            shards[shard.get("name") or f"shard_{i}"] = shard_provider
+
+        return ShardedVectorDBProvider(
+            shards=shards,
+            routing=self.config.VECTOR_DB_SHARD_ROUTING,
+            shard_timeout=self.config.VECTOR_DB_SHARD_TIMEOUT,
+            virtual_nodes=self.config.VECTOR_DB_SHARD_VIRTUAL_NODES,
+            default_vector_size=self.config.EMBEDDING_MODEL_SIZE,
+            db_engines=db_engines,
+        )
+
+    def get_postgres_dsn(self, driver: str = None) -> str:
+        # plain asyncpg DSN by default, SQLAlchemy URLs carry a driver suffix
+        scheme = f"postgresql+{driver}" if driver else "postgresql"
+        return (f"{scheme}://{self.config.POSTGRES_USERNAME}:{self.config.POSTGRES_PASSWORD}"
+                f"@{self.config.POSTGRES_HOST}:{self.config.POSTGRES_PORT}/{self.config.POSTGRES_MAIN_DATABASE}")
     
 
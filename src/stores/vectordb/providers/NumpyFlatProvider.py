@@ -0,0 +1,225 @@
+import asyncio
+import os
+import re
+import shutil
+from ..VectorDBInterface import VectorDBInterface
+from ..FlatVectorCollection import FlatVectorCollection
+from ..VectorDBEnum import DistanceMethodEnum
+import logging
+from typing import List
+from models.db_schemes import RetrievedDocuments
+
+
+class NumpyFlatProvider(VectorDBInterface):
+    """
+    In-process exact search over memory mapped float32 matrices, one directory per
+    collection under `db_client`. There is no index to build or tune: a search is a
+    blocked matmul plus argpartition, which for small and medium collections is
+    cheaper than a round trip to a vector database. File I/O and the scan run in a
+    thread so the event loop keeps serving other requests.
+    """
+
+    collection_class = FlatVectorCollection
+
+    def __init__(self, db_client, distance_method: str = None,
+                 default_vector_size: int = 786, index_threshold: int = 100,
+                 search_block_rows: int = 32768, compact_ratio: float = 0.3):
+        self.db_client = db_client
+        self.default_vector_size = default_vector_size
+        self.index_threshold = index_threshold
+        self.search_block_rows = search_block_rows
+
+        # deleted rows share the scan until they exceed this ratio of the collection
+        self.compact_ratio = compact_ratio
+
+        self.distance_method = DistanceMethodEnum.COSINE.value
+        if distance_method == DistanceMethodEnum.DOT.value:
+            self.distance_method = DistanceMethodEnum.DOT.value
+
+        # collection name -> FlatVectorCollection opened by this process
+        self.collections = {}
+
+        self.logger = logging.getLogger("uvicorn.error")
+
+    async def connect(self):
+        os.makedirs(self.db_client, exist_ok=True)
+
+    async def disconnect(self):
+        for collection in self.collections.values():
+            collection.close()
+        self.collections = {}
+
+    def get_collection_path(self, collection_name: str) -> str:
+        # collection names become directory names
+        if not re.fullmatch(r"[A-Za-z0-9_]+", collection_name or ""):
+            raise ValueError(f"Invalid collection name: {collection_name}")
+        return os.path.join(self.db_client, collection_name)
+
+    def get_collection_options(self) -> dict:
+        return {"block_rows": self.search_block_rows}
+
+    def get_collection(self, collection_name: str) -> FlatVectorCollection:
+        collection = self.collections.get(collection_name)
+        if collection is None:
+            collection = self.collection_class(path=self.get_collection_path(collection_name),
+                                               **self.get_collection_options())
+
+        if not collection.refresh():
+            # deleted, possibly by another process
+            self.collections.pop(collection_name, None)
+            return None
+
+        self.collections[collection_name] = collection
+        return collection
+
+    async def is_collection_exists(self, collection_name: str) -> bool:
+        return self.get_collection(collection_name) is not None
+
+    async def list_all_collections(self) -> List:
+        return sorted(
+            name for name in os.listdir(self.db_client)
+            if os.path.isfile(os.path.join(self.db_client, name, "meta.json"))
+        )
+
+    async def get_collection_info(self, collection_name: str) -> dict:
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            return None
+
+        return await asyncio.to_thread(collection.info)
+
+    async def delete_collection(self, collection_name: str):
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            return False
+
+        self.logger.info(f"Deleting collection: {collection_name}")
+
+        def delete():
+            with collection.write_lock():
+                # readers notice the missing meta.json first
+                os.remove(collection.meta_path)
+                shutil.rmtree(collection.path, ignore_errors=True)
+            collection.close()
+
+        await asyncio.to_thread(delete)
+        self.collections.pop(collection_name, None)
+        return True
+
+    async def create_collection(self, collection_name: str,
+                                embedding_size: int,
+                                do_reset: bool = False):
+        if do_reset:
+            _ = await self.delete_collection(collection_name=collection_name)
+
+        if await self.is_collection_exists(collection_name):
+            return False
+
+        self.logger.info(f"Creating collection: {collection_name}")
+
+        self.collections[collection_name] = await asyncio.to_thread(
+            self.collection_class.create,
+            path=self.get_collection_path(collection_name),
+            dimension=embedding_size,
+            distance=self.distance_method,
+            **self.get_collection_options()
+        )
+        return True
+
+    async def insert_one(self, collection_name: str, text: str, vector: list,
+                         metadata: dict = None, record_id: str = None):
+        return await self.insert_many(collection_name=collection_name, texts=[text], vectors=[vector],
+                                      metadata=[metadata], record_ids=[record_id] if record_id is not None else None)
+
+    async def insert_many(self, collection_name: str, texts: list, vectors: list,
+                          metadata: list = None, record_ids: list = None, batch_size: int = 50):
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            self.logger.error(f"Can not insert new records to non-existed collection: {collection_name}")
+            return False
+
+        if metadata is None:
+            metadata = [None] * len(texts)
+
+        try:
+            # one append, the files are only grown and published once per batch
+            _ = await asyncio.to_thread(collection.append, texts=texts, vectors=vectors,
+                                        metadata=metadata, record_ids=record_ids)
+        except Exception as e:
+            self.logger.error(f"Error while inserting batch: {e}")
+            return False
+
+        return True
+
+    async def begin_bulk_load(self, collection_name: str, expected_rows: int = None):
+        # nothing to defer, appends never maintain an index
+        return False
+
+    async def end_bulk_load(self, collection_name: str):
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            return False
+
+        return await self.maybe_compact(collection)
+
+    async def maybe_compact(self, collection: FlatVectorCollection) -> bool:
+        # pushes replace every changed chunk, leaving its old row behind
+        meta = collection.meta
+        if not meta["deleted"] or meta["deleted"] < self.compact_ratio * meta["count"]:
+            return False
+
+        return await asyncio.to_thread(collection.compact)
+
+    async def delete_by_record_ids(self, collection_name: str, record_ids: list):
+        collection = self.get_collection(collection_name)
+        if not record_ids or collection is None:
+            return False
+
+        _ = await asyncio.to_thread(collection.delete, record_ids)
+        _ = await self.maybe_compact(collection)
+        return True
+
+    async def search_by_vector(self, collection_name: str, vector: list,
+                               limit: int = 10, accuracy: str = None,
+                               filters: list = None) -> List[RetrievedDocuments]:
+        results = await self.search_by_vectors(collection_name=collection_name, vectors=[vector],
+                                               limit=limit, accuracy=accuracy, filters=filters)
+        return results[0] if results else []
+
+    async def search_by_vectors(self, collection_name: str, vectors: list,
+                                limit: int = 10, accuracy: str = None,
+                                filters: list = None) -> List[List[RetrievedDocuments]]:
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            self.logger.error(f"Collection {collection_name} does not exist.")
+            return []
+
+        if not vectors:
+            return []
+
+        results = await asyncio.to_thread(collection.search, queries=vectors, limit=limit, filters=filters,
+                                          **self.get_search_options(accuracy))
+        if results is None:
+            return []
+
+        return [
+            [
+                RetrievedDocuments(
+                    text=text,
+                    score=score
+                )
+                for text, score in documents
+            ]
+            for documents in results
+        ]
+
+    def get_search_options(self, accuracy: str = None) -> dict:
+        # the scan is exact, `accuracy` has nothing to trade
+        return {}
+
+    async def search_hybrid(self, collection_name: str, vector: list, text: str,
+                            limit: int = 10, accuracy: str = None,
+                            filters: list = None) -> List[RetrievedDocuments]:
+        self.logger.warning(f"The NumPy stores have no text index, using vector search for {collection_name}.")
+        return await self.search_by_vector(collection_name=collection_name, vector=vector,
+                                           limit=limit, accuracy=accuracy, filters=filters)
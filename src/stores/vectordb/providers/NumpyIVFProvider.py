@@ -0,0 +1,89 @@
+import asyncio
+from .NumpyFlatProvider import NumpyFlatProvider
+from ..IVFPQVectorCollection import IVFPQVectorCollection
+from ..VectorDBEnum import SearchAccuracyEnum
+
+
+class NumpyIVFProvider(NumpyFlatProvider):
+    """
+    The NumPy store with an IVF-PQ index per collection, for local deployments past the
+    size where the exact scan is fast enough. Collections are searched exactly until
+    they reach `train_threshold` rows; the index is then trained at the end of a bulk
+    load and retrained there once the collection grew well past its training rows.
+    Inserts are encoded into the current index, deletes stay tombstones until compaction.
+    """
+
+    collection_class = IVFPQVectorCollection
+
+    def __init__(self, db_client, distance_method: str = None,
+                 default_vector_size: int = 786, index_threshold: int = 100,
+                 search_block_rows: int = 32768, compact_ratio: float = 0.3,
+                 nlist: int = 0, pq_m: int = 0, nprobe: int = 16, rerank: int = 10,
+                 train_threshold: int = 20000, kmeans_iterations: int = 15):
+        super().__init__(db_client=db_client, distance_method=distance_method,
+                         default_vector_size=default_vector_size, index_threshold=index_threshold,
+                         search_block_rows=search_block_rows, compact_ratio=compact_ratio)
+
+        self.nlist = nlist
+        self.pq_m = pq_m
+        self.nprobe = nprobe
+        self.rerank = rerank
+        self.train_threshold = train_threshold
+        self.kmeans_iterations = kmeans_iterations
+
+        # collections this process is training, a second push must not train them again
+        self.training = set()
+
+    def get_collection_options(self) -> dict:
+        return {
+            **super().get_collection_options(),
+            "nlist": self.nlist,
+            "pq_m": self.pq_m,
+            "nprobe": self.nprobe,
+            "rerank": self.rerank,
+            "train_threshold": self.train_threshold,
+            "kmeans_iterations": self.kmeans_iterations,
+        }
+
+    def get_search_options(self, accuracy: str = None) -> dict:
+        if not accuracy:
+            return {}
+        return {"nprobe": SearchAccuracyEnum(accuracy).scale(self.nprobe)}
+
+    async def end_bulk_load(self, collection_name: str):
+        is_compacted = await super().end_bulk_load(collection_name=collection_name)
+
+        collection = self.get_collection(collection_name)
+        if collection is not None:
+            _ = await self.maybe_train(collection_name=collection_name, collection=collection)
+
+        return is_compacted
+
+    async def maybe_train(self, collection_name: str, collection: IVFPQVectorCollection) -> bool:
+        if collection_name in self.training or not await asyncio.to_thread(collection.needs_training):
+            return False
+
+        self.logger.info(f"Training the IVF-PQ index of collection: {collection_name}")
+
+        self.training.add(collection_name)
+        try:
+            is_trained = await asyncio.to_thread(collection.train)
+        finally:
+            self.training.discard(collection_name)
+
+        if is_trained:
+            recall = await asyncio.to_thread(collection.measure_recall)
+            self.logger.info(f"Trained the IVF-PQ index of {collection_name}: {collection.meta.get('ivf')}, "
+                             f"measured against the exact scan: {recall}")
+
+        return is_trained
+
+    async def measure_recall(self, collection_name: str, sample_size: int = 50,
+                             limit: int = 10, accuracy: str = None) -> dict:
+        """Recall@limit and per query latency of the index against the exact scan."""
+        collection = self.get_collection(collection_name)
+        if collection is None:
+            return None
+
+        return await asyncio.to_thread(collection.measure_recall, sample_size=sample_size, limit=limit,
+                                       **self.get_search_options(accuracy))
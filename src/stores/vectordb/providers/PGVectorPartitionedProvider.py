@@ -0,0 +1,405 @@
+import re
+from .PGVectorProvider import PGVectorProvider
+from ..VectorDBEnum import PgVectorTableSchemaEnum, VectorQuantizationEnum
+from typing import List
+from sqlalchemy.sql import text as sql_text
+
+
+class PGVectorPartitionedProvider(PGVectorProvider):
+    """
+    pgvector storage with one table per embedding size instead of one per collection.
+    Each table is HASH-partitioned on the collection column, so tenants share a fixed
+    number of partitions and one set of indexes: the vector index is built once the
+    table, not every small project, reaches `index_threshold`. Collections are rows
+    of a catalog table. With `migrate_legacy`, the per-project tables of the default
+    storage mode are copied in and dropped on connect.
+
+    A small collection is a sliver of the shared index, and a filtered index scan
+    may run out of candidates before `limit` of them belong to it. Collections under
+    `exact_search_rows` rows are therefore searched exactly, through the btree on
+    their collection column instead of the vector index.
+    """
+
+    def __init__(self, db_client, partitions_count: int = 16, migrate_legacy: bool = False,
+                 exact_search_rows: int = 10000, **kwargs):
+        super().__init__(db_client, **kwargs)
+
+        self.partitions_count = max(1, partitions_count)
+        self.migrate_legacy = migrate_legacy
+        # per-project tables of table mode, named by NLPController.create_collection_name
+        self.legacy_table_pattern = r"^collection_([0-9]+)_[0-9]+$"
+        self.exact_search_rows = max(0, exact_search_rows or 0)
+
+        self.catalog_table_name = f"{self.pgvector_table_prefix}_collections"
+        self.vectors_table_name = lambda embedding_size: f"{self.pgvector_table_prefix}_vectors_{embedding_size}"
+
+        # collection name -> the shared table holding its rows
+        self.collection_tables = {}
+
+        # vector tables whose partitions and indexes were verified by this process
+        self.ready_tables = set()
+
+
+    async def connect(self):
+        await super().connect()
+
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(sql_text(
+                    f'CREATE TABLE IF NOT EXISTS {self.catalog_table_name} ('
+                        'collection_name text PRIMARY KEY, '
+                        'embedding_size integer NOT NULL, '
+                        'created_at timestamptz NOT NULL DEFAULT now()'
+                    ')'
+                ))
+                await session.commit()
+
+        if self.migrate_legacy:
+            await self.migrate_legacy_collections()
+
+
+    def get_table_name(self, collection_name: str) -> str:
+        return self.collection_tables[collection_name]
+
+
+    def get_scope_columns(self, collection_name: str) -> dict:
+        return {PgVectorTableSchemaEnum.COLLECTION.value: collection_name}
+
+
+    def validate_collection_name(self, collection_name: str):
+        # the name is inlined as a literal in cached statements
+        if not re.fullmatch(r"[A-Za-z0-9_]+", collection_name or ""):
+            raise ValueError(f"Invalid collection name: {collection_name}")
+
+
+    async def get_collection_state(self, collection_name: str):
+        state = self.collection_registry.get(collection_name)
+        if state is not None:
+            return state
+
+        self.validate_collection_name(collection_name)
+
+        async with self.db_client() as session:
+            async with session.begin():
+                catalog_sql = sql_text(
+                    f'SELECT embedding_size FROM {self.catalog_table_name} '
+                    'WHERE collection_name = :collection_name'
+                )
+                result = await session.execute(catalog_sql, {'collection_name': collection_name})
+                embedding_size = result.scalar_one_or_none()
+
+                if embedding_size is None:
+                    return None
+
+                table_name = self.vectors_table_name(embedding_size)
+
+                index_sql = sql_text(
+                    'SELECT am.amname AS index_type, ic.reloptions AS index_options, '
+                    'opc.opcname AS index_opclass '
+                    'FROM pg_class ic JOIN pg_am am ON am.oid = ic.relam '
+                    'JOIN pg_index ix ON ix.indexrelid = ic.oid '
+                    'JOIN pg_opclass opc ON opc.oid = ix.indclass[0] '
+                    'WHERE ic.oid = to_regclass(:index_name)'
+                )
+                result = await session.execute(index_sql, {'index_name': self.default_index_name(table_name)})
+                index_record = result.fetchone()
+
+                # counting stops at the threshold, past it the exact size does not matter
+                rows_sql = sql_text(
+                    f'SELECT COUNT(*) FROM (SELECT 1 FROM {table_name} '
+                    f'WHERE {PgVectorTableSchemaEnum.COLLECTION.value} = :collection_name '
+                    'LIMIT :max_rows) AS collection_rows'
+                )
+                result = await session.execute(rows_sql, {'collection_name': collection_name,
+                                                          'max_rows': self.exact_search_rows})
+                approx_rows = result.scalar_one()
+
+        self.collection_tables[collection_name] = table_name
+
+        return self.collection_registry.register(
+            collection_name,
+            dimension=embedding_size,
+            is_indexed=index_record is not None,
+            approx_rows=approx_rows,
+            index_type=index_record.index_type if index_record else None,
+            index_params=self.parse_index_options(index_record.index_options) if index_record else None,
+            has_text_index=True,
+            quantization=self.parse_index_quantization(index_record.index_opclass) if index_record else None,
+        )
+
+
+    def set_indexed(self, collection_name: str, is_indexed: bool, **index_state):
+        # the index belongs to the table, every collection stored in it gains or loses it
+        table_name = self.collection_tables.get(collection_name)
+        for shared_collection_name, shared_table_name in list(self.collection_tables.items()):
+            if shared_table_name == table_name:
+                self.collection_registry.set_indexed(shared_collection_name, is_indexed, **index_state)
+
+
+    async def is_index_existed(self, collection_name: str) -> bool:
+        state = self.collection_registry.get(collection_name)
+        if state is not None and state.is_indexed:
+            return True
+
+        # another collection of the table, maybe in another process, may have built it since
+        self.collection_registry.invalidate(collection_name)
+        state = await self.get_collection_state(collection_name)
+        return state is not None and bool(state.is_indexed)
+
+
+    async def maybe_create_vector_index(self, collection_name: str) -> bool:
+        if collection_name in self.bulk_loading_collections:
+            return False
+
+        # the collection's own size does not decide whether the shared table is indexed
+        state = self.collection_registry.get(collection_name)
+        if state is not None and state.is_indexed:
+            return False
+
+        return await self.create_vector_index(collection_name=collection_name)
+
+
+    def is_exact_search(self, state) -> bool:
+        return state is not None and state.approx_rows is not None and state.approx_rows < self.exact_search_rows
+
+
+    def get_quantization(self, state) -> str:
+        # exact searches order by the full precision distance
+        if self.is_exact_search(state):
+            return VectorQuantizationEnum.NONE.value
+        return super().get_quantization(state)
+
+
+    def get_search_settings(self, state, limit: int, accuracy: str = None, is_filtered: bool = False) -> list:
+        if self.is_exact_search(state):
+            # plain index scans include the vector index; the collection's rows still come
+            # from a bitmap scan of its (collection, chunk_id) index
+            return ['SET enable_indexscan = off']
+        return super().get_search_settings(state=state, limit=limit, accuracy=accuracy, is_filtered=is_filtered)
+
+
+    async def list_all_collections(self) -> List:
+        async with self.db_client() as session:
+            async with session.begin():
+                list_sql = sql_text(f'SELECT collection_name FROM {self.catalog_table_name} ORDER BY collection_name')
+                result = await session.execute(list_sql)
+                return result.scalars().all()
+
+
+    async def get_collection_info(self, collection_name: str) -> dict:
+        state = await self.get_collection_state(collection_name)
+        if state is None:
+            return None
+
+        table_name = self.get_table_name(collection_name)
+
+        async with self.db_client() as session:
+            async with session.begin():
+                count_sql = sql_text(
+                    f'SELECT COUNT(*) FROM {table_name} WHERE {self.get_scope_sql(collection_name)}'
+                )
+                record_count = await session.execute(count_sql)
+
+                return {
+                    "table_info": {
+                        "tablename": table_name,
+                        "embedding_size": state.dimension,
+                        "partitions_count": self.partitions_count,
+                        "hasindexes": bool(state.is_indexed),
+                    },
+                    "record_count": record_count.scalar_one()
+                }
+
+
+    async def delete_collection(self, collection_name: str):
+        state = await self.get_collection_state(collection_name)
+
+        self.collection_registry.invalidate(collection_name)
+        self.search_statements.pop(collection_name, None)
+        self.hybrid_statements.pop(collection_name, None)
+
+        if state is None:
+            return True
+
+        table_name = self.collection_tables.pop(collection_name)
+
+        async with self.db_client() as session:
+            async with session.begin():
+                self.logger.info(f"Deleting collection: {collection_name}")
+
+                # the hash of the collection prunes this to a single partition
+                await session.execute(sql_text(
+                    f'DELETE FROM {table_name} '
+                    f'WHERE {PgVectorTableSchemaEnum.COLLECTION.value} = :collection_name'
+                ), {'collection_name': collection_name})
+
+                await session.execute(sql_text(
+                    f'DELETE FROM {self.catalog_table_name} WHERE collection_name = :collection_name'
+                ), {'collection_name': collection_name})
+                await session.commit()
+
+        return True
+
+
+    async def create_collection(self, collection_name: str,
+                                      embedding_size: int,
+                                      do_reset: bool = False):
+
+        if do_reset:
+            _ = await self.delete_collection(collection_name=collection_name)
+
+        if await self.is_collection_exists(collection_name=collection_name):
+            return False
+
+        self.logger.info(f"Creating collection: {collection_name}")
+
+        _ = await self.ensure_vectors_table(embedding_size=embedding_size)
+
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(sql_text(
+                    f'INSERT INTO {self.catalog_table_name} (collection_name, embedding_size) '
+                    'VALUES (:collection_name, :embedding_size) ON CONFLICT (collection_name) DO NOTHING'
+                ), {'collection_name': collection_name, 'embedding_size': embedding_size})
+                await session.commit()
+
+        # the new collection shares whatever index its table already has
+        self.collection_registry.invalidate(collection_name)
+        _ = await self.get_collection_state(collection_name)
+
+        return True
+
+
+    async def ensure_vectors_table(self, embedding_size: int) -> str:
+        table_name = self.vectors_table_name(embedding_size)
+        if table_name in self.ready_tables:
+            return table_name
+
+        collection_column = PgVectorTableSchemaEnum.COLLECTION.value
+        chunk_id_column = PgVectorTableSchemaEnum.CHUNK_ID.value
+
+        async with self.db_client() as session:
+            async with session.begin():
+                # serialize processes creating the same table
+                await session.execute(sql_text('SELECT pg_advisory_xact_lock(hashtext(:table_name))'),
+                                      {'table_name': table_name})
+
+                await session.execute(sql_text(
+                    f'CREATE TABLE IF NOT EXISTS {table_name} ('
+                        f'{collection_column} text NOT NULL, '
+                        f'{PgVectorTableSchemaEnum.ID.value} bigserial, '
+                        f'{PgVectorTableSchemaEnum.TEXT.value} text, '
+                        f'{PgVectorTableSchemaEnum.VECTOR.value} vector({embedding_size}), '
+                        f'{PgVectorTableSchemaEnum.METADATA.value} jsonb DEFAULT \'{{}}\', '
+                        f'{chunk_id_column} integer, '
+                        f'{self.get_text_search_column_sql()}, '
+                        f'PRIMARY KEY ({collection_column}, {PgVectorTableSchemaEnum.ID.value})'
+                        f'{self.get_chunk_foreign_key_sql()}'
+                    f') PARTITION BY HASH ({collection_column})'
+                ))
+
+                for remainder in range(self.partitions_count):
+                    await session.execute(sql_text(
+                        f'CREATE TABLE IF NOT EXISTS {table_name}_p{remainder} PARTITION OF {table_name} '
+                        f'FOR VALUES WITH (MODULUS {self.partitions_count}, REMAINDER {remainder})'
+                    ))
+
+                # indexes on the parent are created on every partition
+                await session.execute(sql_text(
+                    f'CREATE UNIQUE INDEX IF NOT EXISTS {self.chunk_id_index_name(table_name)} '
+                    f'ON {table_name} ({collection_column}, {chunk_id_column})'
+                ))
+                await session.execute(self.get_metadata_index_sql(table_name))
+                await session.execute(self.get_text_search_index_sql(table_name))
+                await session.commit()
+
+        self.ready_tables.add(table_name)
+        return table_name
+
+
+    async def migrate_text_search_columns(self) -> int:
+        # the partitioned tables are created with the column, older tables are moved into them
+        return 0
+
+
+    async def begin_bulk_load(self, collection_name: str, expected_rows: int = None) -> bool:
+        # the index is shared with other collections, so it is never dropped for one push;
+        # inserts only stop checking it until `end_bulk_load`
+        self.bulk_loading_collections[collection_name] = self.bulk_loading_collections.get(collection_name, 0) + 1
+        return False
+
+
+    async def migrate_legacy_collections(self) -> int:
+        """
+        Moves the rows of the per-project tables of table mode into the partitioned
+        tables, then drops them. Only tables named like NLPController's collections,
+        collection_<embedding size>_<project id>, with a matching vector column qualify.
+        """
+
+        async with self.db_client() as session:
+            async with session.begin():
+                legacy_sql = sql_text(
+                    'SELECT c.relname AS table_name, a.atttypmod AS embedding_size '
+                    'FROM pg_class c '
+                    'JOIN pg_namespace n ON n.oid = c.relnamespace AND n.nspname = current_schema() '
+                    'JOIN pg_attribute a ON a.attrelid = c.oid AND a.attname = :vector_column AND NOT a.attisdropped '
+                    'JOIN pg_type t ON t.oid = a.atttypid AND t.typname = \'vector\' '
+                    'JOIN pg_attribute ch ON ch.attrelid = c.oid AND ch.attname = :chunk_id_column AND NOT ch.attisdropped '
+                    'WHERE c.relkind = \'r\' AND NOT c.relispartition AND c.relname ~ :legacy_pattern'
+                )
+                result = await session.execute(legacy_sql, {
+                    'vector_column': PgVectorTableSchemaEnum.VECTOR.value,
+                    'chunk_id_column': PgVectorTableSchemaEnum.CHUNK_ID.value,
+                    'legacy_pattern': self.legacy_table_pattern,
+                })
+                legacy_tables = result.fetchall()
+
+        migrated_count = 0
+        for legacy_table in legacy_tables:
+            collection_name = legacy_table.table_name
+            name_match = re.fullmatch(self.legacy_table_pattern, collection_name)
+            if name_match is None or int(name_match.group(1)) != legacy_table.embedding_size:
+                self.logger.warning(f"Skipping migration of table {collection_name}.")
+                continue
+
+            table_name = await self.ensure_vectors_table(embedding_size=legacy_table.embedding_size)
+            columns_sql = ", ".join([
+                PgVectorTableSchemaEnum.CHUNK_ID.value,
+                PgVectorTableSchemaEnum.TEXT.value,
+                PgVectorTableSchemaEnum.VECTOR.value,
+                PgVectorTableSchemaEnum.METADATA.value,
+            ])
+
+            async with self.db_client() as session:
+                async with session.begin():
+                    # another process may be migrating the same table
+                    await session.execute(sql_text('SELECT pg_advisory_xact_lock(hashtext(:table_name))'),
+                                          {'table_name': collection_name})
+
+                    if not (await session.execute(sql_text('SELECT to_regclass(:table_name) IS NOT NULL'),
+                                                  {'table_name': collection_name})).scalar_one():
+                        continue
+
+                    self.logger.info(f"Migrating collection {collection_name} into {table_name}")
+
+                    await session.execute(sql_text(
+                        f'INSERT INTO {self.catalog_table_name} (collection_name, embedding_size) '
+                        'VALUES (:collection_name, :embedding_size) ON CONFLICT (collection_name) DO NOTHING'
+                    ), {'collection_name': collection_name, 'embedding_size': legacy_table.embedding_size})
+
+                    await session.execute(sql_text(
+                        f'INSERT INTO {table_name} ({PgVectorTableSchemaEnum.COLLECTION.value}, {columns_sql}) '
+                        f'SELECT :collection_name, {columns_sql} FROM {collection_name} '
+                        f'ON CONFLICT ({PgVectorTableSchemaEnum.COLLECTION.value}, '
+                        f'{PgVectorTableSchemaEnum.CHUNK_ID.value}) DO NOTHING'
+                    ), {'collection_name': collection_name})
+
+                    await session.execute(sql_text(f'DROP TABLE {collection_name}'))
+                    await session.commit()
+
+            migrated_count += 1
+
+        if migrated_count:
+            self.logger.info(f"Migrated {migrated_count} collections into partitioned tables.")
+
+        return migrated_count
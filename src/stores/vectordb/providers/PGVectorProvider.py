@@ -1,8 +1,15 @@
 import json
+import math
+import re
+import asyncpg
+import numpy as np
+from pgvector.asyncpg import register_vector
 from ..VectorDBInterface import VectorDBInterface
+from ..CollectionRegistry import CollectionRegistry
 from ..VectorDBEnum import (DistanceMethodEnum, PgVectorTableSchemaEnum, 
-                            PgVectorDistanceMethodEnum, 
-                            PgVectorIndexTypeEnum)
+                            PgVectorDistanceMethodEnum, PgVectorDistanceOperatorEnum,
+                            PgVectorIndexTypeEnum, SearchAccuracyEnum,
+                            FilterOperatorEnum, VectorQuantizationEnum)
 import logging
 from typing import List
 from models.db_schemes import RetrievedDocuments
@@ -13,23 +20,101 @@ from sqlalchemy.sql import text as sql_text
 class PGVectorProvider(VectorDBInterface):
     def __init__(self, db_client, 
                  distance_method: str = None, 
-                 default_vector_size: int = 786, index_threshold: int = 100):
+                 default_vector_size: int = 786, index_threshold: int = 100,
+                 maintenance_work_mem: str = None, max_parallel_maintenance_workers: int = None,
+                 db_dsn: str = None, pool_min_size: int = 1, pool_max_size: int = 10,
+                 collection_cache_ttl: float = 60,
+                 index_type: str = PgVectorIndexTypeEnum.HNSW.value,
+                 hnsw_m: int = 16, hnsw_ef_construction: int = 64, hnsw_ef_search: int = 40,
+                 iterative_scan: str = "relaxed_order",
+                 text_search_config: str = "simple", hybrid_candidates: int = 50, hybrid_rrf_k: int = 60,
+                 migrate_text_search: bool = False, chunk_foreign_key: bool = True,
+                 quantization: str = VectorQuantizationEnum.NONE.value, quantization_oversampling: float = 4):
         
         self.db_client = db_client
+
+        # raw asyncpg connections with pgvector's binary codec, used for COPY ingestion and
+        # searches. kept apart from the SQLAlchemy pool whose queries pass vectors as text.
+        self.db_dsn = db_dsn
+        self.pool_min_size = pool_min_size
+        self.pool_max_size = pool_max_size
+        self.vector_pool = None
+
+        # vectors cascade with their chunks only when both live in the same database
+        self.chunk_foreign_key = chunk_foreign_key
+
+        # existence, dimension, index state and size of known collections
+        self.collection_registry = CollectionRegistry(ttl=collection_cache_ttl)
+
+        # collections whose unique chunk_id and metadata indexes were verified by this process
+        self.verified_collections = set()
+
+        # collection name -> search SQL; asyncpg prepares it once per pooled connection
+        self.search_statements = {}
+        self.hybrid_statements = {}
+
+        # the text search configuration ends up in a generated column and in SQL text
+        if not re.fullmatch(r"[A-Za-z_][A-Za-z0-9_]*", text_search_config or ""):
+            raise ValueError(f"Invalid text search configuration: {text_search_config}")
+
+        self.text_search_config = text_search_config
+        self.migrate_text_search = migrate_text_search
+        self.hybrid_candidates = hybrid_candidates
+        self.hybrid_rrf_k = hybrid_rrf_k
+
         self.distance_method = distance_method
         self.default_vector_size = default_vector_size
         self.index_threshold = index_threshold
 
+        # defaults for new indexes, an index keeps the parameters it was built with
+        self.index_type = index_type or PgVectorIndexTypeEnum.HNSW.value
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.hnsw_ef_search = hnsw_ef_search
+        # pgvector rejects a larger hnsw.ef_search
+        self.hnsw_max_ef_search = 1000
+
+        # new indexes are built over halfvec or bit casts of the column, the table keeps
+        # full vectors so binary candidates can be re-ranked at full precision
+        self.quantization = VectorQuantizationEnum(quantization or VectorQuantizationEnum.NONE.value).value
+        self.quantization_oversampling = max(1.0, float(quantization_oversampling))
+
+        # pgvector >= 0.8 keeps scanning the index until enough rows pass a filter
+        self.iterative_scan = iterative_scan
+        self.iterative_scan_settings = {
+            PgVectorIndexTypeEnum.HNSW.value: "hnsw.iterative_scan",
+            PgVectorIndexTypeEnum.IVFFLAT.value: "ivfflat.iterative_scan",
+        }
+        self.filter_range_operators = {
+            FilterOperatorEnum.GT.value: ">",
+            FilterOperatorEnum.GTE.value: ">=",
+            FilterOperatorEnum.LT.value: "<",
+            FilterOperatorEnum.LTE.value: "<=",
+        }
+
+        # only applied to the session that builds a vector index
+        self.maintenance_work_mem = maintenance_work_mem
+        self.max_parallel_maintenance_workers = max_parallel_maintenance_workers
+
+        # collection name -> number of bulk loads in progress on it
+        self.bulk_loading_collections = {}
+
         self.pgvector_table_prefix = PgVectorTableSchemaEnum._PREFIX.value
 
-        self.logger = logging.getLogger("Uvicorn")
+        self.logger = logging.getLogger("uvicorn.error")
 
         self.default_index_name = lambda collection_name: f"{self.pgvector_table_prefix}_{collection_name}_index"
+        self.chunk_id_index_name = lambda collection_name: f"{self.pgvector_table_prefix}_{collection_name}_chunk_id_index"
+        self.metadata_index_name = lambda collection_name: f"{self.pgvector_table_prefix}_{collection_name}_metadata_index"
+        self.text_search_index_name = lambda collection_name: f"{self.pgvector_table_prefix}_{collection_name}_text_search_index"
         
+        # the search operator must match the index opclass for the index to be used
+        self.distance_operator = PgVectorDistanceOperatorEnum.COSINE.value
         if distance_method == DistanceMethodEnum.COSINE.value:
             self.distance_method = PgVectorDistanceMethodEnum.COSINE.value
         elif distance_method == DistanceMethodEnum.DOT.value:
             self.distance_method = PgVectorDistanceMethodEnum.DOT.value
+            self.distance_operator = PgVectorDistanceOperatorEnum.DOT.value
         
 
     async def connect(self):
@@ -39,23 +124,110 @@ class PGVectorProvider(VectorDBInterface):
                 await session.execute(
                     sql_text("CREATE EXTENSION IF NOT EXISTS vector;")
                 )
+                result = await session.execute(
+                    sql_text("SELECT extversion FROM pg_extension WHERE extname = 'vector'")
+                )
+                extension_version = result.scalar_one_or_none()
                 await session.commit()
+
+        # SET hnsw.iterative_scan fails as an unrecognized parameter before pgvector 0.8
+        if self.iterative_scan and not self.is_extension_at_least(extension_version, (0, 8)):
+            self.logger.warning(f"pgvector {extension_version} has no iterative index scans, "
+                                "filtered searches may return fewer rows than asked for.")
+            self.iterative_scan = None
+
+        if self.migrate_text_search:
+            await self.migrate_text_search_columns()
+
+        if self.db_dsn is not None:
+            self.vector_pool = await asyncpg.create_pool(
+                dsn=self.db_dsn,
+                min_size=self.pool_min_size,
+                max_size=self.pool_max_size,
+                init=register_vector
+            )
             
+    @staticmethod
+    def is_extension_at_least(extension_version: str, minimum: tuple) -> bool:
+        # extversion is "0.8.0", or e.g. "0.7.4-dev" on development builds
+        parts = re.findall(r"\d+", extension_version or "")
+        return tuple(int(part) for part in parts[:len(minimum)]) >= minimum
+
     async def disconnect(self):
-        pass
+        if self.vector_pool is not None:
+            await self.vector_pool.close()
+            self.vector_pool = None
 
 
     async def is_collection_exists(self, collection_name: str) -> bool:
-        record = None
-        async with self.db_client()as session:
+        return await self.get_collection_state(collection_name) is not None
+
+
+    async def get_collection_state(self, collection_name: str):
+        state = self.collection_registry.get(collection_name)
+        if state is not None:
+            return state
+
+        # one catalog query for existence, vector dimension, index and estimated size
+        async with self.db_client() as session:
             async with session.begin():
-                list_tbl = sql_text('SELECT * FROM pg_tables WHERE tablename = :collection_name')
-                result = await session.execute(list_tbl, {'collection_name': collection_name})
-                record = result.scalar_one_or_none()
-            
-        
-        return record
-    
+                state_sql = sql_text(
+                    'SELECT c.reltuples::bigint AS approx_rows, a.atttypmod AS dimension, '
+                    'am.amname AS index_type, ic.reloptions AS index_options, '
+                    'ts.attname IS NOT NULL AS has_text_index, opc.opcname AS index_opclass '
+                    'FROM pg_class c '
+                    'LEFT JOIN pg_attribute a ON a.attrelid = c.oid AND a.attname = :vector_column '
+                    'LEFT JOIN pg_attribute ts ON ts.attrelid = c.oid AND ts.attname = :text_search_column '
+                    'LEFT JOIN pg_class ic ON ic.oid = to_regclass(:index_name) '
+                    'LEFT JOIN pg_am am ON am.oid = ic.relam '
+                    'LEFT JOIN pg_index ix ON ix.indexrelid = ic.oid '
+                    'LEFT JOIN pg_opclass opc ON opc.oid = ix.indclass[0] '
+                    'WHERE c.oid = to_regclass(:collection_name)'
+                )
+                result = await session.execute(state_sql, {
+                    'collection_name': collection_name,
+                    'index_name': self.default_index_name(collection_name),
+                    'vector_column': PgVectorTableSchemaEnum.VECTOR.value,
+                    'text_search_column': PgVectorTableSchemaEnum.TEXT_SEARCH.value,
+                })
+                record = result.fetchone()
+
+        if record is None:
+            return None
+
+        return self.collection_registry.register(
+            collection_name,
+            dimension=record.dimension if record.dimension and record.dimension > 0 else None,
+            is_indexed=record.index_type is not None,
+            # reltuples is -1 until the table is first vacuumed or analyzed
+            approx_rows=record.approx_rows if record.approx_rows >= 0 else None,
+            index_type=record.index_type,
+            index_params=self.parse_index_options(record.index_options),
+            has_text_index=record.has_text_index,
+            quantization=self.parse_index_quantization(record.index_opclass),
+        )
+
+
+    def parse_index_options(self, index_options: list) -> dict:
+        # reloptions come back as ["m=16", "ef_construction=64"]
+        index_params = {}
+        for option in index_options or []:
+            key, _, value = option.partition("=")
+            index_params[key] = int(value) if value.isdigit() else value
+
+        return index_params
+
+
+    def parse_index_quantization(self, index_opclass: str) -> str:
+        # the opclass tells which cast of the vector column the index was built over
+        if index_opclass is None:
+            return None
+        if index_opclass.startswith("halfvec_"):
+            return VectorQuantizationEnum.HALFVEC.value
+        if index_opclass.startswith("bit_"):
+            return VectorQuantizationEnum.BINARY.value
+        return VectorQuantizationEnum.NONE.value
+
 
     async def list_all_collections(self) -> List:
         records = []
@@ -100,6 +272,11 @@ class PGVectorProvider(VectorDBInterface):
     
     async def delete_collection(self, collection_name: str):
         
+        self.collection_registry.invalidate(collection_name)
+        self.verified_collections.discard(collection_name)
+        self.search_statements.pop(collection_name, None)
+        self.hybrid_statements.pop(collection_name, None)
+
         async with self.db_client() as session:
             async with session.begin():
                 self.logger.info(f"Deleting collection: {collection_name}")
@@ -118,6 +295,11 @@ class PGVectorProvider(VectorDBInterface):
         if do_reset:
             _ = await self.delete_collection(collection_name=collection_name)
 
+        # already checked by this process, nothing to do
+        if collection_name in self.verified_collections and \
+                self.collection_registry.get(collection_name) is not None:
+            return False
+
         is_collection_exists = await self.is_collection_exists(collection_name=collection_name)
         if not is_collection_exists:
             self.logger.info(f"Creating collection: {collection_name}")
@@ -130,79 +312,318 @@ class PGVectorProvider(VectorDBInterface):
                             f'{PgVectorTableSchemaEnum.VECTOR.value} vector({embedding_size}), '
                             f'{PgVectorTableSchemaEnum.METADATA.value} jsonb DEFAULT \'{{}}\', '
                             f'{PgVectorTableSchemaEnum.CHUNK_ID.value} integer, '
-                            f'FOREIGN KEY ({PgVectorTableSchemaEnum.CHUNK_ID.value}) REFERENCES chunks(chunks_id)'
+                            f'{self.get_text_search_column_sql()}'
+                            f'{self.get_chunk_foreign_key_sql()}'
                         ')'
                     )
                     await session.execute(create_sql)
+
+                    chunk_id_index_sql = sql_text(
+                        f'CREATE UNIQUE INDEX {self.chunk_id_index_name(collection_name)} '
+                        f'ON {collection_name} ({PgVectorTableSchemaEnum.CHUNK_ID.value})'
+                    )
+                    await session.execute(chunk_id_index_sql)
+                    await session.execute(self.get_metadata_index_sql(collection_name))
+                    await session.execute(self.get_text_search_index_sql(collection_name))
                     await session.commit()
-            
+
+            self.collection_registry.register(collection_name, dimension=embedding_size,
+                                              is_indexed=False, approx_rows=0, has_text_index=True)
+            self.verified_collections.add(collection_name)
             return True
 
+        # collections created before chunk_id was unique need it for upserts,
+        # and before metadata filters existed a GIN index to serve them
+        await self.ensure_chunk_id_unique(collection_name=collection_name)
+        await self.ensure_metadata_index(collection_name=collection_name)
+        self.verified_collections.add(collection_name)
+
         return False
 
 
+    def get_metadata_index_sql(self, collection_name: str):
+        # jsonb_path_ops serves the @> containment used by metadata filters
+        return sql_text(
+            f'CREATE INDEX IF NOT EXISTS {self.metadata_index_name(collection_name)} '
+            f'ON {collection_name} USING gin ({PgVectorTableSchemaEnum.METADATA.value} jsonb_path_ops)'
+        )
+
+
+    def get_chunk_foreign_key_sql(self) -> str:
+        if not self.chunk_foreign_key:
+            return ''
+        return (
+            f', FOREIGN KEY ({PgVectorTableSchemaEnum.CHUNK_ID.value}) '
+            f'REFERENCES chunks(chunks_id) ON DELETE CASCADE'
+        )
+
+    def get_text_search_column_sql(self) -> str:
+        # kept in sync by postgres, so inserts and COPY do not have to compute it
+        return (
+            f'{PgVectorTableSchemaEnum.TEXT_SEARCH.value} tsvector GENERATED ALWAYS AS '
+            f'(to_tsvector(\'{self.text_search_config}\', coalesce({PgVectorTableSchemaEnum.TEXT.value}, \'\'))) STORED'
+        )
+
+
+    def get_text_search_index_sql(self, collection_name: str):
+        return sql_text(
+            f'CREATE INDEX IF NOT EXISTS {self.text_search_index_name(collection_name)} '
+            f'ON {collection_name} USING gin ({PgVectorTableSchemaEnum.TEXT_SEARCH.value})'
+        )
+
+
+    async def migrate_text_search_columns(self) -> int:
+        """
+        Adds the text search column and its GIN index to collections created before
+        hybrid search. Adding a stored generated column rewrites the table under an
+        exclusive lock that blocks its searches, so this is run by migrate_text_search.py
+        (or on connect with `migrate_text_search`), never in a push. Until then hybrid
+        searches of such a collection rank by vector only.
+        """
+        async with self.db_client() as session:
+            async with session.begin():
+                tables_sql = sql_text(
+                    'SELECT c.relname AS table_name FROM pg_class c '
+                    'JOIN pg_namespace n ON n.oid = c.relnamespace AND n.nspname = current_schema() '
+                    'JOIN pg_attribute a ON a.attrelid = c.oid AND a.attname = :vector_column AND NOT a.attisdropped '
+                    'JOIN pg_attribute ch ON ch.attrelid = c.oid AND ch.attname = :chunk_id_column AND NOT ch.attisdropped '
+                    'LEFT JOIN pg_attribute ts ON ts.attrelid = c.oid AND ts.attname = :text_search_column '
+                    'AND NOT ts.attisdropped '
+                    'WHERE c.relkind = \'r\' AND NOT c.relispartition AND ts.attname IS NULL'
+                )
+                result = await session.execute(tables_sql, {
+                    'vector_column': PgVectorTableSchemaEnum.VECTOR.value,
+                    'chunk_id_column': PgVectorTableSchemaEnum.CHUNK_ID.value,
+                    'text_search_column': PgVectorTableSchemaEnum.TEXT_SEARCH.value,
+                })
+                table_names = result.scalars().all()
+
+        for table_name in table_names:
+            if not re.fullmatch(r"[A-Za-z0-9_]+", table_name):
+                self.logger.warning(f"Skipping text search migration of table {table_name}.")
+                continue
+
+            self.logger.info(f"Adding a text search column to: {table_name}")
+
+            async with self.db_client() as session:
+                async with session.begin():
+                    # another process may be migrating the same table
+                    await session.execute(sql_text('SELECT pg_advisory_xact_lock(hashtext(:table_name))'),
+                                          {'table_name': table_name})
+                    await session.execute(sql_text(
+                        f'ALTER TABLE {table_name} ADD COLUMN IF NOT EXISTS {self.get_text_search_column_sql()}'
+                    ))
+
+            # CONCURRENTLY blocks neither writes nor searches while the index is built
+            async with self.db_client() as session:
+                connection = await session.connection(execution_options={"isolation_level": "AUTOCOMMIT"})
+                await connection.execute(sql_text(
+                    f'CREATE INDEX CONCURRENTLY IF NOT EXISTS {self.text_search_index_name(table_name)} '
+                    f'ON {table_name} USING gin ({PgVectorTableSchemaEnum.TEXT_SEARCH.value})'
+                ))
+
+            self.collection_registry.invalidate(table_name)
+
+        return len(table_names)
+
+
+    async def ensure_metadata_index(self, collection_name: str):
+        async with self.db_client() as session:
+            async with session.begin():
+                await session.execute(self.get_metadata_index_sql(collection_name))
+                await session.commit()
+
+
+    async def ensure_chunk_id_unique(self, collection_name: str) -> bool:
+        index_name = self.chunk_id_index_name(collection_name)
+        async with self.db_client() as session:
+            async with session.begin():
+                index_sql = sql_text(
+                    'SELECT 1 FROM pg_indexes WHERE tablename = :collection_name AND indexname = :index_name'
+                )
+                result = await session.execute(index_sql, {
+                    'collection_name': collection_name,
+                    'index_name': index_name
+                })
+
+                if result.scalar_one_or_none():
+                    return False
+
+                self.logger.info(f"Removing duplicated chunks and adding a unique chunk_id index to: {collection_name}")
+
+                # keep the most recent row of every chunk pushed more than once
+                dedupe_sql = sql_text(
+                    f'DELETE FROM {collection_name} a USING {collection_name} b '
+                    f'WHERE a.{PgVectorTableSchemaEnum.CHUNK_ID.value} = b.{PgVectorTableSchemaEnum.CHUNK_ID.value} '
+                    f'AND a.{PgVectorTableSchemaEnum.ID.value} < b.{PgVectorTableSchemaEnum.ID.value}'
+                )
+                await session.execute(dedupe_sql)
+
+                chunk_id_index_sql = sql_text(
+                    f'CREATE UNIQUE INDEX IF NOT EXISTS {index_name} '
+                    f'ON {collection_name} ({PgVectorTableSchemaEnum.CHUNK_ID.value})'
+                )
+                await session.execute(chunk_id_index_sql)
+                await session.commit()
+
+        return True
+
+
 
     async def is_index_existed(self, collection_name: str) -> bool:
-        index_name = self.default_index_name(collection_name)
+        state = self.collection_registry.get(collection_name)
+        if state is not None and state.is_indexed is not None:
+            return state.is_indexed
+
+        table_name = self.get_table_name(collection_name)
+        index_name = self.default_index_name(table_name)
         async with self.db_client() as session:
             async with session.begin():
                 
                 index_sql = sql_text(
-                    f'SELECT 1 FROM pg_indexes WHERE tablename = :collection_name AND indexname = :index_name'
+                    f'SELECT 1 FROM pg_indexes WHERE tablename = :table_name AND indexname = :index_name'
                 )
                 
                 result = await session.execute(index_sql, {
-                    'collection_name': collection_name,
+                    'table_name': table_name,
                     'index_name': index_name
                 })
                 
-                return bool(result.scalar_one_or_none())
+                is_indexed = bool(result.scalar_one_or_none())
+
+        self.set_indexed(collection_name, is_indexed)
+        return is_indexed
+
+
+    def set_indexed(self, collection_name: str, is_indexed: bool, **index_state):
+        self.collection_registry.set_indexed(collection_name, is_indexed, **index_state)
+
+
+    def get_index_params(self, index_type: str, record_count: int) -> dict:
+        if index_type == PgVectorIndexTypeEnum.IVFFLAT.value:
+            # pgvector's guidance: rows / 1000 lists up to 1M rows, sqrt(rows) beyond
+            if record_count <= 1_000_000:
+                return {"lists": max(1, record_count // 1000)}
+            return {"lists": int(math.sqrt(record_count))}
+
+        return {"m": self.hnsw_m, "ef_construction": self.hnsw_ef_construction}
+
+
+    def get_index_column_sql(self, quantization: str, dimension: int) -> str:
+        """The indexed expression and its opclass; searches must order by the same expression."""
+        vector_column = PgVectorTableSchemaEnum.VECTOR.value
+
+        if quantization == VectorQuantizationEnum.HALFVEC.value:
+            # 2 bytes per dimension, same opclass family over halfvec
+            opclass = self.distance_method.replace("vector_", "halfvec_", 1)
+            return f'(CAST({vector_column} AS halfvec({dimension}))) {opclass}'
+
+        if quantization == VectorQuantizationEnum.BINARY.value:
+            # 1 bit per dimension (the sign), compared by Hamming distance
+            return f'(CAST(binary_quantize({vector_column}) AS bit({dimension}))) bit_hamming_ops'
+
+        return f'{vector_column} {self.distance_method}'
+
+
+    def get_order_sql(self, state, vector: str) -> str:
+        """ORDER BY expression matching the collection's index for the query vector `vector`."""
+        vector_column = PgVectorTableSchemaEnum.VECTOR.value
+        quantization = self.get_quantization(state)
+
+        if quantization == VectorQuantizationEnum.HALFVEC.value:
+            return (f'CAST({vector_column} AS halfvec({state.dimension})) {self.distance_operator} '
+                    f'CAST(CAST({vector} AS vector) AS halfvec({state.dimension}))')
+
+        if quantization == VectorQuantizationEnum.BINARY.value:
+            return (f'CAST(binary_quantize({vector_column}) AS bit({state.dimension})) <~> '
+                    f'binary_quantize(CAST({vector} AS vector))')
+
+        return f'{vector_column} {self.distance_operator} CAST({vector} AS vector)'
+
+
+    def get_quantization(self, state) -> str:
+        # without an index, or a known dimension to cast to, the scan is exact anyway
+        if state is None or not state.is_indexed or not state.dimension:
+            return VectorQuantizationEnum.NONE.value
+        return state.quantization or VectorQuantizationEnum.NONE.value
 
 
     async def create_vector_index(self, collection_name: str,
-                                  index_type: str = PgVectorIndexTypeEnum.HNSW.value,):
+                                  index_type: str = None, index_params: dict = None,
+                                  quantization: str = None):
         
+        index_type = index_type or self.index_type
+        quantization = VectorQuantizationEnum(quantization or self.quantization).value
+
         is_index_existed = await self.is_index_existed(collection_name=collection_name)
 
         if is_index_existed:
             return False
+
+        state = await self.get_collection_state(collection_name)
+        if state is None or not state.dimension:
+            # halfvec and bit casts need the column's dimension
+            quantization = VectorQuantizationEnum.NONE.value
+
+        # the index covers the whole table, which may hold other collections too
+        table_name = self.get_table_name(collection_name)
         
         async with self.db_client() as session:
             async with session.begin():
                 count_sql = sql_text(
-                    f'SELECT COUNT(*) FROM {collection_name}'
+                    f'SELECT COUNT(*) FROM {table_name}'
                 )
                 result = await session.execute(count_sql)
                 record_count = result.scalar_one()
 
+                # a shared table's count says nothing about the collection's own size
+                if table_name == collection_name:
+                    self.collection_registry.set_rows(collection_name, record_count)
 
-                
                 if record_count < self.index_threshold:
                     self.logger.info(f"Collection {collection_name} has only {record_count} records, skipping index creation.")
                     return False
 
                 self.logger.info(f"START: Creating vector index for collection: {collection_name}")
+
+                if self.maintenance_work_mem:
+                    await session.execute(sql_text(f"SET LOCAL maintenance_work_mem = '{self.maintenance_work_mem}'"))
+
+                if self.max_parallel_maintenance_workers is not None:
+                    await session.execute(sql_text(
+                        f'SET LOCAL max_parallel_maintenance_workers = {int(self.max_parallel_maintenance_workers)}'
+                    ))
                 
-                index_name = self.default_index_name(collection_name)
+                # explicit parameters override the defaults for this collection only
+                index_params = {**self.get_index_params(index_type, record_count), **(index_params or {})}
+                index_options = ", ".join(f"{key} = {int(value)}" for key, value in index_params.items())
+
+                index_name = self.default_index_name(table_name)
                 create_index_sql = sql_text(
-                    f'CREATE INDEX {index_name} '
-                    f'ON {collection_name} USING {index_type} '
-                    f'({PgVectorTableSchemaEnum.VECTOR.value} {self.distance_method})'
+                    f'CREATE INDEX IF NOT EXISTS {index_name} '
+                    f'ON {table_name} USING {index_type} '
+                    f'({self.get_index_column_sql(quantization, state.dimension if state else None)}) '
+                    f'WITH ({index_options})'
                 )
                 
                 await session.execute(create_index_sql)
                 
-                self.logger.info(f"END: Created vector index for collection: {collection_name}")
+                self.logger.info(f"END: Created {index_type} index {index_params} ({quantization}) for table: {table_name}")
+
+        self.set_indexed(collection_name, True, index_type=index_type,
+                                             index_params=index_params, quantization=quantization)
+        return True
 
 
-    async def reset_vecor_index(self, collection_name: str, index_type: str = PgVectorIndexTypeEnum.HNSW.value) -> bool:
+    async def reset_vecor_index(self, collection_name: str, index_type: str = None,
+                                index_params: dict = None, quantization: str = None) -> bool:
 
         is_index_existed = await self.is_index_existed(collection_name=collection_name)
 
         if is_index_existed:
             self.logger.info(f"Resetting index for collection: {collection_name}")
 
-            index_name = self.default_index_name(collection_name)
+            index_name = self.default_index_name(self.get_table_name(collection_name))
 
             async with self.db_client() as session:
                 async with session.begin():
@@ -211,13 +632,109 @@ class PGVectorProvider(VectorDBInterface):
                     )
                     await session.execute(drop_index_sql)
                     await session.commit()
+
+            self.set_indexed(collection_name, False)
         
-        return await self.create_vector_index(collection_name=collection_name, index_type=index_type)
+        return await self.create_vector_index(collection_name=collection_name, index_type=index_type,
+                                              index_params=index_params, quantization=quantization)
         
 
 
 
 
+    async def begin_bulk_load(self, collection_name: str, expected_rows: int = None) -> bool:
+        """
+        Stop maintaining the vector index while a large push loads the collection.
+        Inserts no longer check or build the index, and when the push is expected to
+        at least double the collection the existing index is dropped so rows are not
+        inserted into the HNSW graph one by one. `end_bulk_load` builds it once.
+        """
+        self.bulk_loading_collections[collection_name] = self.bulk_loading_collections.get(collection_name, 0) + 1
+
+        if not expected_rows or self.bulk_loading_collections[collection_name] > 1:
+            return False
+
+        if not await self.is_index_existed(collection_name=collection_name):
+            return False
+
+        table_name = self.get_table_name(collection_name)
+
+        async with self.db_client() as session:
+            async with session.begin():
+                count_sql = sql_text(f'SELECT COUNT(*) FROM {table_name}')
+                result = await session.execute(count_sql)
+                record_count = result.scalar_one()
+
+                if expected_rows < record_count:
+                    return False
+
+                self.logger.info(f"Dropping vector index of {table_name} for a bulk load of {expected_rows} rows.")
+                drop_index_sql = sql_text(f'DROP INDEX IF EXISTS {self.default_index_name(table_name)}')
+                await session.execute(drop_index_sql)
+
+        self.set_indexed(collection_name, False)
+        return True
+
+
+    async def end_bulk_load(self, collection_name: str):
+        remaining_loads = self.bulk_loading_collections.get(collection_name, 1) - 1
+
+        if remaining_loads > 0:
+            # another push is still loading, the last one to finish builds the index
+            self.bulk_loading_collections[collection_name] = remaining_loads
+            return False
+
+        self.bulk_loading_collections.pop(collection_name, None)
+
+        if not await self.is_collection_exists(collection_name):
+            return False
+
+        return await self.create_vector_index(collection_name=collection_name)
+
+
+    def get_table_name(self, collection_name: str) -> str:
+        # every collection is its own table
+        return collection_name
+
+
+    def get_scope_columns(self, collection_name: str) -> dict:
+        # columns identifying a collection's rows when the table is shared with others
+        return {}
+
+
+    def get_scope_sql(self, collection_name: str, alias: str = None) -> str:
+        column_prefix = f'{alias}.' if alias else ''
+        return ' AND '.join(
+            f"{column_prefix}{column} = '{value}'"
+            for column, value in self.get_scope_columns(collection_name).items()
+        )
+
+
+    def get_scope_insert_sql(self, collection_name: str):
+        # leading "col, " and "'value', " fragments to prepend to INSERT column and value lists
+        scope_columns = self.get_scope_columns(collection_name)
+        return (
+            ''.join(f'{column}, ' for column in scope_columns),
+            ''.join(f"'{value}', " for value in scope_columns.values()),
+        )
+
+
+    def combine_conditions(self, *conditions) -> str:
+        return ' AND '.join(condition for condition in conditions if condition)
+
+
+    def upsert_clause(self, collection_name: str) -> str:
+        conflict_columns = [*self.get_scope_columns(collection_name), PgVectorTableSchemaEnum.CHUNK_ID.value]
+
+        # pushing a chunk again replaces its row instead of duplicating it
+        return (
+            f'ON CONFLICT ({", ".join(conflict_columns)}) DO UPDATE SET '
+            f'{PgVectorTableSchemaEnum.TEXT.value} = EXCLUDED.{PgVectorTableSchemaEnum.TEXT.value}, '
+            f'{PgVectorTableSchemaEnum.VECTOR.value} = EXCLUDED.{PgVectorTableSchemaEnum.VECTOR.value}, '
+            f'{PgVectorTableSchemaEnum.METADATA.value} = EXCLUDED.{PgVectorTableSchemaEnum.METADATA.value}'
+        )
+
+
     async def insert_one(self, collection_name: str, text: str, vector: list, metadata: dict = None, record_id: str = None):
         
         is_collection_exists = await self.is_collection_exists(collection_name)
@@ -231,15 +748,19 @@ class PGVectorProvider(VectorDBInterface):
             return False
 
 
+        scope_columns_sql, scope_values_sql = self.get_scope_insert_sql(collection_name)
+
         async with self.db_client() as session:
             async with session.begin():
                 insert_sql = sql_text(
-                    f'INSERT INTO {collection_name} '
-                    f'({PgVectorTableSchemaEnum.CHUNK_ID.value}, '
+                    f'INSERT INTO {self.get_table_name(collection_name)} '
+                    f'({scope_columns_sql}'
+                    f'{PgVectorTableSchemaEnum.CHUNK_ID.value}, '
                     f'{PgVectorTableSchemaEnum.TEXT.value}, '
                     f'{PgVectorTableSchemaEnum.VECTOR.value}, '
                     f'{PgVectorTableSchemaEnum.METADATA.value}) '
-                    f'VALUES (:chunk_id, :text, :vector, :metadata)'
+                    f'VALUES ({scope_values_sql}:chunk_id, :text, :vector, :metadata) '
+                    f'{self.upsert_clause(collection_name)}'
                 )
                 
                 metadata_json = json.dumps(metadata, ensure_ascii=False) if metadata is not None else '{}'
@@ -251,8 +772,9 @@ class PGVectorProvider(VectorDBInterface):
                 })
 
                 await session.commit()
-        
-        await self.create_vector_index(collection_name=collection_name)
+
+        self.collection_registry.add_rows(collection_name, 1)
+        await self.maybe_create_vector_index(collection_name=collection_name)
 
         return True
     
@@ -269,6 +791,99 @@ class PGVectorProvider(VectorDBInterface):
             self.logger.error("Vectors and record IDs must have the same length.")
             return False
 
+        if metadata is None:
+            metadata = [None] * len(texts)
+
+        if self.vector_pool is not None:
+            await self.copy_many(collection_name=collection_name, texts=texts, vectors=vectors,
+                                 metadata=metadata, record_ids=record_ids)
+        else:
+            await self.execute_insert_many(collection_name=collection_name, texts=texts, vectors=vectors,
+                                           metadata=metadata, record_ids=record_ids, batch_size=batch_size)
+
+        # upserts are counted as new rows, the estimate only has to err on the high side
+        self.collection_registry.add_rows(collection_name, len(record_ids))
+        await self.maybe_create_vector_index(collection_name=collection_name)
+
+        return True
+
+
+    async def maybe_create_vector_index(self, collection_name: str) -> bool:
+        if collection_name in self.bulk_loading_collections:
+            return False
+
+        # skip the index lookup and the COUNT(*) while the registry already knows the answer
+        state = self.collection_registry.get(collection_name)
+        if state is not None:
+            if state.is_indexed:
+                return False
+            if state.approx_rows is not None and state.approx_rows < self.index_threshold:
+                return False
+
+        return await self.create_vector_index(collection_name=collection_name)
+    
+        
+    async def copy_many(self, collection_name: str, texts: list, vectors: list,
+                        metadata: list, record_ids: list):
+        """
+        Streams the rows with binary COPY into a transaction scoped staging table, then
+        merges them into the collection so re-pushed chunks are still upserted.
+        """
+
+        columns = [
+            PgVectorTableSchemaEnum.CHUNK_ID.value,
+            PgVectorTableSchemaEnum.TEXT.value,
+            PgVectorTableSchemaEnum.VECTOR.value,
+            PgVectorTableSchemaEnum.METADATA.value,
+        ]
+        columns_sql = ", ".join(columns)
+
+        records = [
+            (
+                _record_id,
+                _text,
+                np.asarray(_vector, dtype=np.float32),
+                json.dumps(_metadata, ensure_ascii=False) if _metadata is not None else '{}'
+            )
+            for _text, _vector, _metadata, _record_id in zip(texts, vectors, metadata, record_ids)
+        ]
+
+        table_name = self.get_table_name(collection_name)
+        staging_table = f"{self.pgvector_table_prefix}_staging_{collection_name}"
+        scope_columns_sql, scope_values_sql = self.get_scope_insert_sql(collection_name)
+
+        async with self.vector_pool.acquire() as connection:
+            async with connection.transaction():
+                # only the copied columns: a shared table's NOT NULL scope columns are filled by the merge
+                await connection.execute(
+                    f'CREATE TEMP TABLE {staging_table} ('
+                        f'{PgVectorTableSchemaEnum.CHUNK_ID.value} integer, '
+                        f'{PgVectorTableSchemaEnum.TEXT.value} text, '
+                        f'{PgVectorTableSchemaEnum.VECTOR.value} vector, '
+                        f'{PgVectorTableSchemaEnum.METADATA.value} jsonb'
+                    ') ON COMMIT DROP'
+                )
+
+                await connection.copy_records_to_table(
+                    staging_table,
+                    records=records,
+                    columns=columns
+                )
+
+                # DISTINCT ON keeps one row per chunk, ON CONFLICT cannot touch a row twice
+                await connection.execute(
+                    f'INSERT INTO {table_name} ({scope_columns_sql}{columns_sql}) '
+                    f'SELECT DISTINCT ON ({PgVectorTableSchemaEnum.CHUNK_ID.value}) {scope_values_sql}{columns_sql} '
+                    f'FROM {staging_table} '
+                    f'ORDER BY {PgVectorTableSchemaEnum.CHUNK_ID.value} '
+                    f'{self.upsert_clause(collection_name)}'
+                )
+
+
+    async def execute_insert_many(self, collection_name: str, texts: list, vectors: list,
+                                  metadata: list, record_ids: list, batch_size: int = 50):
+        scope_columns_sql, scope_values_sql = self.get_scope_insert_sql(collection_name)
+
         async with self.db_client() as session:
             async with session.begin():
                 for i in range(0, len(texts), batch_size):
@@ -294,41 +909,487 @@ class PGVectorProvider(VectorDBInterface):
 
                     
                     batch_insert_sql = sql_text(
-                        f'INSERT INTO {collection_name} '
-                        f'({PgVectorTableSchemaEnum.CHUNK_ID.value}, '
+                        f'INSERT INTO {self.get_table_name(collection_name)} '
+                        f'({scope_columns_sql}'
+                        f'{PgVectorTableSchemaEnum.CHUNK_ID.value}, '
                         f'{PgVectorTableSchemaEnum.TEXT.value}, '
                         f'{PgVectorTableSchemaEnum.VECTOR.value}, '
                         f'{PgVectorTableSchemaEnum.METADATA.value}) '
-                        f'VALUES (:chunk_id, :text, :vector, :metadata)'
+                        f'VALUES ({scope_values_sql}:chunk_id, :text, :vector, :metadata) '
+                        f'{self.upsert_clause(collection_name)}'
                     )
 
                     await session.execute(batch_insert_sql, values)
-                    
-        await self.create_vector_index(collection_name=collection_name)
 
-        return True
-    
+
+    async def delete_by_record_ids(self, collection_name: str, record_ids: list):
         
+        if not record_ids or not await self.is_collection_exists(collection_name):
+            return False
+
+        async with self.db_client() as session:
+            async with session.begin():
+                where_sql = self.combine_conditions(
+                    self.get_scope_sql(collection_name),
+                    f'{PgVectorTableSchemaEnum.CHUNK_ID.value} = ANY(:record_ids)'
+                )
+                delete_sql = sql_text(
+                    f'DELETE FROM {self.get_table_name(collection_name)} '
+                    f'WHERE {where_sql}'
+                )
+                await session.execute(delete_sql, {'record_ids': list(record_ids)})
+                await session.commit()
+
+        self.collection_registry.add_rows(collection_name, -len(record_ids))
+        return True
+
+
+    def build_filter_clause(self, filters: list, placeholder, first_index: int = 0):
+        """
+        Translates metadata filters ({"field", "op", "value"}, ANDed together) into a
+        WHERE clause and its parameters. Equality and `in` are expressed as jsonb
+        containment so the GIN index on metadata can serve them.
+        """
+        metadata_column = PgVectorTableSchemaEnum.METADATA.value
+        conditions, params = [], []
+
+        def bind(value):
+            params.append(value)
+            return placeholder(first_index + len(params) - 1)
+
+        containment = {}
+        for search_filter in filters or []:
+            field, value = search_filter["field"], search_filter.get("value")
+            operator = search_filter.get("op") or FilterOperatorEnum.EQ.value
+
+            if operator == FilterOperatorEnum.EQ.value:
+                containment[field] = value
+
+            elif operator == FilterOperatorEnum.IN.value:
+                values = value if isinstance(value, list) else [value]
+                if not values:
+                    conditions.append('FALSE')
+                    continue
+
+                conditions.append('(' + ' OR '.join(
+                    f'{metadata_column} @> CAST({bind(json.dumps({field: v}))} AS jsonb)'
+                    for v in values
+                ) + ')')
+
+            else:
+                # jsonb orders across types too, so compare only values of the same type
+                sql_operator = self.filter_range_operators[operator]
+                field_sql, value_sql = f'CAST({bind(field)} AS text)', bind(json.dumps(value))
+                conditions.append(
+                    f'({metadata_column} -> {field_sql} {sql_operator} CAST({value_sql} AS jsonb) '
+                    f'AND jsonb_typeof({metadata_column} -> {field_sql}) = jsonb_typeof(CAST({value_sql} AS jsonb)))'
+                )
+
+        if containment:
+            conditions.insert(0, f'{metadata_column} @> CAST({bind(json.dumps(containment))} AS jsonb)')
+
+        return ' AND '.join(conditions), params
+
+    def get_nearest_sql(self, collection_name: str, state, columns_sql: str,
+                        vector: str, limit: str, where_sql: str = None) -> str:
+        """
+        SELECT of `columns_sql` and the full precision `distance` of the `limit` rows
+        nearest to `vector`, in index order. Over a binary index `limit` times the
+        oversampling candidates are read by Hamming distance and the best `limit` of
+        them kept by their distance to the stored float vectors.
+        """
+        distance_sql = f'{PgVectorTableSchemaEnum.VECTOR.value} {self.distance_operator} CAST({vector} AS vector)'
+
+        # ordering by the raw index expression is what lets the planner use the index
+        nearest_sql = (
+            f'SELECT {columns_sql}, {distance_sql} AS distance '
+            f'FROM {self.get_table_name(collection_name)} '
+            f'{"WHERE " + where_sql + " " if where_sql else ""}'
+            f'ORDER BY {self.get_order_sql(state, vector)} '
+        )
+
+        if self.get_quantization(state) == VectorQuantizationEnum.BINARY.value:
+            # the oversampling may be fractional, LIMIT only takes an integer
+            candidates_sql = f'CAST(CEIL(CAST({limit} AS integer) * {self.quantization_oversampling}) AS integer)'
+            return (
+                f'SELECT * FROM ({nearest_sql}LIMIT {candidates_sql}) AS quantized '
+                f'ORDER BY distance LIMIT {limit}'
+            )
+
+        return f'{nearest_sql}LIMIT {limit}'
+
+    def get_score_sql(self, distance: str = 'distance') -> str:
+        if self.distance_operator == PgVectorDistanceOperatorEnum.DOT.value:
+            # <#> returns the negative inner product
+            return f'-{distance}'
+        return f'1 - {distance}'
+
+    def get_search_statement(self, collection_name: str, state, filter_sql: str = None) -> str:
+        # cached with the quantization it was built for, another process may rebuild the index
+        quantization = self.get_quantization(state)
+        cached = self.search_statements.get(collection_name) if not filter_sql else None
+        if cached is not None and cached[0] == quantization:
+            return cached[1]
+
+        where_sql = self.combine_conditions(self.get_scope_sql(collection_name), filter_sql)
+        nearest_sql = self.get_nearest_sql(collection_name, state,
+                                           columns_sql=f'{PgVectorTableSchemaEnum.TEXT.value} AS text',
+                                           vector='$1', limit='$2', where_sql=where_sql)
+
+        # halfvec and relaxed iterative scans return candidates slightly out of order
+        statement = (
+            f'SELECT text, {self.get_score_sql()} AS score '
+            f'FROM ({nearest_sql}) AS candidates ORDER BY distance'
+        )
+
+        if not filter_sql:
+            self.search_statements[collection_name] = (quantization, statement)
+
+        return statement
+
+    def get_search_settings(self, state, limit: int, accuracy: str = None, is_filtered: bool = False) -> list:
+        """
+        Returns the SET statements that tune the collection's index for this search.
+        Both index types are always tuned, a search without an accuracy is a balanced
+        one: ef_search is VECTOR_DB_HNSW_EF_SEARCH, not the server's default, and IVFFlat
+        needs probes since the default is 1. Filtered searches, and HNSW searches that
+        need more candidates than pgvector's maximum ef_search, enable the iterative scan
+        so the index keeps producing candidates until the query has enough.
+        """
+        if state is None or not state.is_indexed:
+            return []
+
+        search_settings = []
+        needs_iterative_scan = is_filtered
+
+        if state.index_type == PgVectorIndexTypeEnum.IVFFLAT.value:
+            lists = state.index_params.get("lists") or 1
+            probes = max(1, round(math.sqrt(lists)))
+            accuracy = SearchAccuracyEnum(accuracy or SearchAccuracyEnum.BALANCED.value)
+            search_settings.append(f'SET ivfflat.probes = {min(lists, accuracy.scale(probes))}')
+
+        elif state.index_type == PgVectorIndexTypeEnum.HNSW.value:
+            # fewer candidates than the query reads from the index would truncate the result
+            candidates = limit
+            if self.get_quantization(state) == VectorQuantizationEnum.BINARY.value:
+                candidates = math.ceil(limit * self.quantization_oversampling)
+
+            accuracy = SearchAccuracyEnum(accuracy or SearchAccuracyEnum.BALANCED.value)
+            ef_search = max(candidates, accuracy.scale(self.hnsw_ef_search))
+
+            if candidates > self.hnsw_max_ef_search:
+                if self.iterative_scan:
+                    needs_iterative_scan = True
+                else:
+                    self.logger.warning(
+                        f"Searching for {candidates} candidates is above pgvector's maximum ef_search of "
+                        f"{self.hnsw_max_ef_search} and the iterative scan is off, results may be truncated."
+                    )
+
+            search_settings.append(f'SET hnsw.ef_search = {min(ef_search, self.hnsw_max_ef_search)}')
+
+        if needs_iterative_scan and self.iterative_scan and state.index_type in self.iterative_scan_settings:
+            search_settings.append(f'SET {self.iterative_scan_settings[state.index_type]} = {self.iterative_scan}')
+
+        return search_settings
+
     async def search_by_vector(self, collection_name: str, vector: list, 
-                        limit: int = 10) -> List[RetrievedDocuments]:
+                        limit: int = 10, accuracy: str = None,
+                        filters: list = None) -> List[RetrievedDocuments]:
 
-        is_collection_exists = await self.is_collection_exists(collection_name)
+        state = await self.get_collection_state(collection_name)
         
-        if not is_collection_exists:
+        if state is None:
             self.logger.error(f"Collection {collection_name} does not exist.")
             return []
 
+        # rows of a collection sharing its table are a filtered search as well
+        search_settings = self.get_search_settings(state=state, limit=limit, accuracy=accuracy,
+                                                   is_filtered=bool(filters or self.get_scope_columns(collection_name)))
+
+        if self.vector_pool is None:
+            return await self.execute_search_by_vector(collection_name=collection_name, state=state, vector=vector,
+                                                       limit=limit, search_settings=search_settings,
+                                                       filters=filters)
+
+        # $1 and $2 are the vector and the limit
+        filter_sql, filter_params = self.build_filter_clause(
+            filters=filters,
+            placeholder=lambda i: f'${i}',
+            first_index=3
+        )
+
+        try:
+            async with self.vector_pool.acquire() as connection:
+                # session level, the pool runs RESET ALL when the connection is released
+                if search_settings:
+                    await connection.execute('; '.join(search_settings))
+
+                # the statement text is stable per collection, so asyncpg reuses its prepared
+                # statement and the search is a single bind/execute round trip
+                records = await connection.fetch(
+                    self.get_search_statement(collection_name, state, filter_sql=filter_sql),
+                    np.asarray(vector, dtype=np.float32),
+                    limit,
+                    *filter_params
+                )
+        except asyncpg.exceptions.UndefinedTableError:
+            # dropped by another process since it was registered
+            self.collection_registry.invalidate(collection_name)
+            self.search_statements.pop(collection_name, None)
+            self.logger.error(f"Collection {collection_name} does not exist.")
+            return []
+
+        return [
+            RetrievedDocuments(
+                text=record["text"],
+                score=record["score"]
+            )
+            for record in records
+        ]
+
+    def get_batch_search_statement(self, collection_name: str, state, vectors: str,
+                                   limit: str, filter_sql: str = None) -> str:
+        """
+        One nearest neighbour search per element of the `vectors` array, run as a LATERAL
+        subquery so every query still walks the index. Rows come back grouped by the
+        1-based `query_index` of their query.
+        """
+        where_sql = self.combine_conditions(self.get_scope_sql(collection_name), filter_sql)
+        nearest_sql = self.get_nearest_sql(collection_name, state,
+                                           columns_sql=f'{PgVectorTableSchemaEnum.TEXT.value} AS text',
+                                           vector='queries.query_vector', limit=limit, where_sql=where_sql)
+
+        return (
+            f'SELECT queries.query_index, matches.text, {self.get_score_sql("matches.distance")} AS score '
+            f'FROM unnest({vectors}) WITH ORDINALITY AS queries(query_vector, query_index) '
+            f'CROSS JOIN LATERAL ({nearest_sql}) AS matches '
+            'ORDER BY queries.query_index, matches.distance'
+        )
+
+    async def search_by_vectors(self, collection_name: str, vectors: list,
+                                limit: int = 10, accuracy: str = None,
+                                filters: list = None) -> List[List[RetrievedDocuments]]:
+
+        state = await self.get_collection_state(collection_name)
+
+        if state is None:
+            self.logger.error(f"Collection {collection_name} does not exist.")
+            return []
+
+        if not vectors:
+            return []
+
+        search_settings = self.get_search_settings(state=state, limit=limit, accuracy=accuracy,
+                                                   is_filtered=bool(filters or self.get_scope_columns(collection_name)))
+
+        if self.vector_pool is None:
+            placeholder = lambda i: f':batch_{i}'
+            filter_sql, filter_params = self.build_filter_clause(filters=filters, placeholder=placeholder,
+                                                                 first_index=1)
+            # text vectors, the SQLAlchemy connections have no vector codec
+            params = [["[" + ",".join([str(v) for v in vector]) + "]" for vector in vectors], *filter_params]
+
+            async with self.db_client() as session:
+                async with session.begin():
+                    for search_setting in search_settings:
+                        await session.execute(sql_text(search_setting.replace("SET ", "SET LOCAL ", 1)))
+
+                    result = await session.execute(
+                        sql_text(self.get_batch_search_statement(collection_name, state,
+                                                                 vectors='CAST(:batch_0 AS text[])',
+                                                                 limit=str(int(limit)), filter_sql=filter_sql)),
+                        {f"batch_{i}": param for i, param in enumerate(params)}
+                    )
+                    records = result.mappings().all()
+        else:
+            # $1 and $2 are the vectors and the limit
+            filter_sql, filter_params = self.build_filter_clause(
+                filters=filters,
+                placeholder=lambda i: f'${i}',
+                first_index=3
+            )
+
+            try:
+                async with self.vector_pool.acquire() as connection:
+                    if search_settings:
+                        await connection.execute('; '.join(search_settings))
+
+                    records = await connection.fetch(
+                        self.get_batch_search_statement(collection_name, state, vectors='CAST($1 AS vector[])',
+                                                        limit='$2', filter_sql=filter_sql),
+                        [np.asarray(vector, dtype=np.float32) for vector in vectors],
+                        limit,
+                        *filter_params
+                    )
+            except asyncpg.exceptions.UndefinedTableError:
+                self.collection_registry.invalidate(collection_name)
+                self.logger.error(f"Collection {collection_name} does not exist.")
+                return []
+
+        results = [[] for _ in vectors]
+        for record in records:
+            results[record["query_index"] - 1].append(
+                RetrievedDocuments(
+                    text=record["text"],
+                    score=record["score"]
+                )
+            )
+
+        return results
+
+    def get_hybrid_statement(self, collection_name: str, state, placeholder, filter_sql: str = None) -> str:
+        """
+        Vector and lexical candidates ranked side by side in one statement, then fused
+        with reciprocal rank fusion: score = sum(1 / (k + rank)) over both rankings.
+        The lexical side is a GIN bitmap scan on the tsvector column.
+        Parameters: vector, limit, query text, candidates per ranking, rrf k, filters.
+        """
+        quantization = self.get_quantization(state)
+        cached = self.hybrid_statements.get(collection_name) if not filter_sql else None
+        if cached is not None and cached[0] == quantization:
+            return cached[1]
+
+        id_column = PgVectorTableSchemaEnum.ID.value
+        text_search_column = PgVectorTableSchemaEnum.TEXT_SEARCH.value
+        vector, limit, query_text, candidates, rrf_k = [placeholder(i) for i in range(5)]
+        table_name = self.get_table_name(collection_name)
+        where_sql = self.combine_conditions(self.get_scope_sql(collection_name), filter_sql)
+        where_and = f'AND {where_sql} ' if where_sql else ''
+        join_scope_sql = self.get_scope_sql(collection_name, alias='c')
+
+        statement = (
+            'WITH vector_matches AS ('
+                f'SELECT {id_column}, ROW_NUMBER() OVER (ORDER BY distance) AS rank FROM ('
+                    f'{self.get_nearest_sql(collection_name, state, id_column, vector, candidates, where_sql)}'
+                ') AS candidates'
+            '), '
+            'lexical_matches AS ('
+                f'SELECT {id_column}, ROW_NUMBER() OVER (ORDER BY lexical_score DESC) AS rank FROM ('
+                    f'SELECT {id_column}, ts_rank_cd({text_search_column}, query) AS lexical_score '
+                    f'FROM {table_name}, '
+                    f'websearch_to_tsquery(\'{self.text_search_config}\', CAST({query_text} AS text)) AS query '
+                    f'WHERE {text_search_column} @@ query '
+                    f'{where_and}'
+                    'ORDER BY lexical_score DESC '
+                    f'LIMIT {candidates}'
+                ') AS candidates'
+            ') '
+            f'SELECT c.{PgVectorTableSchemaEnum.TEXT.value} AS text, CAST('
+                f'COALESCE(1.0 / (CAST({rrf_k} AS integer) + v.rank), 0) + '
+                f'COALESCE(1.0 / (CAST({rrf_k} AS integer) + l.rank), 0) '
+            'AS double precision) AS score '
+            f'FROM vector_matches v FULL OUTER JOIN lexical_matches l ON v.{id_column} = l.{id_column} '
+            f'JOIN {table_name} c ON c.{id_column} = COALESCE(v.{id_column}, l.{id_column}) '
+            f'{"AND " + join_scope_sql + " " if join_scope_sql else ""}'
+            'ORDER BY score DESC '
+            f'LIMIT {limit}'
+        )
+
+        if not filter_sql:
+            self.hybrid_statements[collection_name] = (quantization, statement)
+
+        return statement
+
+    async def search_hybrid(self, collection_name: str, vector: list, text: str,
+                            limit: int = 10, accuracy: str = None,
+                            filters: list = None) -> List[RetrievedDocuments]:
+
+        state = await self.get_collection_state(collection_name)
+
+        if state is None:
+            self.logger.error(f"Collection {collection_name} does not exist.")
+            return []
+
+        if not state.has_text_index:
+            # the column is added by migrate_text_search.py
+            self.logger.warning(f"Collection {collection_name} has no text search column, using vector search.")
+            return await self.search_by_vector(collection_name=collection_name, vector=vector,
+                                               limit=limit, accuracy=accuracy, filters=filters)
+
+        candidates = max(limit, self.hybrid_candidates)
+        search_settings = self.get_search_settings(state=state, limit=candidates, accuracy=accuracy,
+                                                   is_filtered=bool(filters or self.get_scope_columns(collection_name)))
+
+        if self.vector_pool is None:
+            placeholder = lambda i: f':hybrid_{i}'
+            filter_sql, filter_params = self.build_filter_clause(filters=filters, placeholder=placeholder,
+                                                                 first_index=5)
+            vector = "[" + ",".join([str(v) for v in vector]) + "]"
+            params = [vector, limit, text, candidates, self.hybrid_rrf_k, *filter_params]
+
+            async with self.db_client() as session:
+                async with session.begin():
+                    for search_setting in search_settings:
+                        await session.execute(sql_text(search_setting.replace("SET ", "SET LOCAL ", 1)))
+
+                    result = await session.execute(
+                        sql_text(self.get_hybrid_statement(collection_name, state, placeholder, filter_sql=filter_sql)),
+                        {f"hybrid_{i}": param for i, param in enumerate(params)}
+                    )
+                    records = result.mappings().all()
+        else:
+            placeholder = lambda i: f'${i + 1}'
+            filter_sql, filter_params = self.build_filter_clause(filters=filters, placeholder=placeholder,
+                                                                 first_index=5)
+
+            try:
+                async with self.vector_pool.acquire() as connection:
+                    if search_settings:
+                        await connection.execute('; '.join(search_settings))
+
+                    records = await connection.fetch(
+                        self.get_hybrid_statement(collection_name, state, placeholder, filter_sql=filter_sql),
+                        np.asarray(vector, dtype=np.float32),
+                        limit,
+                        text,
+                        candidates,
+                        self.hybrid_rrf_k,
+                        *filter_params
+                    )
+            except asyncpg.exceptions.UndefinedTableError:
+                self.collection_registry.invalidate(collection_name)
+                self.hybrid_statements.pop(collection_name, None)
+                self.logger.error(f"Collection {collection_name} does not exist.")
+                return []
+
+        return [
+            RetrievedDocuments(
+                text=record["text"],
+                score=record["score"]
+            )
+            for record in records
+        ]
+
+    async def execute_search_by_vector(self, collection_name: str, state, vector: list,
+                                       limit: int = 10, search_settings: list = None,
+                                       filters: list = None) -> List[RetrievedDocuments]:
+
         vector = "[" + ",".join([str(v) for v in vector]) + "]"
 
+        filter_sql, filter_params = self.build_filter_clause(
+            filters=filters,
+            placeholder=lambda i: f':filter_{i}'
+        )
+
         async with self.db_client() as session:
             async with session.begin():
-                search_sql = sql_text(f'SELECT {PgVectorTableSchemaEnum.TEXT.value} as text, 1 - ({PgVectorTableSchemaEnum.VECTOR.value} <=> :vector) as score'
-                        f' FROM {collection_name}'
-                        ' ORDER BY score DESC '
-                        f'LIMIT {limit}'
-                        )
+                for search_setting in search_settings or []:
+                    await session.execute(sql_text(search_setting.replace("SET ", "SET LOCAL ", 1)))
 
-                result = await session.execute(search_sql, {"vector": vector})
+                where_sql = self.combine_conditions(self.get_scope_sql(collection_name), filter_sql)
+
+                nearest_sql = self.get_nearest_sql(collection_name, state,
+                                                   columns_sql=f'{PgVectorTableSchemaEnum.TEXT.value} AS text',
+                                                   vector=':vector', limit=str(int(limit)), where_sql=where_sql)
+
+                search_sql = sql_text(f'SELECT text, {self.get_score_sql()} AS score '
+                                      f'FROM ({nearest_sql}) AS candidates ORDER BY distance')
+
+                result = await session.execute(search_sql, {
+                    "vector": vector,
+                    **{f"filter_{i}": param for i, param in enumerate(filter_params)}
+                })
 
                 records = result.fetchall()
 
@@ -338,4 +1399,4 @@ class PGVectorProvider(VectorDBInterface):
                         score=record.score
                     )
                     for record in records
-                ]
\ No newline at end of file
+                ]
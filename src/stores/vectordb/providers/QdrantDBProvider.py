@@ -1,6 +1,10 @@
-from qdrant_client import models, QdrantClient
+import asyncio
+from qdrant_client import models, AsyncQdrantClient
 from ..VectorDBInterface import VectorDBInterface
-from ..VectorDBEnum import DistanceMethodEnum
+from ..CollectionRegistry import CollectionRegistry
+from ..SparseTextEncoder import SparseTextEncoder
+from ..VectorDBEnum import (DistanceMethodEnum, SearchAccuracyEnum, FilterOperatorEnum,
+                            VectorQuantizationEnum)
 import logging
 from typing import List
 from models.db_schemes import RetrievedDocuments
@@ -9,41 +13,140 @@ from models.db_schemes import RetrievedDocuments
 class QdrantDBProvider(VectorDBInterface):
     def __init__(self, db_client, 
                 distance_method: str = None, 
-                default_vector_size: int = 786, index_threshold: int = 100):
+                default_vector_size: int = 786, index_threshold: int = 100,
+                collection_cache_ttl: float = 60,
+                hnsw_m: int = 16, hnsw_ef_construction: int = 100, hnsw_ef_search: int = None,
+                filterable_fields: dict = None, hybrid_candidates: int = 50,
+                quantization: str = VectorQuantizationEnum.NONE.value, quantization_oversampling: float = 4,
+                url: str = None, api_key: str = None, prefer_grpc: bool = False, grpc_port: int = 6334,
+                upload_batch_size: int = 64, upload_parallel: int = 1):
         
         self.db_client = None
         self.db_client = db_client
+
+        # a Qdrant server when `url` is set, the local on-disk mode at `db_client` otherwise
+        self.url = url
+        self.api_key = api_key or None
+        self.prefer_grpc = prefer_grpc
+        self.grpc_port = grpc_port
+
+        # upload_points splits inserts into batches sent by `upload_parallel` processes
+        self.upload_batch_size = max(1, upload_batch_size)
+        self.upload_parallel = max(1, upload_parallel)
         self.distance_method = None
         self.default_vector_size = default_vector_size
         self.index_threshold = index_threshold
 
+        # Qdrant's default, restored after a bulk load when the collection had no threshold of its own
+        self.indexing_threshold = 20000
+
+        # collection name -> [bulk loads in progress, indexing threshold to restore after them]
+        self.bulk_loading_collections = {}
+
+        # HNSW parameters of new collections, ef_search defaults to Qdrant's own choice
+        self.hnsw_m = hnsw_m
+        self.hnsw_ef_construction = hnsw_ef_construction
+        self.hnsw_ef_search = hnsw_ef_search
+
+        # quantization of new collections; quantized vectors are kept in RAM, the originals
+        # on disk for rescoring the oversampled candidates
+        self.quantization = VectorQuantizationEnum(quantization or VectorQuantizationEnum.NONE.value).value
+        self.quantization_oversampling = max(1.0, float(quantization_oversampling))
+
+        # metadata field -> payload schema type ("integer", "keyword", ...) to index for filters
+        self.filterable_fields = filterable_fields or {}
+
+        # collections whose payload indexes were verified by this process
+        self.payload_indexed_collections = set()
+
+        # lexical side of hybrid search: a hashed BM25-style sparse vector per point
+        self.sparse_vector_name = "text"
+        self.sparse_encoder = SparseTextEncoder()
+        self.hybrid_candidates = hybrid_candidates
+
+        # existence, dimension, index state and size of known collections
+        self.collection_registry = CollectionRegistry(ttl=collection_cache_ttl)
+
         
         if distance_method == DistanceMethodEnum.COSINE.value:
             self.distance_method = models.Distance.COSINE
         elif distance_method == DistanceMethodEnum.DOT.value:
             self.distance_method = models.Distance.DOT
         
-        self.logger = logging.getLogger("Uvicorn")
+        self.logger = logging.getLogger("uvicorn.error")
 
     async def connect(self):
-        self.client = QdrantClient(path=self.db_client)
+        if self.url:
+            self.client = AsyncQdrantClient(url=self.url, api_key=self.api_key,
+                                            prefer_grpc=self.prefer_grpc, grpc_port=self.grpc_port)
+        else:
+            self.client = AsyncQdrantClient(path=self.db_client)
 
     async def disconnect(self):
+        if self.client is not None:
+            await self.client.close()
         self.client = None
+        self.collection_registry.clear()
 
     async def is_collection_exists(self, collection_name: str) -> bool:
-        return self.client.collection_exists(collection_name=collection_name)
+        return await self.get_collection_state(collection_name) is not None
+
+    async def get_collection_state(self, collection_name: str):
+        state = self.collection_registry.get(collection_name)
+        if state is not None:
+            return state
+
+        if not await self.client.collection_exists(collection_name=collection_name):
+            return None
+
+        collection_info = await self.client.get_collection(collection_name=collection_name)
+        vectors_config = collection_info.config.params.vectors
+
+        return self.collection_registry.register(
+            collection_name,
+            dimension=getattr(vectors_config, "size", None),
+            is_indexed=bool(collection_info.indexed_vectors_count),
+            approx_rows=collection_info.points_count,
+            index_type="hnsw",
+            index_params={
+                "m": collection_info.config.hnsw_config.m,
+                "ef_construct": collection_info.config.hnsw_config.ef_construct,
+            },
+            has_text_index=self.sparse_vector_name in (collection_info.config.params.sparse_vectors or {}),
+            quantization=self.parse_quantization_config(collection_info.config.quantization_config),
+        )
+
+    def get_quantization_config(self, quantization: str):
+        # Qdrant has no half precision quantization, halfvec maps to int8 scalar (4x smaller)
+        if quantization == VectorQuantizationEnum.HALFVEC.value:
+            return models.ScalarQuantization(
+                scalar=models.ScalarQuantizationConfig(type=models.ScalarType.INT8, quantile=0.99, always_ram=True)
+            )
+
+        if quantization == VectorQuantizationEnum.BINARY.value:
+            return models.BinaryQuantization(binary=models.BinaryQuantizationConfig(always_ram=True))
+
+        return None
+
+    def parse_quantization_config(self, quantization_config) -> str:
+        if isinstance(quantization_config, models.ScalarQuantization):
+            return VectorQuantizationEnum.HALFVEC.value
+        if isinstance(quantization_config, models.BinaryQuantization):
+            return VectorQuantizationEnum.BINARY.value
+        return VectorQuantizationEnum.NONE.value
     
     async def list_all_collections(self) -> List:
-        return self.client.get_collections()
+        return await self.client.get_collections()
     
     async def get_collection_info(self, collection_name: str) -> dict:
-        return self.client.get_collection(collection_name=collection_name)
+        return await self.client.get_collection(collection_name=collection_name)
     
     async def delete_collection(self, collection_name: str):
         if await self.is_collection_exists(collection_name):
             self.logger.info(f"Deleting collection: {collection_name}")
-            return self.client.delete_collection(collection_name=collection_name)
+            self.collection_registry.invalidate(collection_name)
+            self.payload_indexed_collections.discard(collection_name)
+            return await self.client.delete_collection(collection_name=collection_name)
         
     async def create_collection(self, collection_name: str, 
                                 embedding_size: int,
@@ -54,33 +157,86 @@ class QdrantDBProvider(VectorDBInterface):
         if not await self.is_collection_exists(collection_name):
             self.logger.info(f"Creating new Qdrant collection: {collection_name}")
             
-            _ = self.client.create_collection(
+            _ = await self.client.create_collection(
                 collection_name=collection_name,
                 vectors_config=models.VectorParams(
                     size=embedding_size,
-                    distance=self.distance_method
-                )
+                    distance=self.distance_method,
+                    # the full vectors are only read to rescore candidates
+                    on_disk=self.quantization != VectorQuantizationEnum.NONE.value
+                ),
+                quantization_config=self.get_quantization_config(self.quantization),
+                hnsw_config=models.HnswConfigDiff(
+                    m=self.hnsw_m,
+                    ef_construct=self.hnsw_ef_construction
+                ),
+                sparse_vectors_config={
+                    # Qdrant applies the IDF part of BM25 at query time
+                    self.sparse_vector_name: models.SparseVectorParams(modifier=models.Modifier.IDF)
+                }
             )
 
+            await self.create_payload_indexes(collection_name=collection_name)
+
+            self.collection_registry.register(collection_name, dimension=embedding_size,
+                                              is_indexed=False, approx_rows=0, index_type="hnsw",
+                                              index_params={"m": self.hnsw_m,
+                                                            "ef_construct": self.hnsw_ef_construction},
+                                              has_text_index=True, quantization=self.quantization)
             return True
+
+        # collections created before a field was made filterable
+        await self.create_payload_indexes(collection_name=collection_name)
         
         return False
     
+    async def create_payload_indexes(self, collection_name: str):
+        # without a payload index Qdrant filters by loading every candidate's payload
+        if not self.filterable_fields or collection_name in self.payload_indexed_collections:
+            return
+
+        collection_info = await self.client.get_collection(collection_name=collection_name)
+        payload_schema = collection_info.payload_schema or {}
+
+        for field_name, field_schema in self.filterable_fields.items():
+            if f"metadata.{field_name}" in payload_schema:
+                continue
+
+            _ = await self.client.create_payload_index(
+                collection_name=collection_name,
+                field_name=f"metadata.{field_name}",
+                field_schema=models.PayloadSchemaType(field_schema)
+            )
+
+        self.payload_indexed_collections.add(collection_name)
+    
+    def get_point_vector(self, state, vector: list, text: str):
+        # collections created before hybrid search only have the unnamed dense vector
+        if state is None or not state.has_text_index:
+            return vector
+
+        indices, values = self.sparse_encoder.encode(text)
+        return {
+            "": vector,
+            self.sparse_vector_name: models.SparseVector(indices=indices, values=values)
+        }
+
     async def insert_one(self, collection_name: str, text: str, vector: list,
                          metadata: dict = None, 
                          record_id: str = None):
         
-        if not await self.is_collection_exists(collection_name):
+        state = await self.get_collection_state(collection_name)
+        if state is None:
             self.logger.error(f"Can not insert new record to non-existed collection: {collection_name}")
             return False
         
         try:
-            _ = self.client.upload_records(
+            _ = await self.client.upsert(
                 collection_name=collection_name,
-                records=[
-                    models.Record(
-                        id=[record_id],
-                        vector=vector,
+                points=[
+                    models.PointStruct(
+                        id=record_id,
+                        vector=self.get_point_vector(state, vector, text),
                         payload={
                             "text": text, "metadata": metadata
                         }
@@ -91,11 +247,12 @@ class QdrantDBProvider(VectorDBInterface):
             self.logger.error(f"Error while inserting batch: {e}")
             return False
 
+        self.collection_registry.add_rows(collection_name, 1)
         return True
     
     async def insert_many(self, collection_name: str, texts: list, 
                           vectors: list, metadata: list = None, 
-                          record_ids: list = None, batch_size: int = 50):
+                          record_ids: list = None, batch_size: int = None):
         
         if metadata is None:
             metadata = [None] * len(texts)
@@ -103,51 +260,253 @@ class QdrantDBProvider(VectorDBInterface):
         if record_ids is None:
             record_ids = list(range(0, len(texts)))
 
-        for i in range(0, len(texts), batch_size):
-            batch_end = i + batch_size
-
-            batch_texts = texts[i:batch_end]
-            batch_vectors = vectors[i:batch_end]
-            batch_metadata = metadata[i:batch_end]
-            batch_record_ids = record_ids[i:batch_end]
-
-            batch_records = [
-                models.Record(
-                    id=batch_record_ids[x],
-                    vector=batch_vectors[x],
-                    payload={
-                        "text": batch_texts[x], "metadata": batch_metadata[x]
-                    }
-                )
+        state = await self.get_collection_state(collection_name)
 
-                for x in range(len(batch_texts))
-            ]
+        points = [
+            models.PointStruct(
+                id=record_ids[x],
+                vector=self.get_point_vector(state, vectors[x], texts[x]),
+                payload={
+                    "text": texts[x], "metadata": metadata[x]
+                }
+            )
 
-            try:
-                _ = self.client.upload_records(
-                    collection_name=collection_name,
-                    records=batch_records,
-                )
-            except Exception as e:
-                self.logger.error(f"Error while inserting batch: {e}")
-                return False
+            for x in range(len(texts))
+        ]
+
+        upload_kwargs = {
+            "collection_name": collection_name,
+            "points": points,
+            "batch_size": batch_size or self.upload_batch_size,
+            "parallel": self.upload_parallel,
+            "wait": True,
+        }
+
+        try:
+            if self.url:
+                # upload_points is blocking even on the async client, it drives its own
+                # (multi-process when parallel > 1) uploaders
+                await asyncio.to_thread(self.client.upload_points, **upload_kwargs)
+            else:
+                # the local mode is in-process state, it is not safe to mutate from a thread
+                self.client.upload_points(**upload_kwargs)
+        except Exception as e:
+            self.logger.error(f"Error while inserting batch: {e}")
+            return False
+
+        self.collection_registry.add_rows(collection_name, len(texts))
+        return True
+        
+    async def begin_bulk_load(self, collection_name: str, expected_rows: int = None):
+        # with indexing_threshold=0 Qdrant stores the points but defers building HNSW
+        if not await self.is_collection_exists(collection_name):
+            return False
+
+        bulk_load = self.bulk_loading_collections.get(collection_name)
+        if bulk_load is not None:
+            bulk_load[0] += 1
+            return False
+
+        collection_info = await self.client.get_collection(collection_name=collection_name)
+        indexing_threshold = collection_info.config.optimizer_config.indexing_threshold
+
+        # 0 is what a load that never ended left behind, not a value to restore
+        self.bulk_loading_collections[collection_name] = [1, indexing_threshold or self.indexing_threshold]
+
+        _ = await self.client.update_collection(
+            collection_name=collection_name,
+            optimizers_config=models.OptimizersConfigDiff(indexing_threshold=0)
+        )
 
         return True
+
+    async def end_bulk_load(self, collection_name: str):
+        bulk_load = self.bulk_loading_collections.get(collection_name)
+        if bulk_load is None:
+            return False
+
+        bulk_load[0] -= 1
+        if bulk_load[0] > 0:
+            # another push is still loading, the last one to finish restores the threshold
+            return False
+
+        self.bulk_loading_collections.pop(collection_name, None)
+
+        if not await self.is_collection_exists(collection_name):
+            return False
+
+        _ = await self.client.update_collection(
+            collection_name=collection_name,
+            optimizers_config=models.OptimizersConfigDiff(indexing_threshold=bulk_load[1])
+        )
+
+        return True
+
+    async def delete_by_record_ids(self, collection_name: str, record_ids: list):
         
-    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 5): 
-        result = self.client.search(
+        if not record_ids or not await self.is_collection_exists(collection_name):
+            return False
+
+        try:
+            _ = await self.client.delete(
+                collection_name=collection_name,
+                points_selector=models.PointIdsList(points=record_ids)
+            )
+        except Exception as e:
+            self.logger.error(f"Error while deleting records: {e}")
+            return False
+
+        self.collection_registry.add_rows(collection_name, -len(record_ids))
+        return True
+
+    def get_search_params(self, limit: int, accuracy: str = None, state=None):
+        quantization_params = None
+        if state is not None and state.quantization not in (None, VectorQuantizationEnum.NONE.value):
+            # read `oversampling` times more quantized candidates, rescore them on the originals
+            quantization_params = models.QuantizationSearchParams(
+                rescore=True,
+                oversampling=self.quantization_oversampling
+            )
+
+        if accuracy is None:
+            if self.hnsw_ef_search is None:
+                return models.SearchParams(quantization=quantization_params) if quantization_params else None
+            return models.SearchParams(hnsw_ef=max(limit, self.hnsw_ef_search), quantization=quantization_params)
+
+        # scale from the configured ef, or from Qdrant's default of ef_construct
+        ef_search = SearchAccuracyEnum(accuracy).scale(self.hnsw_ef_search or self.hnsw_ef_construction)
+        return models.SearchParams(hnsw_ef=max(limit, ef_search), quantization=quantization_params)
+
+    def build_filter(self, filters: list = None):
+        conditions = []
+        for search_filter in filters or []:
+            key = f"metadata.{search_filter['field']}"
+            value = search_filter.get("value")
+            operator = search_filter.get("op") or FilterOperatorEnum.EQ.value
+
+            if operator == FilterOperatorEnum.EQ.value:
+                condition = models.FieldCondition(key=key, match=models.MatchValue(value=value))
+            elif operator == FilterOperatorEnum.IN.value:
+                values = value if isinstance(value, list) else [value]
+                condition = models.FieldCondition(key=key, match=models.MatchAny(any=values))
+            else:
+                condition = models.FieldCondition(key=key, range=models.Range(**{operator: value}))
+
+            conditions.append(condition)
+
+        if not conditions:
+            return None
+
+        return models.Filter(must=conditions)
+
+    async def search_by_vector(self, collection_name: str, vector: list, limit: int = 5,
+                               accuracy: str = None, filters: list = None): 
+        state = await self.get_collection_state(collection_name)
+        if state is None:
+            self.logger.error(f"Collection {collection_name} does not exist.")
+            return None
+
+        result = await self.client.query_points(
             collection_name=collection_name,
-            query_vector=vector,
-            limit=limit
+            query=vector,
+            limit=limit,
+            search_params=self.get_search_params(limit=limit, accuracy=accuracy, state=state),
+            query_filter=self.build_filter(filters=filters),
+            with_payload=True
         )
 
-        if not result or len(result) == 0:
+        if not result.points:
             return None 
         
         return [
             RetrievedDocuments(**{
-                "text": record.payload.get("text", ""),
-                "score": record.score,
+                "text": point.payload.get("text", ""),
+                "score": point.score,
+             }
+            ) for point in result.points
+        ]
+
+    async def search_by_vectors(self, collection_name: str, vectors: list, limit: int = 5,
+                                accuracy: str = None, filters: list = None):
+        state = await self.get_collection_state(collection_name)
+        if state is None:
+            self.logger.error(f"Collection {collection_name} does not exist.")
+            return None
+
+        query_filter = self.build_filter(filters=filters)
+        search_params = self.get_search_params(limit=limit, accuracy=accuracy, state=state)
+
+        # every query of the batch is answered by a single request
+        responses = await self.client.query_batch_points(
+            collection_name=collection_name,
+            requests=[
+                models.QueryRequest(
+                    query=vector,
+                    limit=limit,
+                    filter=query_filter,
+                    params=search_params,
+                    with_payload=True
+                )
+                for vector in vectors
+            ]
+        )
+
+        return [
+            [
+                RetrievedDocuments(**{
+                    "text": point.payload.get("text", ""),
+                    "score": point.score,
+                 }
+                ) for point in response.points
+            ]
+            for response in responses
+        ]
+
+    async def search_hybrid(self, collection_name: str, vector: list, text: str, limit: int = 5,
+                            accuracy: str = None, filters: list = None):
+        state = await self.get_collection_state(collection_name)
+        if state is None:
+            self.logger.error(f"Collection {collection_name} does not exist.")
+            return None
+
+        if not state.has_text_index:
+            self.logger.warning(f"Collection {collection_name} has no sparse text vector, using vector search.")
+            return await self.search_by_vector(collection_name=collection_name, vector=vector,
+                                               limit=limit, accuracy=accuracy, filters=filters)
+
+        query_filter = self.build_filter(filters=filters)
+        candidates = max(limit, self.hybrid_candidates)
+        indices, values = self.sparse_encoder.encode(text)
+
+        # both rankings are prefetched server side and fused with RRF in one request
+        result = await self.client.query_points(
+            collection_name=collection_name,
+            prefetch=[
+                models.Prefetch(
+                    query=vector,
+                    limit=candidates,
+                    filter=query_filter,
+                    params=self.get_search_params(limit=candidates, accuracy=accuracy, state=state)
+                ),
+                models.Prefetch(
+                    query=models.SparseVector(indices=indices, values=values),
+                    using=self.sparse_vector_name,
+                    limit=candidates,
+                    filter=query_filter
+                ),
+            ],
+            query=models.FusionQuery(fusion=models.Fusion.RRF),
+            limit=limit,
+            with_payload=True
+        )
+
+        if not result.points:
+            return None
+
+        return [
+            RetrievedDocuments(**{
+                "text": point.payload.get("text", ""),
+                "score": point.score,
              }
-            ) for record in result
-        ]
\ No newline at end of file
+            ) for point in result.points
+        ]
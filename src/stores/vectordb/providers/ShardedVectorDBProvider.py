@@ -0,0 +1,245 @@
+import asyncio
+import heapq
+import itertools
+from ..VectorDBInterface import VectorDBInterface
+from ..ConsistentHashRing import ConsistentHashRing
+from ..VectorDBEnum import ShardRoutingEnum
+import logging
+from typing import List
+from models.db_schemes import RetrievedDocuments
+
+
+class ShardedVectorDBProvider(VectorDBInterface):
+    """
+    Spreads collections over several providers (shards) by consistent hashing of
+    their names. With "collection" routing a collection lives on one shard and
+    each call goes to that shard. With "record" routing the records of every
+    collection are spread by record id, so collection calls go to every shard
+    and searches fan out concurrently. The top results of the shards are merged
+    by score, so they should share one backend and distance method. A shard that
+    fails or misses `shard_timeout` is left out of the search instead of failing
+    it. Writes are never dropped.
+    """
+
+    def __init__(self, shards: dict, routing: str = None, shard_timeout: float = 2.0,
+                 virtual_nodes: int = 256, default_vector_size: int = 786, db_engines: list = None):
+        # shard name -> provider; names, not positions, place the shards on the ring
+        self.shards = shards
+        self.ring = ConsistentHashRing(nodes=list(shards), virtual_nodes=virtual_nodes)
+
+        self.routing = ShardRoutingEnum.COLLECTION.value
+        if routing == ShardRoutingEnum.RECORD.value:
+            self.routing = ShardRoutingEnum.RECORD.value
+
+        self.shard_timeout = shard_timeout or None
+        self.default_vector_size = default_vector_size
+
+        # engines created for the shards, disposed with them
+        self.db_engines = db_engines or []
+
+        # collection name -> shard found holding it under collection routing
+        self.collection_shards = {}
+
+        self.logger = logging.getLogger("uvicorn.error")
+
+    @property
+    def is_record_routing(self) -> bool:
+        return self.routing == ShardRoutingEnum.RECORD.value
+
+    async def connect(self):
+        await asyncio.gather(*[shard.connect() for shard in self.shards.values()])
+
+    async def disconnect(self):
+        _ = await asyncio.gather(*[shard.disconnect() for shard in self.shards.values()],
+                                 return_exceptions=True)
+        for db_engine in self.db_engines:
+            await db_engine.dispose()
+
+    async def get_collection_shard(self, collection_name: str) -> str:
+        """Shard holding a collection under collection routing, or the one to create it on."""
+        shard_name = self.collection_shards.get(collection_name)
+        if shard_name is not None:
+            return shard_name
+
+        # after shards were added a collection may still be on the shard that used to own it
+        shard_names = self.ring.get_nodes(collection_name)
+        for shard_name in shard_names:
+            if await self.shards[shard_name].is_collection_exists(collection_name):
+                self.collection_shards[collection_name] = shard_name
+                return shard_name
+
+        return shard_names[0]
+
+    async def get_collection_shards(self, collection_name: str) -> list:
+        if self.is_record_routing:
+            return list(self.shards)
+        return [await self.get_collection_shard(collection_name)]
+
+    def get_record_shard(self, record_id, text: str = None) -> str:
+        # records without an id still land on one shard per text
+        return self.ring.get_node(record_id if record_id is not None else text)
+
+    async def call_shards(self, shard_names: list, method: str, **kwargs) -> dict:
+        results = await asyncio.gather(*[
+            getattr(self.shards[shard_name], method)(**kwargs)
+            for shard_name in shard_names
+        ])
+        return dict(zip(shard_names, results))
+
+    async def search_shards(self, shard_names: list, method: str, **kwargs) -> list:
+        async def search_shard(shard_name: str):
+            try:
+                return await asyncio.wait_for(getattr(self.shards[shard_name], method)(**kwargs),
+                                              timeout=self.shard_timeout)
+            except asyncio.TimeoutError:
+                self.logger.warning(f"Shard {shard_name} did not answer within {self.shard_timeout}s, "
+                                    f"searching {kwargs.get('collection_name')} without it")
+            except Exception as e:
+                self.logger.error(f"Shard {shard_name} failed to search {kwargs.get('collection_name')}: {e}")
+            return None
+
+        results = await asyncio.gather(*[search_shard(shard_name) for shard_name in shard_names])
+        return [result for result in results if result is not None]
+
+    @staticmethod
+    def merge(results: list, limit: int) -> List[RetrievedDocuments]:
+        return heapq.nlargest(limit, itertools.chain.from_iterable(results), key=lambda document: document.score)
+
+    async def is_collection_exists(self, collection_name: str) -> bool:
+        shard_names = await self.get_collection_shards(collection_name)
+        results = await self.call_shards(shard_names, "is_collection_exists", collection_name=collection_name)
+        return all(results.values())
+
+    async def list_all_collections(self) -> List:
+        results = await self.call_shards(list(self.shards), "list_all_collections")
+        return sorted(set(itertools.chain.from_iterable(results.values())))
+
+    async def get_collection_info(self, collection_name: str) -> dict:
+        shard_names = await self.get_collection_shards(collection_name)
+        results = await self.call_shards(shard_names, "get_collection_info", collection_name=collection_name)
+        if all(info is None for info in results.values()):
+            return None
+
+        return {
+            "routing": self.routing,
+            "shards": results,
+        }
+
+    async def delete_collection(self, collection_name: str):
+        shard_names = await self.get_collection_shards(collection_name)
+        results = await self.call_shards(shard_names, "delete_collection", collection_name=collection_name)
+        self.collection_shards.pop(collection_name, None)
+        return any(results.values())
+
+    async def create_collection(self, collection_name: str,
+                                embedding_size: int,
+                                do_reset: bool = False):
+        if do_reset:
+            _ = await self.delete_collection(collection_name=collection_name)
+
+        shard_names = await self.get_collection_shards(collection_name)
+        results = await self.call_shards(shard_names, "create_collection", collection_name=collection_name,
+                                         embedding_size=embedding_size)
+        return any(results.values())
+
+    async def insert_one(self, collection_name: str, text: str, vector: list,
+                         metadata: dict = None, record_id: str = None):
+        if self.is_record_routing:
+            shard_name = self.get_record_shard(record_id, text)
+        else:
+            shard_name = await self.get_collection_shard(collection_name)
+
+        return await self.shards[shard_name].insert_one(collection_name=collection_name, text=text,
+                                                        vector=vector, metadata=metadata, record_id=record_id)
+
+    async def insert_many(self, collection_name: str, texts: list, vectors: list,
+                          metadata: list = None, record_ids: list = None, batch_size: int = 50):
+        if not self.is_record_routing:
+            shard_name = await self.get_collection_shard(collection_name)
+            return await self.shards[shard_name].insert_many(collection_name=collection_name, texts=texts,
+                                                             vectors=vectors, metadata=metadata,
+                                                             record_ids=record_ids, batch_size=batch_size)
+
+        shard_rows = {}
+        for i, text in enumerate(texts):
+            record_id = record_ids[i] if record_ids is not None else None
+            shard_rows.setdefault(self.get_record_shard(record_id, text), []).append(i)
+
+        results = await asyncio.gather(*[
+            self.shards[shard_name].insert_many(
+                collection_name=collection_name,
+                texts=[texts[i] for i in rows],
+                vectors=[vectors[i] for i in rows],
+                metadata=[metadata[i] for i in rows] if metadata is not None else None,
+                record_ids=[record_ids[i] for i in rows] if record_ids is not None else None,
+                batch_size=batch_size
+            )
+            for shard_name, rows in shard_rows.items()
+        ])
+        return all(results)
+
+    async def begin_bulk_load(self, collection_name: str, expected_rows: int = None):
+        shard_names = await self.get_collection_shards(collection_name)
+        if expected_rows is not None:
+            # each shard only loads its share
+            expected_rows = -(-expected_rows // len(shard_names))
+
+        results = await self.call_shards(shard_names, "begin_bulk_load", collection_name=collection_name,
+                                         expected_rows=expected_rows)
+        return any(results.values())
+
+    async def end_bulk_load(self, collection_name: str):
+        shard_names = await self.get_collection_shards(collection_name)
+        results = await self.call_shards(shard_names, "end_bulk_load", collection_name=collection_name)
+        return any(results.values())
+
+    async def delete_by_record_ids(self, collection_name: str, record_ids: list):
+        if not record_ids:
+            return False
+
+        if not self.is_record_routing:
+            shard_name = await self.get_collection_shard(collection_name)
+            return await self.shards[shard_name].delete_by_record_ids(collection_name=collection_name,
+                                                                      record_ids=record_ids)
+
+        shard_record_ids = {}
+        for record_id in record_ids:
+            shard_record_ids.setdefault(self.get_record_shard(record_id), []).append(record_id)
+
+        results = await asyncio.gather(*[
+            self.shards[shard_name].delete_by_record_ids(collection_name=collection_name,
+                                                         record_ids=shard_ids)
+            for shard_name, shard_ids in shard_record_ids.items()
+        ])
+        return any(results)
+
+    async def search_by_vector(self, collection_name: str, vector: list,
+                               limit: int = 10, accuracy: str = None,
+                               filters: list = None) -> List[RetrievedDocuments]:
+        results = await self.search_shards(await self.get_collection_shards(collection_name), "search_by_vector",
+                                           collection_name=collection_name, vector=vector, limit=limit,
+                                           accuracy=accuracy, filters=filters)
+        return self.merge(results, limit)
+
+    async def search_by_vectors(self, collection_name: str, vectors: list,
+                                limit: int = 10, accuracy: str = None,
+                                filters: list = None) -> List[List[RetrievedDocuments]]:
+        results = await self.search_shards(await self.get_collection_shards(collection_name), "search_by_vectors",
+                                           collection_name=collection_name, vectors=vectors, limit=limit,
+                                           accuracy=accuracy, filters=filters)
+
+        # shards without the collection answer with no lists at all
+        results = [result for result in results if result]
+        if not results:
+            return []
+
+        return [self.merge([result[i] for result in results], limit) for i in range(len(vectors))]
+
+    async def search_hybrid(self, collection_name: str, vector: list, text: str,
+                            limit: int = 10, accuracy: str = None,
+                            filters: list = None) -> List[RetrievedDocuments]:
+        # fused scores depend on each shard's candidates, so the merge is approximate across shards
+        results = await self.search_shards(await self.get_collection_shards(collection_name), "search_hybrid",
+                                           collection_name=collection_name, vector=vector, text=text,
+                                           limit=limit, accuracy=accuracy, filters=filters)
+        return self.merge(results, limit)
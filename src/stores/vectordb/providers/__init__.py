@@ -1,2 +1,6 @@
 from .QdrantDBProvider import QdrantDBProvider
-from .PGVectorProvider import PGVectorProvider
\ No newline at end of file
+from .PGVectorProvider import PGVectorProvider
+from .PGVectorPartitionedProvider import PGVectorPartitionedProvider
+from .NumpyFlatProvider import NumpyFlatProvider
+from .NumpyIVFProvider import NumpyIVFProvider
+from .ShardedVectorDBProvider import ShardedVectorDBProvider
\ No newline at end of file
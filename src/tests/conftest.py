@@ -0,0 +1,5 @@
+import os
+import sys
+
+# the app imports its packages (stores, models, helper) from src/
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
@@ -0,0 +1,47 @@
+import asyncio
+import time
+from utils.metrics import INDEX_PIPELINE_STAGE_ITEMS, INDEX_PIPELINE_QUEUE_DEPTH
+
+
+class StageStats:
+    """Throughput and input queue depth of one stage of a bounded-queue pipeline."""
+
+    def __init__(self, name: str, queue: asyncio.Queue = None):
+        self.name = name
+        self.queue = queue
+
+        self.items = 0
+        self.batches = 0
+        self.busy_seconds = 0.0
+
+        self.queue_depth_samples = 0
+        self.queue_depth_total = 0
+        self.max_queue_depth = 0
+
+    def sample_queue(self):
+        if self.queue is None:
+            return
+
+        depth = self.queue.qsize()
+        self.queue_depth_samples += 1
+        self.queue_depth_total += depth
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+        INDEX_PIPELINE_QUEUE_DEPTH.labels(stage=self.name).set(depth)
+
+    def record(self, items: int, started_at: float):
+        self.items += items
+        self.batches += 1
+        self.busy_seconds += time.perf_counter() - started_at
+        INDEX_PIPELINE_STAGE_ITEMS.labels(stage=self.name).inc(items)
+
+    def to_dict(self, elapsed_seconds: float) -> dict:
+        return {
+            "items": self.items,
+            "batches": self.batches,
+            "busy_seconds": round(self.busy_seconds, 3),
+            # what the stage sustains while working vs. what it delivered end to end
+            "items_per_busy_second": round(self.items / self.busy_seconds, 2) if self.busy_seconds else None,
+            "items_per_second": round(self.items / elapsed_seconds, 2) if elapsed_seconds else None,
+            "avg_queue_depth": round(self.queue_depth_total / self.queue_depth_samples, 2) if self.queue_depth_samples else None,
+            "max_queue_depth": self.max_queue_depth if self.queue is not None else None,
+        }
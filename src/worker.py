@@ -0,0 +1,17 @@
+import asyncio
+from main import app, lifespan
+from helper.config import get_settings
+
+
+# Run job workers without serving HTTP, so ingestion scales separately from the API.
+# Set JOB_WORKERS_COUNT=0 on the API instances and start as many of these as needed;
+# each runs WORKER_JOB_WORKERS_COUNT workers:
+#   python worker.py
+async def run_worker():
+    settings = get_settings()
+    async with lifespan(app, job_workers_count=settings.WORKER_JOB_WORKERS_COUNT):
+        await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    asyncio.run(run_worker())